@@ -1,26 +1,399 @@
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
-import random
-from datetime import datetime
+
+import game_engine
+import dominance
+import zerosum
+import mixed_nash
+import correlated
+import never_best_response
+import dynamics
+import nplayer
+import incremental
+from matrix_sheet import MatrixSheet
+from game_model import GameModel, CELL, RESET
+from history import ModelHistory
+import game_io
+import generators
+from jobs import JobScheduler
+from result_log import ResultLog
+import result_cache
+import instrumentation
 
 
 # ---------------------------
 # Функции общего назначения
 # ---------------------------
-def get_current_timestamp():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def describe_dominance(res, suffix=""):
+    # Текстовый отчёт по результату game_engine.remove_dominated
+    kind = "строго" if res.strict else "слабо"
+    if res.player == game_engine.ROW:
+        noun, noun_plural, verb = "Строка", "строк", "Удалена строка"
+        by = "строкой"
+    else:
+        noun, noun_plural, verb = "Столбец", "столбцов", "Удален столбец"
+        by = "столбцом"
+    if not res.changed:
+        return f"{kind.capitalize()} доминируемых {noun_plural} не найдено\n"
+    info = []
+    for i, k in res.pairs:
+        info.append(f"{noun} {i + 1} {kind} доминируется {by} {k + 1}")
+        info.append(f"{verb} {i + 1}")
+    return f"--- Удаление {kind} доминируемых {noun_plural}{suffix} ---\n" + "\n".join(info) + "\n"
+
+
+def describe_never_best_responses(res):
+    if not res.changed:
+        return "НЛО-стратегий не найдено\n"
+    info = []
+    for step in res.steps:
+        noun = "Строки" if step.player == game_engine.ROW else "Столбцы"
+        removed = ", ".join(str(i + 1) for i in step.removed)
+        info.append(f"{noun} {removed} — никогда не лучший ответ")
+    rows = ", ".join(str(i + 1) for i in res.row_index)
+    cols = ", ".join(str(j + 1) for j in res.col_index)
+    return ("--- Удаление НЛО стратегий ---\n" + "\n".join(info) + "\n"
+            f"Раундов: {res.rounds}, решено задач ЛП: {res.lp_solved}\n"
+            f"Остались строки: {rows}\nОстались столбцы: {cols}\n")
+
+
+def describe_mixed_equilibrium(eq):
+    p = ", ".join(f"{v:.4f}" for v in eq.row_strategy)
+    q = ", ".join(f"{v:.4f}" for v in eq.col_strategy)
+    return f"x = ({p}), y = ({q}); выигрыши: {eq.row_payoff:.4f}; {eq.col_payoff:.4f}\n"
+
+
+def describe_correlated_equilibrium(eq, limit=20):
+    # Профили носителя по убыванию вероятности (не больше limit)
+    support = sorted(eq.support, key=lambda rc: -eq.distribution[rc])
+    lines = [f"  (Row {r + 1}, Column {c + 1}): {eq.distribution[r, c]:.4f}" for r, c in support[:limit]]
+    if len(support) > limit:
+        lines.append(f"  ... ещё профилей: {len(support) - limit}")
+    return (f"Выигрыши: {eq.row_payoff:.4f}; {eq.col_payoff:.4f} (сумма {eq.welfare:.4f})\n"
+            f"Профилей в носителе: {len(support)}\n" + "\n".join(lines) + "\n"
+            f"Ограничений стимулов: {eq.constraints}, ненулевых коэффициентов: {eq.nonzeros}, "
+            f"задач ЛП: {eq.rounds}\n")
+
+
+# Параметры планировщика, не влияющие на результат анализа (не входят в ключ кэша)
+SCHEDULER_OPTIONS = ("in_process", "report_progress")
+
+# Семейства случайных биматричных игр (generators.generate)
+GAME_FAMILIES = {
+    "Независимые выигрыши": "random",
+    "Антагонистическая": "zero_sum",
+    "Координационная": "coordination",
+    "С равновесием Нэша": "planted_equilibria",
+}
+
+# Больше стольких пар носителей «Все смешанные» перебирает носители только малого размера
+# (около 10 мкс на пару: 10^6 пар — секунды, полный перебор 30x30 — ~10^18 пар)
+SUPPORT_PAIRS_LIMIT = 10 ** 6
+
+# Цели поиска коррелированного равновесия (correlated.correlated_equilibrium)
+CORRELATED_OBJECTIVES = {
+    "Сумма выигрышей": "welfare",
+    "Выигрыш игрока 1": "row",
+    "Выигрыш игрока 2": "column",
+    "Выигрыш худшего игрока": "egalitarian",
+}
+
+
+def snapshot(value):
+    # Копия входных массивов для фоновой задачи: пока она работает, матрицу можно править
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(snapshot(v) for v in value)
+    return value
 
 
 # ---------------------------
-# Вкладка для одноматричных игр
+# Общая часть вкладок: фоновые анализы
 # ---------------------------
-class MatrixGameFrame(tk.Frame):
-    def __init__(self, master):
+class AnalysisFrame(tk.Frame):
+    def __init__(self, master, scheduler, cache=None):
         super().__init__(master)
+        self.scheduler = scheduler
+        self.cache = cache
+        self.model = None
+        self.rng = generators.make_rng()
+        self.status = tk.StringVar(value="Готово")
+
+    def create_status_bar(self):
+        status_frame = tk.Frame(self)
+        status_frame.pack(padx=5, pady=2, fill=tk.X)
+        tk.Label(status_frame, textvariable=self.status, anchor="w") \
+            .pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(status_frame, text="Отменить", command=self.cancel_jobs).pack(side=tk.RIGHT)
+        self.scheduler.subscribe(self.on_jobs_changed)
+        if self.model is None:
+            return
+        # Изменение матрицы делает запущенные анализы вкладки устаревшими
+        self.model.subscribe(lambda kind, cell: self.scheduler.cancel_owner(self))
+        # Граф доминирования строится при первом запросе и обновляется при правке ячеек
+        self.dominance_graph = None
+        self.model.subscribe(self.update_dominance_graph)
+        # Сводки для максимина и равновесий Нэша — так же, при первом запросе
+        self.incremental = None
+        self.model.subscribe(self.update_incremental)
+        self.model.subscribe(self.sync_dimensions)
+
+    # --- История изменений ---
+    def create_history_bar(self):
+        self.history = ModelHistory(self.model)
+        history_frame = tk.Frame(self)
+        history_frame.pack(padx=5, pady=2, fill=tk.X)
+        self.undo_button = tk.Button(history_frame, text="Отменить правку", command=self.history.undo)
+        self.undo_button.pack(side=tk.LEFT, padx=2)
+        self.redo_button = tk.Button(history_frame, text="Повторить", command=self.history.redo)
+        self.redo_button.pack(side=tk.LEFT, padx=2)
+        tk.Label(history_frame, text="Версия:").pack(side=tk.LEFT, padx=2)
+        self.history_choice = ttk.Combobox(history_frame, state="readonly", width=60)
+        self.history_choice.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        self.history_choice.bind("<<ComboboxSelected>>",
+                                 lambda e: self.history.goto(self.history_choice.current()))
+        self.sheet.bind_history(self.history.undo, self.history.redo)
+        self.history.subscribe(self.on_history_changed)
+        self.on_history_changed()
+
+    def on_history_changed(self):
+        self.undo_button.configure(state=tk.NORMAL if self.history.can_undo else tk.DISABLED)
+        self.redo_button.configure(state=tk.NORMAL if self.history.can_redo else tk.DISABLED)
+        self.history_choice.configure(values=[f"{k}. {text}" for k, text in self.history.entries()])
+        self.history_choice.current(self.history.position)
+
+    def sync_dimensions(self, kind, cell):
+        # После отмены или удаления стратегий поля размеров показывают размер модели
+        if kind == RESET:
+            rows, cols = self.model.shape
+            self.rows.set(rows)
+            self.cols.set(cols)
+
+    def apply_reduction(self, row_index, col_index, label):
+        # Удаление стратегий записывается в историю компактной дельтой
+        self.model.restrict(row_index, col_index, label)
+
+    def run_job(self, name, title, fn, *args, on_done, error_message, cache=True, **kwargs):
+        # Анализ выполняется в фоне; повторный запуск того же анализа заменяет предыдущий.
+        # Результат для той же матрицы и параметров берётся из кэша без запуска задачи.
+        # При включённом профилировании время задачи пишется этапом job.<name>,
+        # а вывод результата — render.<name>.
+        on_done = self.profiled(name, on_done)
+        args = snapshot(args)
+        if cache and self.cache is not None:
+            params = {k: v for k, v in kwargs.items() if k not in SCHEDULER_OPTIONS}
+            key = result_cache.make_key(result_cache.analysis_name(fn), *args, **params)
+            value = self.cache.get(key)
+            if value is not result_cache.MISSING:
+                self.scheduler.cancel((self, name))
+                on_done(value, cached=True)
+                return
+            on_done = self.remember_result(key, on_done)
+        self.scheduler.submit((self, name), fn, *args, owner=self, title=title,
+                              on_done=on_done,
+                              on_error=lambda e: messagebox.showerror("Ошибка", f"{error_message}: {str(e)}"),
+                              on_progress=lambda fraction, message: self.show_progress(title, fraction, message),
+                              **kwargs)
+
+    def profiled(self, name, on_done):
+        start = time.perf_counter()
+
+        def done(result, cached=False):
+            instrumentation.PROFILER.record(f"job.{name}.cached" if cached else f"job.{name}",
+                                            time.perf_counter() - start)
+            with instrumentation.stage(f"render.{name}"):
+                on_done(result)
+        return done
+
+    def remember_result(self, key, on_done):
+        def done(result):
+            self.cache.put(key, result)
+            on_done(result)
+        return done
+
+    def show_progress(self, title, fraction, message):
+        percent = f" {fraction:.0%}" if fraction is not None else ""
+        self.status.set(f"{title}:{percent} {message}")
+
+    def on_jobs_changed(self, owner):
+        if owner is not self:
+            return
+        jobs = self.scheduler.running(self)
+        if jobs:
+            self.status.set("Выполняется: " + ", ".join(job.title for job in jobs))
+        else:
+            self.status.set("Готово")
+
+    def cancel_jobs(self):
+        self.scheduler.cancel_owner(self)
+
+    # --- Доминирование через кэшированный граф ---
+    def update_dominance_graph(self, kind, cell):
+        if self.dominance_graph is None:
+            return
+        if kind == CELL:
+            self.dominance_graph.update_cell(*cell, self.model.get_cell(*cell))
+        else:
+            self.dominance_graph = None
+
+    def find_dominated(self, matrices, player, strict):
+        if self.dominance_graph is not None:
+            self.apply_graph_dominance(self.dominance_graph, player, strict)
+            return
+        self.run_job("dominance", "Построение графа доминирования", dominance.DominanceGraph, *matrices,
+                     cache=False, on_done=lambda graph: self.apply_graph_dominance(graph, player, strict),
+                     error_message="Ошибка при расчётах")
+
+    def apply_dominance_step(self, res):
+        rows, cols = self.model.shape
+        row_index, col_index = np.arange(rows), np.arange(cols)
+        if res.player == game_engine.ROW:
+            row_index = np.delete(row_index, res.removed)
+        else:
+            col_index = np.delete(col_index, res.removed)
+        kind = "строго" if res.strict else "слабо"
+        self.apply_reduction(row_index, col_index, f"Удаление {kind} доминируемых")
+
+    def apply_graph_dominance(self, graph, player, strict):
+        res = graph.remove_dominated(player, strict)
+        self.apply_dominance(res)
+        # Замена матриц в модели сбросила кэш, но граф уже перешёл к уменьшенной игре
+        self.dominance_graph = graph
+
+    # --- Инкрементальный анализ правок ячеек ---
+    def update_incremental(self, kind, cell):
+        if self.incremental is None:
+            return
+        if kind == CELL:
+            self.incremental.update_cell(*cell, self.model.get_cell(*cell))
+        else:
+            self.incremental = None
+
+    def run_incremental(self, matrices, on_done):
+        # Первый запрос строит сводки в фоне, после правок ячеек ответ готов сразу
+        if self.incremental is not None:
+            with instrumentation.stage("render.incremental"):
+                on_done(self.incremental)
+            return
+        self.run_job("incremental", "Подготовка сводок игры", incremental.IncrementalAnalysis, *matrices,
+                     cache=False, on_done=lambda analysis: self.set_incremental(analysis, on_done),
+                     error_message="Ошибка при расчётах")
+
+    def set_incremental(self, analysis, on_done):
+        self.incremental = analysis
+        on_done(analysis)
+
+    # --- Эволюционная динамика ---
+    def create_dynamics_panel(self):
+        dyn_frame = tk.LabelFrame(self, text="Эволюционная динамика", padx=5, pady=5)
+        dyn_frame.pack(padx=5, pady=5, fill=tk.X)
+        self.dynamics_kind = tk.StringVar(value=dynamics.DYNAMICS[0])
+        self.dynamics_method = tk.StringVar(value=dynamics.METHODS[0])
+        self.dynamics_count = tk.IntVar(value=1000)
+        self.dynamics_time = tk.DoubleVar(value=100.0)
+        self.dynamics_save = tk.BooleanVar(value=False)
+        ttk.Combobox(dyn_frame, textvariable=self.dynamics_kind, values=list(dynamics.DYNAMICS),
+                     state="readonly", width=14).pack(side=tk.LEFT, padx=2)
+        ttk.Combobox(dyn_frame, textvariable=self.dynamics_method, values=list(dynamics.METHODS),
+                     state="readonly", width=10).pack(side=tk.LEFT, padx=2)
+        tk.Label(dyn_frame, text="Траекторий:").pack(side=tk.LEFT, padx=2)
+        tk.Spinbox(dyn_frame, from_=1, to=1000000, textvariable=self.dynamics_count, width=8) \
+            .pack(side=tk.LEFT, padx=2)
+        tk.Label(dyn_frame, text="Время:").pack(side=tk.LEFT, padx=2)
+        tk.Entry(dyn_frame, textvariable=self.dynamics_time, width=8).pack(side=tk.LEFT, padx=2)
+        tk.Checkbutton(dyn_frame, text="Сохранять траектории", variable=self.dynamics_save) \
+            .pack(side=tk.LEFT, padx=2)
+        tk.Button(dyn_frame, text="Запустить", command=self.run_dynamics).pack(side=tk.LEFT, padx=5)
+
+    def run_dynamics(self):
+        matrices = self.get_dynamics_matrices()
+        if matrices is None:
+            return
+        try:
+            count = self.dynamics_count.get()
+            t_max = self.dynamics_time.get()
+        except tk.TclError:
+            messagebox.showerror("Ошибка", "Число траекторий и время должны быть числами")
+            return
+        path = None
+        if self.dynamics_save.get():
+            path = filedialog.asksaveasfilename(defaultextension=".bin",
+                                                filetypes=[("Снимки траекторий", "*.bin"), ("All files", "*.*")])
+            if not path:
+                return
+        # Начальные состояния случайные, поэтому результат не кэшируется
+        self.run_job("dynamics", "Эволюционная динамика", dynamics.simulate, *matrices, count=count,
+                     dynamics=self.dynamics_kind.get(), method=self.dynamics_method.get(), t_max=t_max,
+                     record_every=10 if path else None, path=path, rng=int(self.rng.integers(2 ** 63)),
+                     cache=False, report_progress=True, on_done=self.show_dynamics,
+                     error_message="Ошибка моделирования динамики")
+
+    def show_dynamics(self, res, limit=10):
+        lines = [f"--- Динамика {res.dynamics}: траекторий {res.count}, сошлось {int(res.converged.sum())}, "
+                 f"шагов {res.steps} ---"]
+        summary = dynamics.endpoint_summary(res)
+        for x, y, count in summary[:limit]:
+            lines.append(f"x = ({', '.join(f'{v:g}' for v in x)}), y = ({', '.join(f'{v:g}' for v in y)}): "
+                         f"{count} траекторий")
+        if len(summary) > limit:
+            lines.append(f"... и ещё {len(summary) - limit} точек")
+        if res.path:
+            lines.append(f"Траектории записаны в {res.path}")
+        self.output_result("\n".join(lines) + "\n")
+
+    # --- Вывод результатов ---
+    def create_result_log(self):
+        # Текст для вывода результатов: журнал выводит сообщения пачками и хранит последние записи
+        self.result_text = tk.Text(self, height=10, wrap=tk.WORD)
+        self.result_text.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        self.log = ResultLog(self, self.result_text, source=type(self).__name__)
+
+    def on_output_changed(self):
+        # Режим "File": файл журнала выбирается один раз, дальше результаты дописываются в него
+        if self.output_dest.get() == "results":
+            if self.log.sink is not None:
+                path = self.log.sink.path
+                self.log.close_file()
+                self.log.append(f"Запись результатов в {path} остановлена\n")
+            self.log.show_in_text = True
+            return
+        if self.log.sink is not None:
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".jsonl",
+                                                 filetypes=[("JSON Lines", "*.jsonl"), ("Text files", "*.txt"),
+                                                            ("All files", "*.*")])
+        if not file_path:
+            self.output_dest.set("results")
+            return
+        try:
+            self.log.open_file(file_path)
+        except OSError as e:
+            self.output_dest.set("results")
+            messagebox.showerror("Ошибка", f"Ошибка открытия файла: {str(e)}")
+            return
+        self.log.show_in_text = False
+        self.log.append(f"Результаты записываются в {file_path}\n", to_text=True, to_file=False)
+
+    def output_result(self, message):
+        self.log.append(message)
+
+    def close(self):
+        self.log.close_file()
+
+
+# ---------------------------
+# Вкладка для одноматричных игр
+# ---------------------------
+class MatrixGameFrame(AnalysisFrame):
+    def __init__(self, master, scheduler, cache=None):
+        super().__init__(master, scheduler, cache)
         self.rows = tk.IntVar(value=2)
         self.cols = tk.IntVar(value=2)
-        self.matrix_entries = []
+        # Матрица выигрышей хранится в модели; таблица только отображает её
+        self.model = GameModel(np.zeros((2, 2)))
         self.output_dest = tk.StringVar(value="results")  # "results" или "file"
         self.create_widgets()
 
@@ -53,15 +426,16 @@ class MatrixGameFrame(tk.Frame):
         tk.Button(op_frame, text="Сохранить в файл", command=self.save_matrix_to_file).pack(side=tk.LEFT, padx=2)
         tk.Button(op_frame, text="Случайная матрица", command=self.generate_random_matrix).pack(side=tk.LEFT, padx=2)
         tk.Button(op_frame, text="Maximin/Minimax", command=self.find_maximin_minimax).pack(side=tk.LEFT, padx=2)
+        tk.Button(op_frame, text="Смешанные стратегии", command=self.find_mixed_strategies).pack(side=tk.LEFT, padx=2)
 
         # Выбор места вывода
         output_frame = tk.Frame(self)
         output_frame.pack(padx=5, pady=5, fill=tk.X)
         tk.Label(output_frame, text="Output:").pack(side=tk.LEFT)
-        tk.Radiobutton(output_frame, text="Results", variable=self.output_dest, value="results") \
-            .pack(side=tk.LEFT)
-        tk.Radiobutton(output_frame, text="File", variable=self.output_dest, value="file") \
-            .pack(side=tk.LEFT)
+        tk.Radiobutton(output_frame, text="Results", variable=self.output_dest, value="results",
+                       command=self.on_output_changed).pack(side=tk.LEFT)
+        tk.Radiobutton(output_frame, text="File", variable=self.output_dest, value="file",
+                       command=self.on_output_changed).pack(side=tk.LEFT)
 
         # Панель для удаления доминируемых стратегий
         dom_frame = tk.LabelFrame(self, text="Удаление доминируемых стратегий", padx=5, pady=5)
@@ -74,15 +448,20 @@ class MatrixGameFrame(tk.Frame):
             .pack(side=tk.LEFT, padx=5)
         tk.Button(dom_frame, text="Удалить слабо доминируемые", command=self.remove_weakly_dominated) \
             .pack(side=tk.LEFT, padx=5)
+        tk.Button(dom_frame, text="Удалить НЛО", command=self.remove_never_best_responses) \
+            .pack(side=tk.LEFT, padx=5)
+        self.create_dynamics_panel()
 
         # Панель ввода матрицы
         self.matrix_input_frame = tk.LabelFrame(self, text="Payoff Matrix", padx=5, pady=5)
         self.matrix_input_frame.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        self.sheet = MatrixSheet(self.matrix_input_frame, self.model)
+        self.sheet.pack(fill=tk.BOTH, expand=True)
         self.update_matrix_input()
+        self.create_status_bar()
+        self.create_history_bar()
 
-        # Текст для вывода результатов
-        self.result_text = tk.Text(self, height=10, wrap=tk.WORD)
-        self.result_text.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        self.create_result_log()
 
     def validate_spinbox(self, value_if_allowed):
         # Разрешаем пустую строку (пока пользователь не ввёл число)
@@ -95,9 +474,6 @@ class MatrixGameFrame(tk.Frame):
             return False
 
     def update_matrix_input(self):
-        for widget in self.matrix_input_frame.winfo_children():
-            widget.destroy()
-        self.matrix_entries = []
         rows = self.rows.get()
         cols = self.cols.get()
         if rows == 1 and cols == 1:
@@ -105,111 +481,48 @@ class MatrixGameFrame(tk.Frame):
                                  "Матрица не может быть размером 1x1!\nДопустимые размеры: 1x2, 2x1, или квадратные матрицы NxN.")
             self.cols.set(2)
             cols = 2
-        # Заголовки столбцов
-        for j in range(cols):
-            tk.Label(self.matrix_input_frame, text=f"Col {j + 1}").grid(row=0, column=j + 1, padx=2, pady=2)
-        # Поля ввода
-        for i in range(rows):
-            tk.Label(self.matrix_input_frame, text=f"Row {i + 1}").grid(row=i + 1, column=0, padx=2, pady=2)
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(self.matrix_input_frame, width=8)
-                entry.grid(row=i + 1, column=j + 1, padx=2, pady=2)
-                entry.insert(0, "0")
-                row_entries.append(entry)
-            self.matrix_entries.append(row_entries)
+        with instrumentation.stage("render.resize"):
+            self.model.resize(rows, cols)
 
     def get_matrix_from_input(self):
-        rows = self.rows.get()
-        cols = self.cols.get()
+        rows, cols = self.sheet.shape
         if rows == 1 and cols == 1:
             messagebox.showerror("Ошибка", "Недопустимая размерность матрицы. Допустимые размеры: 1x2, 2x1 или NxN, где N >= 2")
             return None
-        matrix = []
-        try:
-            for i in range(rows):
-                row = []
-                for j in range(cols):
-                    row.append(float(self.matrix_entries[i][j].get()))
-                matrix.append(row)
-            return np.array(matrix)
-        except ValueError:
-            messagebox.showerror("Ошибка", "Пожалуйста, введите числа во все ячейки матрицы")
-            return None
+        with instrumentation.stage("parse.input"):
+            if not self.sheet.commit_edit():
+                return None
+        return self.model.payoffs[0]
+
+    def get_dynamics_matrices(self):
+        # Матричная игра антагонистическая: dynamics.simulate подставит B = -A
+        matrix = self.get_matrix_from_input()
+        return None if matrix is None else (matrix,)
 
     def load_from_file(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        file_path = filedialog.askopenfilename(filetypes=game_io.FILE_TYPES)
         if not file_path:
             return
         try:
-            with open(file_path, 'r') as file:
-                lines = [line.strip() for line in file if line.strip()]
-            if not lines:
-                messagebox.showerror("Ошибка", "Файл пуст!\n")
-                return
-
-            # Парсинг размеров матрицы
-            try:
-                dims = list(map(int, lines[0].split()))
-            except ValueError:
-                messagebox.showerror("Ошибка", "Некорректный формат размеров матрицы в файле!")
-                return
-            if len(dims) != 2:
-                messagebox.showerror("Ошибка",
-                                     "Первая строка должна содержать ровно два числа (количество строк и столбцов)!")
-                return
-            rows, cols = dims
-            if rows == 1 and cols == 1:
-                messagebox.showerror("Ошибка",
-                                     "Матрица из файла не может быть размером 1x1!\nДопустимые размеры: 1x2, 2x1 или NxN.")
-                return
-            if rows < 1 or cols < 1:
-                messagebox.showerror("Ошибка", "Размеры матрицы должны быть положительными!")
-                return
-            if rows > 20 or cols > 20:
-                messagebox.showerror("Ошибка", "Максимальная размерность матрицы - 20x20!")
-                return
-
-            if len(lines) < 1 + rows:
-                messagebox.showerror("Ошибка", "Недостаточно строк с данными в файле!")
-                return
-
-            matrix = []
-            for i in range(1, 1 + rows):
-                try:
-                    vals = list(map(float, lines[i].split()))
-                except ValueError:
-                    messagebox.showerror("Ошибка", f"Некорректный ввод данных в строке {i + 1} (ожидались числа)!")
-                    return
-                if len(vals) != cols:
-                    messagebox.showerror("Ошибка", f"В строке {i + 1} должно быть {cols} чисел, найдено {len(vals)}!")
-                    return
-                matrix.append(vals)
-
-            self.rows.set(rows)
-            self.cols.set(cols)
-            self.update_matrix_input()
-            for i in range(rows):
-                for j in range(cols):
-                    self.matrix_entries[i][j].delete(0, tk.END)
-                    self.matrix_entries[i][j].insert(0, str(matrix[i][j]))
-            self.output_result(f"Матрица успешно загружена из файла {file_path}\n")
+            matrix, = game_io.load_game(file_path, players=1)
+        except game_io.GameFileError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка загрузки файла: {str(e)}")
+            return
+        self.set_matrix_to_input(matrix, label="Загрузка из файла")
+        self.output_result(f"Матрица успешно загружена из файла {file_path}\n")
 
     def save_matrix_to_file(self):
         matrix = self.get_matrix_from_input()
         if matrix is None:
             return
-        file_path = filedialog.asksaveasfilename(defaultextension=".txt",
-                                                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=game_io.FILE_TYPES)
         if not file_path:
             return
         try:
-            with open(file_path, 'w') as file:
-                file.write(f"{self.rows.get()} {self.cols.get()}\n")
-                for row in matrix:
-                    file.write(" ".join(map(str, row)) + "\n")
+            game_io.save_game(file_path, matrix)
             self.output_result(f"Матрица сохранена в {file_path}\n")
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка сохранения: {str(e)}")
@@ -217,161 +530,93 @@ class MatrixGameFrame(tk.Frame):
     def generate_random_matrix(self):
         rows = self.rows.get()
         cols = self.cols.get()
-        for i in range(rows):
-            for j in range(cols):
-                self.matrix_entries[i][j].delete(0, tk.END)
-                self.matrix_entries[i][j].insert(0, str(random.randint(-10, 10)))
+        self.set_matrix_to_input(generators.random_game(rows, cols, rng=self.rng), label="Случайная матрица")
         self.output_result(f"Сгенерирована случайная матрица {rows}x{cols}\n")
 
+    def set_matrix_to_input(self, matrix, label=""):
+        self.rows.set(matrix.shape[0])
+        self.cols.set(matrix.shape[1])
+        self.model.replace(matrix, label=label)
+
     def find_maximin_minimax(self):
         matrix = self.get_matrix_from_input()
         if matrix is None:
             return
-        try:
-            # Для игрока по строкам
-            row_minima = np.min(matrix, axis=1)
-            maximin = np.max(row_minima)
-            maximin_row = np.argmax(row_minima)
-            # Для игрока по столбцам
-            col_maxima = np.max(matrix, axis=0)
-            minimax = np.min(col_maxima)
-            minimax_col = np.argmin(col_maxima)
-            saddle = (maximin == minimax)
-            result = (f"Maximin (строковый игрок): Row {maximin_row + 1} со значением {maximin}\n"
-                      f"Minimax (столбцовый игрок): Column {minimax_col + 1} со значением {minimax}\n"
-                      f"{'Седловая точка существует' if saddle else 'Седловой точки нет'}\n")
-            self.output_result(result)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка при расчётах: {str(e)}")
+        self.run_incremental((matrix,), lambda analysis: self.show_maximin_minimax(analysis.maximin_result()))
 
-    def remove_strictly_dominated(self):
+    def show_maximin_minimax(self, res):
+        result = (f"Maximin (строковый игрок): Row {res.maximin_row + 1} со значением {res.maximin}\n"
+                  f"Minimax (столбцовый игрок): Column {res.minimax_col + 1} со значением {res.minimax}\n"
+                  f"{'Седловая точка существует' if res.saddle else 'Седловой точки нет'}\n")
+        self.output_result(result)
+
+    def find_mixed_strategies(self):
         matrix = self.get_matrix_from_input()
         if matrix is None:
             return
-        result = ""
-        player = self.player_choice.get()
-        if player == "row":
-            rows_to_remove = set()
-            info = []
-            for i in range(matrix.shape[0]):
-                for k in range(matrix.shape[0]):
-                    if i != k and np.all(matrix[i, :] < matrix[k, :]):
-                        rows_to_remove.add(i)
-                        info.append(f"Строка {i + 1} строго доминируется строкой {k + 1}")
-                        info.append(f"Удалена строка {i + 1}")
-            if rows_to_remove:
-                new_matrix = np.delete(matrix, list(rows_to_remove), axis=0)
-                self.rows.set(new_matrix.shape[0])
-                self.update_matrix_input()
-                for i in range(new_matrix.shape[0]):
-                    for j in range(new_matrix.shape[1]):
-                        self.matrix_entries[i][j].delete(0, tk.END)
-                        self.matrix_entries[i][j].insert(0, str(new_matrix[i, j]))
-                result += "--- Удаление строго доминируемых строк ---\n" + "\n".join(info) + "\n"
-                result += f"Удалено {len(rows_to_remove)} строк\nНовая матрица:\n{new_matrix}\n"
-            else:
-                result += "Строго доминируемых строк не найдено\n"
-        else:  # player == "column"
-            cols_to_remove = set()
-            info = []
-            for j in range(matrix.shape[1]):
-                for l in range(matrix.shape[1]):
-                    if j != l and np.all(matrix[:, j] < matrix[:, l]):
-                        cols_to_remove.add(j)
-                        info.append(f"Столбец {j + 1} строго доминируется столбцом {l + 1}")
-                        info.append(f"Удален столбец {j + 1}")
-            if cols_to_remove:
-                new_matrix = np.delete(matrix, list(cols_to_remove), axis=1)
-                self.cols.set(new_matrix.shape[1])
-                self.update_matrix_input()
-                for i in range(new_matrix.shape[0]):
-                    for j in range(new_matrix.shape[1]):
-                        self.matrix_entries[i][j].delete(0, tk.END)
-                        self.matrix_entries[i][j].insert(0, str(new_matrix[i, j]))
-                result += "--- Удаление строго доминируемых столбцов ---\n" + "\n".join(info) + "\n"
-                result += f"Удалено {len(cols_to_remove)} столбцов\nНовая матрица:\n{new_matrix}\n"
-            else:
-                result += "Строго доминируемых столбцов не найдено\n"
+        self.run_job("mixed", "Смешанные стратегии", zerosum.solve_zero_sum, matrix,
+                     on_done=self.show_mixed_strategies, error_message="Ошибка при расчётах")
+
+    def show_mixed_strategies(self, sol):
+        if sol.saddle:
+            r, c = sol.saddle_point
+            result = f"Седловая точка: (Row {r + 1}, Column {c + 1}), цена игры {sol.value}\n"
+        else:
+            p = ", ".join(f"{v:.4f}" for v in sol.row_strategy)
+            q = ", ".join(f"{v:.4f}" for v in sol.col_strategy)
+            result = (f"Цена игры: {sol.value:.6f}\n"
+                      f"Оптимальная стратегия строкового игрока: ({p})\n"
+                      f"Оптимальная стратегия столбцового игрока: ({q})\n")
         self.output_result(result)
 
-    def remove_weakly_dominated(self):
+    def remove_dominated(self, strict):
         matrix = self.get_matrix_from_input()
         if matrix is None:
             return
-        result = ""
-        player = self.player_choice.get()
-        if player == "row":
-            rows_to_remove = set()
-            info = []
-            for i in range(matrix.shape[0]):
-                for k in range(matrix.shape[0]):
-                    if i != k and (np.all(matrix[i, :] <= matrix[k, :]) and np.any(matrix[i, :] < matrix[k, :])):
-                        rows_to_remove.add(i)
-                        info.append(f"Строка {i + 1} слабо доминируется строкой {k + 1}")
-                        info.append(f"Удалена строка {i + 1}")
-            if rows_to_remove:
-                new_matrix = np.delete(matrix, list(rows_to_remove), axis=0)
-                self.rows.set(new_matrix.shape[0])
-                self.update_matrix_input()
-                for i in range(new_matrix.shape[0]):
-                    for j in range(new_matrix.shape[1]):
-                        self.matrix_entries[i][j].delete(0, tk.END)
-                        self.matrix_entries[i][j].insert(0, str(new_matrix[i, j]))
-                result += "--- Удаление слабо доминируемых строк ---\n" + "\n".join(info) + "\n"
-                result += f"Удалено {len(rows_to_remove)} строк\nНовая матрица:\n{new_matrix}\n"
-            else:
-                result += "Слабо доминируемых строк не найдено\n"
-        else:  # player == "column"
-            cols_to_remove = set()
-            info = []
-            for j in range(matrix.shape[1]):
-                for l in range(matrix.shape[1]):
-                    if j != l and (np.all(matrix[:, j] <= matrix[:, l]) and np.any(matrix[:, j] < matrix[:, l])):
-                        cols_to_remove.add(j)
-                        info.append(f"Столбец {j + 1} слабо доминируется столбцом {l + 1}")
-                        info.append(f"Удален столбец {j + 1}")
-            if cols_to_remove:
-                new_matrix = np.delete(matrix, list(cols_to_remove), axis=1)
-                self.cols.set(new_matrix.shape[1])
-                self.update_matrix_input()
-                for i in range(new_matrix.shape[0]):
-                    for j in range(new_matrix.shape[1]):
-                        self.matrix_entries[i][j].delete(0, tk.END)
-                        self.matrix_entries[i][j].insert(0, str(new_matrix[i, j]))
-                result += "--- Удаление слабо доминируемых столбцов ---\n" + "\n".join(info) + "\n"
-                result += f"Удалено {len(cols_to_remove)} столбцов\nНовая матрица:\n{new_matrix}\n"
-            else:
-                result += "Слабо доминируемых столбцов не найдено\n"
+        self.find_dominated((matrix,), self.player_choice.get(), strict)
+
+    def apply_dominance(self, res):
+        result = describe_dominance(res)
+        if res.changed:
+            new_matrix = res.matrices[0]
+            self.apply_dominance_step(res)
+            noun = "строк" if res.player == game_engine.ROW else "столбцов"
+            result += f"Удалено {len(res.removed)} {noun}\nНовая матрица:\n{new_matrix}\n"
         self.output_result(result)
 
-    def output_result(self, message):
-        if self.output_dest.get() == "results":
-            self.result_text.insert(tk.END, f"[{get_current_timestamp()}] " + message)
-            self.result_text.see(tk.END)
-        else:
-            file_path = filedialog.asksaveasfilename(defaultextension=".txt",
-                                                     filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
-            if file_path:
-                try:
-                    with open(file_path, 'w') as file:
-                        file.write(f"Результаты ({get_current_timestamp()}):\n\n")
-                        file.write(message)
-                    self.result_text.insert(tk.END, f"Результаты сохранены в {file_path}\n")
-                    self.result_text.see(tk.END)
-                except Exception as e:
-                    messagebox.showerror("Ошибка", f"Ошибка сохранения: {str(e)}")
+    def remove_strictly_dominated(self):
+        self.remove_dominated(strict=True)
+
+    def remove_weakly_dominated(self):
+        self.remove_dominated(strict=False)
+
+    def remove_never_best_responses(self):
+        # Антагонистическая игра: столбцовый игрок минимизирует выигрыш строкового
+        matrix = self.get_matrix_from_input()
+        if matrix is None:
+            return
+        self.run_job("dominance", "Удаление НЛО", never_best_response.remove_never_best_responses, matrix,
+                     report_progress=True, on_done=self.apply_never_best_responses,
+                     error_message="Ошибка при расчётах")
+
+    def apply_never_best_responses(self, res):
+        if res.changed:
+            self.apply_reduction(res.row_index, res.col_index, "Удаление НЛО")
+        self.output_result(describe_never_best_responses(res))
 
 
 # ---------------------------
 # Вкладка для биматричных игр
 # ---------------------------
-class BiMatrixGameFrame(tk.Frame):
-    def __init__(self, master):
-        super().__init__(master)
+class BiMatrixGameFrame(AnalysisFrame):
+    def __init__(self, master, scheduler, cache=None):
+        super().__init__(master, scheduler, cache)
         # Для биматричных игр каждый элемент – пара значений (матрицы выигрышей для двух игроков)
         self.rows = tk.IntVar(value=2)
         self.cols = tk.IntVar(value=2)
-        self.matrix_entries = []  # Каждый элемент: ((entry1, entry2), ...)
+        self.model = GameModel(np.zeros((2, 2)), np.zeros((2, 2)))
+        self.family = tk.StringVar(value=next(iter(GAME_FAMILIES)))
+        self.objective = tk.StringVar(value=next(iter(CORRELATED_OBJECTIVES)))
         self.output_dest = tk.StringVar(value="results")
         self.create_widgets()
 
@@ -404,8 +649,22 @@ class BiMatrixGameFrame(tk.Frame):
             .pack(side=tk.LEFT, padx=2)
         tk.Button(op_frame, text="Случайная матрица", command=self.generate_random) \
             .pack(side=tk.LEFT, padx=2)
+        ttk.Combobox(op_frame, textvariable=self.family, values=list(GAME_FAMILIES), state="readonly",
+                     width=22).pack(side=tk.LEFT, padx=2)
         tk.Button(op_frame, text="Найти равновесие (Нэш)", command=self.find_nash_equilibrium) \
             .pack(side=tk.LEFT, padx=2)
+        tk.Button(op_frame, text="Смешанное (Лемке-Хоусон)", command=self.find_mixed_equilibrium) \
+            .pack(side=tk.LEFT, padx=2)
+        tk.Button(op_frame, text="Все смешанные", command=self.find_all_mixed_equilibria) \
+            .pack(side=tk.LEFT, padx=2)
+
+        # Коррелированное равновесие с наибольшим значением выбранной цели
+        ce_frame = tk.LabelFrame(self, text="Коррелированное равновесие", padx=5, pady=5)
+        ce_frame.pack(padx=5, pady=5, fill=tk.X)
+        tk.Label(ce_frame, text="Максимизировать:").pack(side=tk.LEFT, padx=2)
+        ttk.Combobox(ce_frame, textvariable=self.objective, values=list(CORRELATED_OBJECTIVES), state="readonly",
+                     width=24).pack(side=tk.LEFT, padx=2)
+        tk.Button(ce_frame, text="Найти", command=self.find_correlated_equilibrium).pack(side=tk.LEFT, padx=5)
 
         # Панель для удаления доминируемых стратегий
         dom_frame = tk.LabelFrame(self, text="Удаление доминируемых стратегий", padx=5, pady=5)
@@ -418,24 +677,33 @@ class BiMatrixGameFrame(tk.Frame):
             .pack(side=tk.LEFT, padx=5)
         tk.Button(dom_frame, text="Удалить слабо доминируемые", command=self.remove_weakly_dominated) \
             .pack(side=tk.LEFT, padx=5)
+        tk.Button(dom_frame, text="Удалить НЛО", command=self.remove_never_best_responses) \
+            .pack(side=tk.LEFT, padx=5)
+        tk.Button(dom_frame, text="Итеративно (строго)",
+                  command=lambda: self.remove_dominated_iteratively(strict=True)).pack(side=tk.LEFT, padx=5)
+        tk.Button(dom_frame, text="Итеративно (слабо)",
+                  command=lambda: self.remove_dominated_iteratively(strict=False)).pack(side=tk.LEFT, padx=5)
+        self.create_dynamics_panel()
 
         # Выбор места вывода
         output_frame = tk.Frame(self)
         output_frame.pack(padx=5, pady=5, fill=tk.X)
         tk.Label(output_frame, text="Output:").pack(side=tk.LEFT)
-        tk.Radiobutton(output_frame, text="Results", variable=self.output_dest, value="results") \
-            .pack(side=tk.LEFT)
-        tk.Radiobutton(output_frame, text="File", variable=self.output_dest, value="file") \
-            .pack(side=tk.LEFT)
+        tk.Radiobutton(output_frame, text="Results", variable=self.output_dest, value="results",
+                       command=self.on_output_changed).pack(side=tk.LEFT)
+        tk.Radiobutton(output_frame, text="File", variable=self.output_dest, value="file",
+                       command=self.on_output_changed).pack(side=tk.LEFT)
 
         # Панель ввода матрицы (каждая ячейка – пара значений, разделённых символом ;)
         self.matrix_input_frame = tk.LabelFrame(self, text="Биматричная игра (A;B)", padx=5, pady=5)
         self.matrix_input_frame.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        self.sheet = MatrixSheet(self.matrix_input_frame, self.model)
+        self.sheet.pack(fill=tk.BOTH, expand=True)
         self.update_matrix_input()
+        self.create_status_bar()
+        self.create_history_bar()
 
-        # Текст для вывода результатов
-        self.result_text = tk.Text(self, height=10, wrap=tk.WORD)
-        self.result_text.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        self.create_result_log()
 
     def validate_spinbox(self, value_if_allowed):
         # Разрешаем пустую строку (пока пользователь не ввёл число)
@@ -448,9 +716,6 @@ class BiMatrixGameFrame(tk.Frame):
             return False
 
     def update_matrix_input(self):
-        for widget in self.matrix_input_frame.winfo_children():
-            widget.destroy()
-        self.matrix_entries = []
         rows = self.rows.get()
         cols = self.cols.get()
         if rows == 1 and cols == 1:
@@ -458,135 +723,43 @@ class BiMatrixGameFrame(tk.Frame):
                                  "Биматрица не может быть размером 1x1!\nДопустимые размеры: 1x2, 2x1 или NxN.")
             self.cols.set(2)
             cols = 2
-        # Заголовки столбцов
-        for j in range(cols):
-            tk.Label(self.matrix_input_frame, text=f"Col {j + 1}").grid(row=0, column=j + 1, padx=2, pady=2)
-        # Поля ввода
-        for i in range(rows):
-            tk.Label(self.matrix_input_frame, text=f"Row {i + 1}").grid(row=i + 1, column=0, padx=2, pady=2)
-            row_entries = []
-            for j in range(cols):
-                cell_frame = tk.Frame(self.matrix_input_frame)
-                cell_frame.grid(row=i + 1, column=j + 1, padx=2, pady=2)
-                entry1 = tk.Entry(cell_frame, width=5)
-                entry1.pack(side=tk.LEFT)
-                tk.Label(cell_frame, text=";").pack(side=tk.LEFT)
-                entry2 = tk.Entry(cell_frame, width=5)
-                entry2.pack(side=tk.LEFT)
-                entry1.insert(0, "0")
-                entry2.insert(0, "0")
-                row_entries.append((entry1, entry2))
-            self.matrix_entries.append(row_entries)
+        with instrumentation.stage("render.resize"):
+            self.model.resize(rows, cols)
 
     def get_matrices(self):
-        matrix1 = []
-        matrix2 = []
-        try:
-            for i in range(self.rows.get()):
-                row1 = []
-                row2 = []
-                for j in range(self.cols.get()):
-                    val1 = float(self.matrix_entries[i][j][0].get())
-                    val2 = float(self.matrix_entries[i][j][1].get())
-                    row1.append(val1)
-                    row2.append(val2)
-                matrix1.append(row1)
-                matrix2.append(row2)
-            return np.array(matrix1), np.array(matrix2)
-        except ValueError:
-            messagebox.showerror("Ошибка", "Пожалуйста, введите корректные числа в ячейки")
-            return None, None
+        with instrumentation.stage("parse.input"):
+            if not self.sheet.commit_edit():
+                return None, None
+        return self.model.matrices
+
+    def get_dynamics_matrices(self):
+        matrix1, matrix2 = self.get_matrices()
+        return None if matrix1 is None or matrix2 is None else (matrix1, matrix2)
 
     def load_from_file(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        file_path = filedialog.askopenfilename(filetypes=game_io.FILE_TYPES)
         if not file_path:
             return
         try:
-            with open(file_path, 'r') as file:
-                lines = [line.strip() for line in file if line.strip()]
-            if not lines:
-                messagebox.showerror("Ошибка", "Файл пуст!\n")
-                return
-
-            # Парсинг размеров матрицы
-            try:
-                dims = list(map(int, lines[0].split()))
-            except ValueError:
-                messagebox.showerror("Ошибка", "Некорректный формат размеров матрицы в файле!")
-                return
-            if len(dims) != 2:
-                messagebox.showerror("Ошибка", "Первая строка должна содержать ровно два числа (строки и столбцы)!")
-                return
-            rows, cols = dims
-            if rows < 1 or cols < 1:
-                messagebox.showerror("Ошибка", "Размеры матрицы должны быть положительными!")
-                return
-            if rows == 1 and cols == 1:
-                messagebox.showerror("Ошибка",
-                                     "Биматрица из файла не может быть размером 1x1!\nДопустимые размеры: 1x2, 2x1 или NxN.")
-                return
-            if rows > 20 or cols > 20:
-                messagebox.showerror("Ошибка", "Максимальная размерность матрицы - 20x20!")
-                return
-
-            # Для биматричной игры должно быть 1 + 2*rows строк
-            if len(lines) < 1 + 2 * rows:
-                messagebox.showerror("Ошибка", "В файле недостаточно строк для биматричной игры!")
-                return
-
-            matrix1 = []
-            matrix2 = []
-            for idx in range(rows):
-                try:
-                    vals = list(map(float, lines[1 + idx].split()))
-                except ValueError:
-                    messagebox.showerror("Ошибка", f"Некорректный ввод данных в строке {2 + idx} (ожидались числа)!")
-                    return
-                if len(vals) != cols:
-                    messagebox.showerror("Ошибка", f"В строке {2 + idx} должно быть {cols} чисел, найдено {len(vals)}!")
-                    return
-                matrix1.append(vals)
-            for idx in range(rows):
-                try:
-                    vals = list(map(float, lines[1 + rows + idx].split()))
-                except ValueError:
-                    messagebox.showerror("Ошибка",
-                                         f"Некорректный ввод данных в строке {2 + rows + idx} (ожидались числа)!")
-                    return
-                if len(vals) != cols:
-                    messagebox.showerror("Ошибка",
-                                         f"В строке {2 + rows + idx} должно быть {cols} чисел, найдено {len(vals)}!")
-                    return
-                matrix2.append(vals)
-
-            self.rows.set(rows)
-            self.cols.set(cols)
-            self.update_matrix_input()
-            for i in range(rows):
-                for j in range(cols):
-                    self.matrix_entries[i][j][0].delete(0, tk.END)
-                    self.matrix_entries[i][j][0].insert(0, str(matrix1[i][j]))
-                    self.matrix_entries[i][j][1].delete(0, tk.END)
-                    self.matrix_entries[i][j][1].insert(0, str(matrix2[i][j]))
-            self.output_result(f"Биматрица успешно загружена из {file_path}\n")
+            matrix1, matrix2 = game_io.load_game(file_path, players=2)
+        except game_io.GameFileError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка загрузки файла: {str(e)}")
+            return
+        self.set_matrices_to_input(matrix1, matrix2, label="Загрузка из файла")
+        self.output_result(f"Биматрица успешно загружена из {file_path}\n")
 
     def save_to_file(self):
         matrix1, matrix2 = self.get_matrices()
         if matrix1 is None or matrix2 is None:
             return
-        file_path = filedialog.asksaveasfilename(defaultextension=".txt",
-                                                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=game_io.FILE_TYPES)
         if not file_path:
             return
         try:
-            with open(file_path, 'w') as file:
-                file.write(f"{self.rows.get()} {self.cols.get()}\n")
-                for row in matrix1:
-                    file.write(" ".join(map(str, row)) + "\n")
-                for row in matrix2:
-                    file.write(" ".join(map(str, row)) + "\n")
+            game_io.save_game(file_path, matrix1, matrix2)
             self.output_result(f"Биматрица сохранена в {file_path}\n")
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка сохранения файла: {str(e)}")
@@ -594,172 +767,359 @@ class BiMatrixGameFrame(tk.Frame):
     def generate_random(self):
         rows = self.rows.get()
         cols = self.cols.get()
-        for i in range(rows):
-            for j in range(cols):
-                self.matrix_entries[i][j][0].delete(0, tk.END)
-                self.matrix_entries[i][j][0].insert(0, str(random.randint(-10, 10)))
-                self.matrix_entries[i][j][1].delete(0, tk.END)
-                self.matrix_entries[i][j][1].insert(0, str(random.randint(-10, 10)))
-        self.output_result(f"Сгенерирована случайная биматрица {rows}x{cols}\n")
+        family = GAME_FAMILIES[self.family.get()]
+        games = generators.generate(family, rows, cols, rng=self.rng)
+        self.set_matrices_to_input(*games.matrices, label="Случайная биматрица")
+        self.output_result(f"Сгенерирована случайная биматрица {rows}x{cols} ({self.family.get().lower()})\n")
+
+    def set_matrices_to_input(self, matrix1, matrix2, label=""):
+        self.rows.set(matrix1.shape[0])
+        self.cols.set(matrix1.shape[1])
+        self.model.replace(matrix1, matrix2, label=label)
 
     def find_nash_equilibrium(self):
         matrix1, matrix2 = self.get_matrices()
         if matrix1 is None or matrix2 is None:
             return
-        try:
-            nash_equilibria = []
-            rows, cols = self.rows.get(), self.cols.get()
-            for i in range(rows):
-                for j in range(cols):
-                    is_nash = True
-                    # Для игрока 1: сравниваем значения из matrix1
-                    for k in range(rows):
-                        if matrix1[k, j] > matrix1[i, j]:
-                            is_nash = False
-                            break
-                    if is_nash:
-                        # Для игрока 2: сравниваем значения из matrix2
-                        for l in range(cols):
-                            if matrix2[i, l] > matrix2[i, j]:
-                                is_nash = False
-                                break
-                    if is_nash:
-                        nash_equilibria.append((i + 1, j + 1))
-            if nash_equilibria:
-                eq_str = "\n".join([f"(Row {r}, Column {c})" for r, c in nash_equilibria])
-                result = f"Найдено {len(nash_equilibria)} равновесие(я):\n" + eq_str + "\n"
-            else:
-                result = "В чистых стратегиях равновесие Нэша не найдено\n"
-            self.output_result(result)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка поиска равновесия: {str(e)}")
+        self.run_incremental((matrix1, matrix2), lambda analysis: self.show_nash_equilibria(analysis.nash_result()))
 
-    def remove_strictly_dominated(self):
+    def show_nash_equilibria(self, res):
+        if res.found:
+            eq_str = "\n".join([f"(Row {r + 1}, Column {c + 1})" for r, c in res.equilibria])
+            result = f"Найдено {len(res.equilibria)} равновесие(я):\n" + eq_str + "\n"
+        else:
+            result = "В чистых стратегиях равновесие Нэша не найдено\n"
+        self.output_result(result)
+
+    def find_mixed_equilibrium(self):
+        matrix1, matrix2 = self.get_matrices()
+        if matrix1 is None or matrix2 is None:
+            return
+        # Поворот таблиц — цикл на Python, поэтому в отдельном процессе, а не потоке
+        self.run_job("mixed", "Лемке-Хоусон", mixed_nash.lemke_howson, matrix1, matrix2, in_process=True,
+                     on_done=lambda eq: self.output_result("Равновесие (Лемке-Хоусон):\n"
+                                                           + describe_mixed_equilibrium(eq)),
+                     error_message="Ошибка поиска равновесия")
+
+    def find_all_mixed_equilibria(self):
+        matrix1, matrix2 = self.get_matrices()
+        if matrix1 is None or matrix2 is None:
+            return
+        rows, cols = matrix1.shape
+        max_support = None
+        total = mixed_nash.pair_count(rows, cols)
+        if total > SUPPORT_PAIRS_LIMIT:
+            max_support = 1
+            while mixed_nash.pair_count(rows, cols, max_support + 1) <= SUPPORT_PAIRS_LIMIT:
+                max_support += 1
+            self.output_result(f"Полный перебор — {total:.2e} пар носителей, проверяются носители "
+                               f"размера не больше {max_support}. Найденный список может быть неполным; "
+                               f"одно равновесие быстро находит «Смешанное (Лемке-Хоусон)»\n")
+        self.run_job("mixed_all", "Все смешанные", mixed_nash.support_enumeration, matrix1, matrix2,
+                     max_support=max_support, report_progress=True, on_done=self.show_all_mixed_equilibria,
+                     error_message="Ошибка поиска равновесия")
+
+    def find_correlated_equilibrium(self):
+        matrix1, matrix2 = self.get_matrices()
+        if matrix1 is None or matrix2 is None:
+            return
+        objective = CORRELATED_OBJECTIVES[self.objective.get()]
+        title = self.objective.get().lower()
+        self.run_job("correlated", "Коррелированное равновесие", correlated.correlated_equilibrium,
+                     matrix1, matrix2, objective, report_progress=True,
+                     on_done=lambda eq: self.output_result(f"Коррелированное равновесие (макс.: {title}):\n"
+                                                           + describe_correlated_equilibrium(eq)),
+                     error_message="Ошибка поиска равновесия")
+
+    def show_all_mixed_equilibria(self, equilibria):
+        result = f"Найдено {len(equilibria)} равновесие(я) в смешанных стратегиях:\n"
+        result += "".join(describe_mixed_equilibrium(eq) for eq in equilibria)
+        self.output_result(result)
+
+    def remove_dominated(self, strict):
         # Для биматричных игр удаляем стратегии для выбранного игрока отдельно,
         # используя соответствующую матрицу выигрышей
         matrix1, matrix2 = self.get_matrices()
         if matrix1 is None or matrix2 is None:
             return
-        player = self.player_var.get()
-        result = ""
-        if player == "row":
-            rows_to_remove = set()
-            info = []
-            for i in range(matrix1.shape[0]):
-                for k in range(matrix1.shape[0]):
-                    if i != k and np.all(matrix1[i, :] < matrix1[k, :]):
-                        rows_to_remove.add(i)
-                        info.append(f"Строка {i + 1} строго доминируется строкой {k + 1}")
-                        info.append(f"Удалена строка {i + 1}")
-            if rows_to_remove:
-                new_m1 = np.delete(matrix1, list(rows_to_remove), axis=0)
-                new_m2 = np.delete(matrix2, list(rows_to_remove), axis=0)
-                self.rows.set(new_m1.shape[0])
-                self.update_matrix_input()
-                for i in range(new_m1.shape[0]):
-                    for j in range(new_m1.shape[1]):
-                        self.matrix_entries[i][j][0].delete(0, tk.END)
-                        self.matrix_entries[i][j][0].insert(0, str(new_m1[i, j]))
-                        self.matrix_entries[i][j][1].delete(0, tk.END)
-                        self.matrix_entries[i][j][1].insert(0, str(new_m2[i, j]))
-                result += "--- Удаление строго доминируемых строк (игрок 1) ---\n" + "\n".join(info) + "\n"
-            else:
-                result += "Строго доминируемых строк не найдено\n"
-        else:  # column
-            cols_to_remove = set()
-            info = []
-            for j in range(matrix2.shape[1]):
-                for l in range(matrix2.shape[1]):
-                    if j != l and np.all(matrix2[:, j] < matrix2[:, l]):
-                        cols_to_remove.add(j)
-                        info.append(f"Столбец {j + 1} строго доминируется столбцом {l + 1}")
-                        info.append(f"Удален столбец {j + 1}")
-            if cols_to_remove:
-                new_m1 = np.delete(matrix1, list(cols_to_remove), axis=1)
-                new_m2 = np.delete(matrix2, list(cols_to_remove), axis=1)
-                self.cols.set(new_m1.shape[1])
-                self.update_matrix_input()
-                for i in range(new_m1.shape[0]):
-                    for j in range(new_m1.shape[1]):
-                        self.matrix_entries[i][j][0].delete(0, tk.END)
-                        self.matrix_entries[i][j][0].insert(0, str(new_m1[i, j]))
-                        self.matrix_entries[i][j][1].delete(0, tk.END)
-                        self.matrix_entries[i][j][1].insert(0, str(new_m2[i, j]))
-                result += "--- Удаление строго доминируемых столбцов (игрок 2) ---\n" + "\n".join(info) + "\n"
-            else:
-                result += "Строго доминируемых столбцов не найдено\n"
-        self.output_result(result)
+        self.find_dominated((matrix1, matrix2), self.player_var.get(), strict)
+
+    def apply_dominance(self, res):
+        if res.changed:
+            self.apply_dominance_step(res)
+        suffix = " (игрок 1)" if res.player == game_engine.ROW else " (игрок 2)"
+        self.output_result(describe_dominance(res, suffix))
+
+    def remove_strictly_dominated(self):
+        self.remove_dominated(strict=True)
 
     def remove_weakly_dominated(self):
+        self.remove_dominated(strict=False)
+
+    def remove_never_best_responses(self):
         matrix1, matrix2 = self.get_matrices()
         if matrix1 is None or matrix2 is None:
             return
-        player = self.player_var.get()
-        result = ""
-        if player == "row":
-            rows_to_remove = set()
-            info = []
-            for i in range(matrix1.shape[0]):
-                for k in range(matrix1.shape[0]):
-                    if i != k and (np.all(matrix1[i, :] <= matrix1[k, :]) and np.any(matrix1[i, :] < matrix1[k, :])):
-                        rows_to_remove.add(i)
-                        info.append(f"Строка {i + 1} слабо доминируется строкой {k + 1}")
-                        info.append(f"Удалена строка {i + 1}")
-            if rows_to_remove:
-                new_m1 = np.delete(matrix1, list(rows_to_remove), axis=0)
-                new_m2 = np.delete(matrix2, list(rows_to_remove), axis=0)
-                self.rows.set(new_m1.shape[0])
-                self.update_matrix_input()
-                for i in range(new_m1.shape[0]):
-                    for j in range(new_m1.shape[1]):
-                        self.matrix_entries[i][j][0].delete(0, tk.END)
-                        self.matrix_entries[i][j][0].insert(0, str(new_m1[i, j]))
-                        self.matrix_entries[i][j][1].delete(0, tk.END)
-                        self.matrix_entries[i][j][1].insert(0, str(new_m2[i, j]))
-                result += "--- Удаление слабо доминируемых строк (игрок 1) ---\n" + "\n".join(info) + "\n"
-            else:
-                result += "Слабо доминируемых строк не найдено\n"
-        else:
-            cols_to_remove = set()
-            info = []
-            for j in range(matrix2.shape[1]):
-                for l in range(matrix2.shape[1]):
-                    if j != l and (np.all(matrix2[:, j] <= matrix2[:, l]) and np.any(matrix2[:, j] < matrix2[:, l])):
-                        cols_to_remove.add(j)
-                        info.append(f"Столбец {j + 1} слабо доминируется столбцом {l + 1}")
-                        info.append(f"Удален столбец {j + 1}")
-            if cols_to_remove:
-                new_m1 = np.delete(matrix1, list(cols_to_remove), axis=1)
-                new_m2 = np.delete(matrix2, list(cols_to_remove), axis=1)
-                self.cols.set(new_m1.shape[1])
-                self.update_matrix_input()
-                for i in range(new_m1.shape[0]):
-                    for j in range(new_m1.shape[1]):
-                        self.matrix_entries[i][j][0].delete(0, tk.END)
-                        self.matrix_entries[i][j][0].insert(0, str(new_m1[i, j]))
-                        self.matrix_entries[i][j][1].delete(0, tk.END)
-                        self.matrix_entries[i][j][1].insert(0, str(new_m2[i, j]))
-                result += "--- Удаление слабо доминируемых столбцов (игрок 2) ---\n" + "\n".join(info) + "\n"
+        self.run_job("dominance", "Удаление НЛО", never_best_response.remove_never_best_responses,
+                     matrix1, matrix2, report_progress=True, on_done=self.apply_never_best_responses,
+                     error_message="Ошибка при расчётах")
+
+    def apply_never_best_responses(self, res):
+        if res.changed:
+            self.apply_reduction(res.row_index, res.col_index, "Удаление НЛО")
+        self.output_result(describe_never_best_responses(res))
+
+    def remove_dominated_iteratively(self, strict):
+        # Поочерёдное удаление для обоих игроков до неподвижной точки
+        matrix1, matrix2 = self.get_matrices()
+        if matrix1 is None or matrix2 is None:
+            return
+        self.run_job("dominance", "Итеративное удаление", dominance.iterated_elimination, matrix1, matrix2,
+                     strict=strict, report_progress=True, on_done=self.apply_iterated_dominance,
+                     error_message="Ошибка при расчётах")
+
+    def apply_iterated_dominance(self, res):
+        kind = "строго" if res.strict else "слабо"
+        if not res.changed:
+            self.output_result(f"{kind.capitalize()} доминируемых стратегий не найдено\n")
+            return
+        info = []
+        for step in res.steps:
+            if step.player == game_engine.ROW:
+                for i, k in zip(step.removed, step.dominators):
+                    info.append(f"Строка {i + 1} {kind} доминируется строкой {k + 1}")
             else:
-                result += "Слабо доминируемых столбцов не найдено\n"
-        self.output_result(result)
+                for j, l in zip(step.removed, step.dominators):
+                    info.append(f"Столбец {j + 1} {kind} доминируется столбцом {l + 1}")
+        self.apply_reduction(res.row_index, res.col_index, f"Итеративное удаление {kind} доминируемых")
+        rows = ", ".join(str(i + 1) for i in res.row_index)
+        cols = ", ".join(str(j + 1) for j in res.col_index)
+        self.output_result(f"--- Итеративное удаление {kind} доминируемых стратегий ---\n" + "\n".join(info) + "\n"
+                           f"Раундов: {res.rounds}\nОстались строки: {rows}\nОстались столбцы: {cols}\n")
 
-    def output_result(self, message):
-        if self.output_dest.get() == "results":
-            self.result_text.insert(tk.END, f"[{get_current_timestamp()}] " + message)
-            self.result_text.see(tk.END)
-        else:
-            file_path = filedialog.asksaveasfilename(defaultextension=".txt",
-                                                     filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
-            if file_path:
-                try:
-                    with open(file_path, 'w') as file:
-                        file.write(f"Результаты ({get_current_timestamp()}):\n\n")
-                        file.write(message)
-                    self.result_text.insert(tk.END, f"Результаты сохранены в {file_path}\n")
-                    self.result_text.see(tk.END)
-                except Exception as e:
-                    messagebox.showerror("Ошибка", f"Ошибка сохранения: {str(e)}")
+
+# ---------------------------
+# Вкладка для игр N лиц
+# ---------------------------
+class NPlayerGameFrame(AnalysisFrame):
+    # Выигрыши — массив (N, s_1, ..., s_N) (см. nplayer); таблицы нет, игра задаётся
+    # генерацией или файлом .npy / .npz, результаты выводятся в журнал
+    MAX_LISTED = 100                              # сколько равновесий выводить списком
+
+    def __init__(self, master, scheduler, cache=None):
+        super().__init__(master, scheduler, cache)
+        self.strategies = tk.StringVar(value="3x3x3")
+        self.payoffs = game_engine.compact(generators.random_nplayer((3, 3, 3), rng=self.rng))
+        self.output_dest = tk.StringVar(value="results")
+        self.create_widgets()
+
+    def create_widgets(self):
+        top_frame = tk.Frame(self)
+        top_frame.pack(padx=5, pady=5, fill=tk.X)
+
+        dim_frame = tk.LabelFrame(top_frame, text="Стратегии игроков", padx=5, pady=5)
+        dim_frame.pack(side=tk.LEFT, padx=5)
+        tk.Entry(dim_frame, textvariable=self.strategies, width=20).pack(side=tk.LEFT, padx=2)
+        tk.Label(dim_frame, text="(например, 3x4x2)").pack(side=tk.LEFT, padx=2)
+
+        op_frame = tk.Frame(top_frame)
+        op_frame.pack(side=tk.LEFT, padx=5)
+        tk.Button(op_frame, text="Загрузить из файла", command=self.load_from_file).pack(side=tk.LEFT, padx=2)
+        tk.Button(op_frame, text="Сохранить в файл", command=self.save_to_file).pack(side=tk.LEFT, padx=2)
+        tk.Button(op_frame, text="Случайная игра", command=self.generate_random).pack(side=tk.LEFT, padx=2)
+        tk.Button(op_frame, text="Найти равновесия (Нэш)", command=self.find_nash_equilibria) \
+            .pack(side=tk.LEFT, padx=2)
+
+        dom_frame = tk.LabelFrame(self, text="Удаление доминируемых стратегий", padx=5, pady=5)
+        dom_frame.pack(padx=5, pady=5, fill=tk.X)
+        tk.Button(dom_frame, text="Итеративно (строго)",
+                  command=lambda: self.remove_dominated_iteratively(strict=True)).pack(side=tk.LEFT, padx=5)
+        tk.Button(dom_frame, text="Итеративно (слабо)",
+                  command=lambda: self.remove_dominated_iteratively(strict=False)).pack(side=tk.LEFT, padx=5)
+
+        output_frame = tk.Frame(self)
+        output_frame.pack(padx=5, pady=5, fill=tk.X)
+        tk.Label(output_frame, text="Output:").pack(side=tk.LEFT)
+        tk.Radiobutton(output_frame, text="Results", variable=self.output_dest, value="results",
+                       command=self.on_output_changed).pack(side=tk.LEFT)
+        tk.Radiobutton(output_frame, text="File", variable=self.output_dest, value="file",
+                       command=self.on_output_changed).pack(side=tk.LEFT)
+
+        self.summary = tk.StringVar()
+        tk.Label(self, textvariable=self.summary, anchor="w").pack(padx=5, pady=2, fill=tk.X)
+        self.create_status_bar()
+        self.create_result_log()
+        self.set_payoffs(self.payoffs)
+
+    def parse_strategies(self):
+        try:
+            strategies = tuple(int(s) for s in self.strategies.get().lower().replace("х", "x").split("x"))
+        except ValueError:
+            messagebox.showerror("Ошибка", "Числа стратегий задаются через x, например 3x4x2")
+            return None
+        if len(strategies) < 2 or min(strategies) < 1:
+            messagebox.showerror("Ошибка", "Нужно не меньше двух игроков с положительным числом стратегий")
+            return None
+        return strategies
+
+    def set_payoffs(self, payoffs):
+        # Новая игра делает запущенные анализы вкладки устаревшими
+        self.scheduler.cancel_owner(self)
+        self.payoffs = payoffs
+        strategies = payoffs.shape[1:]
+        self.strategies.set("x".join(str(s) for s in strategies))
+        self.summary.set(f"Игроков: {len(strategies)}, стратегий: {'x'.join(str(s) for s in strategies)}, "
+                         f"профилей: {nplayer.profiles(payoffs)}")
+
+    def load_from_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[("NumPy", "*.npy *.npz"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            payoffs = nplayer.as_payoff_tensor(game_io.load_nplayer(file_path))
+        except game_io.GameFileError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка загрузки файла: {str(e)}")
+            return
+        self.set_payoffs(payoffs)
+        self.output_result(f"Игра {payoffs.shape[0]} лиц загружена из {file_path}\n")
+
+    def save_to_file(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".npy",
+                                                 filetypes=[("NumPy", "*.npy *.npz"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            game_io.save_nplayer(file_path, self.payoffs)
+            self.output_result(f"Игра сохранена в {file_path}\n")
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка сохранения файла: {str(e)}")
+
+    def generate_random(self):
+        strategies = self.parse_strategies()
+        if strategies is None:
+            return
+        try:
+            payoffs = generators.random_nplayer(strategies, rng=self.rng)
+            payoffs = nplayer.as_payoff_tensor(game_engine.compact(payoffs))
+        except (ValueError, MemoryError) as e:
+            messagebox.showerror("Ошибка", f"Ошибка генерации: {str(e)}")
+            return
+        self.set_payoffs(payoffs)
+        self.output_result(f"Сгенерирована случайная игра {len(strategies)} лиц ({self.strategies.get()})\n")
+
+    def find_nash_equilibria(self):
+        self.run_job("nash", "Равновесия Нэша", nplayer.pure_nash_equilibria, self.payoffs,
+                     report_progress=True, on_done=self.show_nash_equilibria,
+                     error_message="Ошибка поиска равновесия")
+
+    def show_nash_equilibria(self, res):
+        if not res.found:
+            self.output_result("В чистых стратегиях равновесие Нэша не найдено\n")
+            return
+        lines = ["(" + ", ".join(str(a + 1) for a in profile) + ")" for profile in res.equilibria[:self.MAX_LISTED]]
+        if len(res.equilibria) > self.MAX_LISTED:
+            lines.append(f"... и ещё {len(res.equilibria) - self.MAX_LISTED}")
+        self.output_result(f"Найдено {len(res.equilibria)} равновесие(я) (стратегии игроков 1..N):\n"
+                           + "\n".join(lines) + "\n")
+
+    def remove_dominated_iteratively(self, strict):
+        self.run_job("dominance", "Итеративное удаление", nplayer.iterated_elimination, self.payoffs,
+                     strict=strict, report_progress=True, on_done=self.apply_iterated_dominance,
+                     error_message="Ошибка при расчётах")
+
+    def apply_iterated_dominance(self, res):
+        kind = "строго" if res.strict else "слабо"
+        if not res.changed:
+            self.output_result(f"{kind.capitalize()} доминируемых стратегий не найдено\n")
+            return
+        info = []
+        for step in res.steps:
+            for i, k in zip(step.removed, step.dominators):
+                info.append(f"Игрок {step.player + 1}: стратегия {i + 1} {kind} доминируется стратегией {k + 1}")
+        remaining = "\n".join(f"Игрок {p + 1}: " + ", ".join(str(i + 1) for i in index)
+                              for p, index in enumerate(res.indices))
+        self.set_payoffs(res.payoffs)
+        self.output_result(f"--- Итеративное удаление {kind} доминируемых стратегий ---\n" + "\n".join(info) + "\n"
+                           f"Раундов: {res.rounds}\nОстались стратегии:\n{remaining}\n")
+
+
+# ---------------------------
+# Вкладка диагностики: профилирование этапов
+# ---------------------------
+class DiagnosticsFrame(tk.Frame):
+    COLUMNS = (("count", "Вызовов", 70), ("total", "Всего, мс", 90), ("mean", "Среднее, мс", 90),
+               ("max", "Макс., мс", 90), ("peak", "Пик памяти, МиБ", 110))
+
+    def __init__(self, master, scheduler, cache=None, refresh_ms=1000):
+        super().__init__(master)
+        self.scheduler = scheduler
+        self.cache = cache
+        self.refresh_ms = refresh_ms
+        self.enabled = tk.BooleanVar(value=instrumentation.PROFILER.enabled)
+        self.memory = tk.BooleanVar(value=instrumentation.PROFILER.memory)
+        self.info = tk.StringVar()
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        top_frame = tk.Frame(self)
+        top_frame.pack(padx=5, pady=5, fill=tk.X)
+        tk.Checkbutton(top_frame, text="Профилирование", variable=self.enabled,
+                       command=self.on_switch).pack(side=tk.LEFT, padx=2)
+        tk.Checkbutton(top_frame, text="Память (tracemalloc, медленнее)", variable=self.memory,
+                       command=self.on_switch).pack(side=tk.LEFT, padx=2)
+        tk.Button(top_frame, text="Обновить", command=self.show_stats).pack(side=tk.LEFT, padx=2)
+        tk.Button(top_frame, text="Сбросить", command=self.reset).pack(side=tk.LEFT, padx=2)
+        tk.Button(top_frame, text="Экспорт JSON", command=self.export).pack(side=tk.LEFT, padx=2)
+
+        self.table = ttk.Treeview(self, columns=[c for c, _, _ in self.COLUMNS], height=15)
+        self.table.heading("#0", text="Этап")
+        self.table.column("#0", width=300)
+        for column, title, width in self.COLUMNS:
+            self.table.heading(column, text=title)
+            self.table.column(column, width=width, anchor="e")
+        self.table.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        tk.Label(self, textvariable=self.info, anchor="w", justify=tk.LEFT).pack(padx=5, pady=2, fill=tk.X)
+
+    def on_switch(self):
+        instrumentation.disable()
+        if self.enabled.get():
+            instrumentation.enable(memory=self.memory.get())
+
+    def reset(self):
+        instrumentation.PROFILER.reset()
+        self.show_stats()
+
+    def export(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            instrumentation.export_json(file_path)
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Ошибка сохранения файла: {str(e)}")
+
+    def show_stats(self):
+        self.table.delete(*self.table.get_children())
+        for name, stats in instrumentation.PROFILER.summary().items():
+            peak = "" if stats["peak_bytes"] is None else f"{stats['peak_bytes'] / 2 ** 20:.2f}"
+            self.table.insert("", tk.END, text=name,
+                              values=(stats["count"], f"{stats['total'] * 1000:.2f}",
+                                      f"{stats['mean'] * 1000:.3f}", f"{stats['max'] * 1000:.2f}", peak))
+        info = [f"Фоновых задач: {len(self.scheduler.running())}"]
+        if self.cache is not None:
+            info.append("Кэш: " + ", ".join(f"{k}={v}" for k, v in self.cache.stats.items()))
+        self.info.set("\n".join(info))
+
+    def refresh(self):
+        # Пока профилирование включено, таблица обновляется сама
+        if instrumentation.PROFILER.enabled:
+            self.show_stats()
+        self.after(self.refresh_ms, self.refresh)
 
 
 # ---------------------------
@@ -804,13 +1164,32 @@ class GameTheoryApp(tk.Tk):
         notebook = ttk.Notebook(scrollable_frame)
         notebook.pack(fill="both", expand=True)
 
+        # Общий планировщик фоновых анализов: вкладки могут считать одновременно
+        self.scheduler = JobScheduler(self)
+        # Общий кэш результатов (каталог на диске — переменная окружения GAME_CACHE_DIR)
+        self.cache = result_cache.default_cache()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Предположим, что у вас есть два класса: MatrixGameFrame и BiMatrixGameFrame
-        self.matrix_game_frame = MatrixGameFrame(notebook)
+        self.matrix_game_frame = MatrixGameFrame(notebook, self.scheduler, self.cache)
         notebook.add(self.matrix_game_frame, text="Матричные игры")
 
-        self.bimatrix_game_frame = BiMatrixGameFrame(notebook)
+        self.bimatrix_game_frame = BiMatrixGameFrame(notebook, self.scheduler, self.cache)
         notebook.add(self.bimatrix_game_frame, text="Биматричные игры")
 
+        self.nplayer_game_frame = NPlayerGameFrame(notebook, self.scheduler, self.cache)
+        notebook.add(self.nplayer_game_frame, text="Игры N лиц")
+
+        self.diagnostics_frame = DiagnosticsFrame(notebook, self.scheduler, self.cache)
+        notebook.add(self.diagnostics_frame, text="Диагностика")
+
+    def on_close(self):
+        self.scheduler.shutdown()
+        self.matrix_game_frame.close()
+        self.bimatrix_game_frame.close()
+        self.nplayer_game_frame.close()
+        self.destroy()
+
 
 if __name__ == "__main__":
     app = GameTheoryApp()
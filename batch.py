@@ -0,0 +1,294 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+import game_engine
+import dominance
+import game_io
+import instrumentation
+import out_of_core
+import result_cache
+
+
+# ---------------------------
+# Пакетный режим: анализ каталогов игр из командной строки
+# ---------------------------
+# python batch.py games/ "scenarios/**/*.txt" -a maximin,dominance,nash -o results.jsonl
+#
+# Файлы читаются game_io.load_game (те же форматы, что и в GUI) и анализируются
+# теми же функциями движка. Файлы распределяются по пулу процессов порциями,
+# результаты пишутся по одной строке JSON на игру в порядке входных файлов,
+# поэтому вывод можно читать, пока обработка ещё идёт.
+# Ошибка в одном файле не останавливает пакет: в строке результата будет поле "error".
+#
+# Одна матрица — антагонистическая игра (выигрыши второго игрока -A),
+# две — биматричная. Индексы стратегий в выводе начинаются с 0.
+#
+# Повторяющиеся игры не пересчитываются: у каждого рабочего процесса свой
+# result_cache.ResultCache в памяти, а с --cache-dir (или GAME_CACHE_DIR) — общий
+# каталог на диске, который сохраняется между запусками и используется и GUI.
+# Ключи — вызовы функций движка с аргументами, поэтому с GUI общие только результаты
+# тех же вызовов: итеративного удаления доминируемых стратегий в биматричной игре.
+# Максимин и чистые равновесия GUI считает через incremental.IncrementalAnalysis
+# (сводки обновляются при правке ячеек) и в кэш их не пишет.
+#
+# Отображённые в память .npy больше OUT_OF_CORE_BYTES анализируются потоково
+# (out_of_core) блоками строк с ограниченной памятью; итеративное удаление
+# доминируемых стратегий для них не выполняется — ему нужны попарные сравнения всех строк.
+#
+# --profile PATH включает профилирование (instrumentation): в строку каждого файла
+# добавляется поле "profile" — время этапов (разбор, расчёты), а сводка по всему
+# пакету, включая запись результатов, сохраняется в PATH в формате JSON.
+
+ANALYSES = ("maximin", "dominance", "nash")
+MAX_EQUILIBRIA = 1000
+OUT_OF_CORE_BYTES = 256 * 2 ** 20
+
+
+def expand_inputs(patterns, recursive=True):
+    # Каталоги раскрываются в файлы поддерживаемых форматов, шаблоны — через glob.
+    # Возвращает отсортированный список без повторов.
+    extensions = game_io.TEXT_EXTENSIONS + game_io.BINARY_EXTENSIONS
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in files
+                             if os.path.splitext(name)[1].lower() in extensions)
+                if not recursive:
+                    break
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            paths.update(p for p in glob.glob(pattern, recursive=recursive) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def _maximin_record(matrix, cache):
+    return _maximin_fields(cache.call(game_engine.maximin_minimax, matrix))
+
+
+def _maximin_fields(res):
+    return {"maximin": res.maximin, "maximin_row": res.maximin_row,
+            "minimax": res.minimax, "minimax_col": res.minimax_col, "saddle": res.saddle}
+
+
+_caches = {}
+
+
+def worker_cache(directory=None):
+    # Один кэш на процесс и каталог
+    if directory not in _caches:
+        _caches[directory] = result_cache.ResultCache(directory=directory)
+    return _caches[directory]
+
+
+def _nash_record(found, max_equilibria):
+    return {"count": len(found), "equilibria": [list(eq) for eq in found[:max_equilibria]],
+            "truncated": len(found) > max_equilibria}
+
+
+def analyze_large_game(matrices, analyses=ANALYSES, max_equilibria=MAX_EQUILIBRIA):
+    # Потоковый анализ без загрузки матриц в память (и без кэша: хэш потребовал бы лишнего прохода)
+    matrix1 = matrices[0]
+    matrix2 = matrices[1] if len(matrices) == 2 else None
+    record = {"players": len(matrices), "shape": list(matrix1.shape), "out_of_core": True}
+    if "maximin" in analyses:
+        res = out_of_core.maximin_minimax(matrix1)
+        record["maximin"] = _maximin_fields(res)
+        if matrix2 is not None:
+            record["maximin"] = {"row": record["maximin"],
+                                 "column": _maximin_fields(out_of_core.maximin_minimax(matrix2, transpose=True))}
+    if "dominance" in analyses:
+        record["dominance"] = {"skipped": "матрица не помещается в память"}
+    if "nash" in analyses:
+        found = []
+        count = 0
+        for eq in out_of_core.iter_pure_nash(matrix1, matrix2):
+            if count < max_equilibria:
+                found.append(eq)
+            count += 1
+        record["nash"] = {"count": count, "equilibria": [list(eq) for eq in found],
+                          "truncated": count > max_equilibria}
+    return record
+
+
+def analyze_game(matrices, analyses=ANALYSES, strict=True, max_equilibria=MAX_EQUILIBRIA, cache=None):
+    # Возвращает словарь, готовый к json.dumps
+    if isinstance(matrices[0], np.memmap) and sum(m.nbytes for m in matrices) > OUT_OF_CORE_BYTES:
+        return analyze_large_game(matrices, analyses, max_equilibria)
+    if cache is None:
+        cache = result_cache.ResultCache(max_bytes=0)
+    matrix1 = game_engine.as_payoff_matrix(matrices[0], None)
+    matrix2 = game_engine.negated(matrix1) if len(matrices) == 1 else game_engine.as_payoff_matrix(matrices[1], None)
+    record = {"players": len(matrices), "shape": list(matrix1.shape)}
+    if "maximin" in analyses:
+        if len(matrices) == 1:
+            record["maximin"] = _maximin_record(matrix1, cache)
+        else:
+            # Гарантированные уровни каждого игрока по своей матрице
+            record["maximin"] = {"row": _maximin_record(matrix1, cache),
+                                 "column": _maximin_record(np.ascontiguousarray(matrix2.T), cache)}
+    if "dominance" in analyses:
+        res = cache.call(dominance.iterated_elimination, matrix1, matrix2, strict=strict)
+        record["dominance"] = {"strict": strict, "rounds": res.rounds,
+                               "rows": res.row_index.tolist(), "cols": res.col_index.tolist(),
+                               "shape": list(res.matrices[0].shape)}
+    if "nash" in analyses:
+        found = cache.call(game_engine.pure_nash_equilibria, matrix1, matrix2).equilibria
+        record["nash"] = _nash_record(found, max_equilibria)
+    return record
+
+
+def analyze_game_batch(games, analyses=ANALYSES, strict=True, max_equilibria=MAX_EQUILIBRIA):
+    # games — список игр одного размера и с одним числом матриц (кортежи (A,) или (A, B)).
+    # Максимин и равновесия Нэша считаются одним векторным вызовом на всю пачку,
+    # записи совпадают с analyze_game.
+    matrix1 = np.stack([game_engine.as_payoff_matrix(g[0], None) for g in games])
+    players = len(games[0])
+    if players == 1:
+        matrix2 = game_engine.negated(matrix1)
+    else:
+        matrix2 = np.stack([game_engine.as_payoff_matrix(g[1], None) for g in games])
+    if matrix2.shape != matrix1.shape or any(len(g) != players for g in games):
+        raise ValueError("Игры пачки должны быть одного размера и с одним числом матриц")
+    records = [{"players": players, "shape": list(matrix1.shape[1:])} for _ in games]
+    if "maximin" in analyses:
+        rows = game_engine.maximin_minimax_batch(matrix1)
+        if players == 1:
+            for record, res in zip(records, rows):
+                record["maximin"] = _maximin_fields(res)
+        else:
+            cols = game_engine.maximin_minimax_batch(np.ascontiguousarray(matrix2.transpose(0, 2, 1)))
+            for record, row, col in zip(records, rows, cols):
+                record["maximin"] = {"row": _maximin_fields(row), "column": _maximin_fields(col)}
+    if "dominance" in analyses:
+        # Итеративное удаление последовательное по своей природе — по одной игре
+        for k, record in enumerate(records):
+            res = dominance.iterated_elimination(matrix1[k], matrix2[k], strict=strict)
+            record["dominance"] = {"strict": strict, "rounds": res.rounds,
+                                   "rows": res.row_index.tolist(), "cols": res.col_index.tolist(),
+                                   "shape": list(res.matrices[0].shape)}
+    if "nash" in analyses:
+        for record, res in zip(records, game_engine.pure_nash_batch(matrix1, matrix2)):
+            record["nash"] = _nash_record(res.equilibria, max_equilibria)
+    return records
+
+
+def analyze_file(path, analyses=ANALYSES, strict=True, players=None, max_equilibria=MAX_EQUILIBRIA,
+                 cache_dir=None, profile=False):
+    # Выполняется в рабочем процессе; исключения превращаются в поле "error"
+    if profile and not instrumentation.PROFILER.enabled:
+        instrumentation.enable()
+    start = time.perf_counter()
+    record = {"file": path}
+    with instrumentation.PROFILER.capture() as events:
+        try:
+            matrices = game_io.load_game(path, players=players)
+            record.update(analyze_game(matrices, analyses, strict, max_equilibria, worker_cache(cache_dir)))
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    if profile:
+        stages = {}
+        for event in events:
+            stages[event.name] = stages.get(event.name, 0.0) + event.seconds
+        record["profile"] = {name: round(seconds, 6) for name, seconds in stages.items()}
+    return record
+
+
+def run_batch(paths, out, analyses=ANALYSES, strict=True, players=None, workers=None, chunksize=None,
+              max_equilibria=MAX_EQUILIBRIA, cache_dir=None, profile=False):
+    # Пишет по строке JSON на файл в out. Возвращает (обработано, с ошибками).
+    task = partial(analyze_file, analyses=analyses, strict=strict, players=players,
+                   max_equilibria=max_equilibria, cache_dir=cache_dir, profile=profile)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        results = map(task, paths)
+        pool = None
+    else:
+        if chunksize is None:
+            # Мелкие игры обрабатываются за доли миллисекунды — порции снижают накладные расходы IPC
+            chunksize = max(1, min(64, len(paths) // (workers * 8)))
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(task, paths, chunksize=chunksize)
+    done = failed = 0
+    try:
+        for record in results:
+            if pool is not None and "profile" in record:
+                # Этапы из рабочих процессов переносятся в профиль главного процесса
+                for name, seconds in record["profile"].items():
+                    instrumentation.PROFILER.record(name, seconds, file=record["file"])
+            with instrumentation.stage("output.batch.write"):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            done += 1
+            failed += "error" in record
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    out.flush()
+    return done, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный анализ матричных и биматричных игр (вывод JSONL)")
+    parser.add_argument("inputs", nargs="+", help="файлы, каталоги или glob-шаблоны (например 'games/**/*.csv')")
+    parser.add_argument("-a", "--analyses", default=",".join(ANALYSES),
+                        help=f"анализы через запятую из: {', '.join(ANALYSES)} (по умолчанию все)")
+    parser.add_argument("-o", "--output", default="-", help="файл JSONL для результатов ('-' — stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов (по умолчанию — число ядер)")
+    parser.add_argument("--chunksize", type=int, default=None, help="файлов на одну передачу в процесс")
+    parser.add_argument("--weak", action="store_true", help="удалять слабо доминируемые стратегии (по умолчанию строго)")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=None,
+                        help="число матриц в файле (по умолчанию определяется автоматически)")
+    parser.add_argument("--max-equilibria", type=int, default=MAX_EQUILIBRIA,
+                        help="сколько равновесий Нэша выводить на игру (число найденных выводится всегда)")
+    parser.add_argument("--no-recursive", action="store_true", help="не обходить подкаталоги")
+    parser.add_argument("--cache-dir", default=os.environ.get(result_cache.CACHE_DIR_ENV) or None,
+                        help=f"каталог дискового кэша результатов (по умолчанию ${result_cache.CACHE_DIR_ENV})")
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="профилировать этапы и сохранить сводку в JSON")
+    args = parser.parse_args(argv)
+    args.analyses = tuple(a.strip() for a in args.analyses.split(",") if a.strip())
+    unknown = set(args.analyses) - set(ANALYSES)
+    if unknown:
+        parser.error(f"неизвестные анализы: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs, recursive=not args.no_recursive)
+    if not paths:
+        print("Не найдено ни одного файла игры", file=sys.stderr)
+        return 1
+    if args.profile:
+        instrumentation.enable()
+    start = time.perf_counter()
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        done, failed = run_batch(paths, out, analyses=args.analyses, strict=not args.weak,
+                                 players=args.players, workers=args.workers, chunksize=args.chunksize,
+                                 max_equilibria=args.max_equilibria, cache_dir=args.cache_dir,
+                                 profile=bool(args.profile))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Обработано файлов: {done}, с ошибками: {failed}, время: {time.perf_counter() - start:.1f} с",
+          file=sys.stderr)
+    if args.profile:
+        instrumentation.PROFILER.record("batch.total", time.perf_counter() - start)
+        instrumentation.export_json(args.profile)
+    return 0 if failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+import numpy as np
+
+import game_engine
+import dominance
+import zerosum
+import mixed_nash
+import correlated
+import never_best_response
+import generators
+
+
+# ---------------------------
+# Бенчмарки алгоритмов
+# ---------------------------
+# python benchmark.py --preset quick -o bench.json
+# python benchmark.py --preset full --baseline bench_baseline.json
+#
+# Каждый случай — анализ x размер x вид входа x режим:
+#   dense      — вещественные выигрыши без совпадений;
+#   degenerate — целые из {0, 1}: много равных выигрышей, много равновесий и слабых доминирований;
+#   single     — одна игра;  batch — пачка малых игр (generators, count=...).
+# Время — минимум по повторам (повторы идут, пока не наберётся --min-time секунд),
+# пик памяти — отдельный прогон под tracemalloc (NumPy сообщает ему о своих буферах).
+# Результат — JSON; при --baseline случаи сравниваются по времени, и замедление
+# больше --threshold раз считается регрессией (код возврата 1).
+#
+# У алгоритмов с кубической или экспоненциальной сложностью свой предел размера,
+# иначе полный прогон не закончится: размеры выше предела пропускаются.
+
+SIZES = {
+    "quick": [(2, 2), (10, 10), (50, 50), (100, 30), (200, 200)],
+    "full": [(2, 2), (10, 10), (50, 50), (100, 30), (30, 100), (200, 200), (500, 500),
+             (1000, 1000), (2000, 500), (5000, 5000)],
+}
+BATCH_SIZES = {"quick": [((3, 3), 10000)], "full": [((3, 3), 100000), ((10, 10), 10000)]}
+INPUTS = ("dense", "degenerate")
+
+
+@dataclass
+class Case:
+    name: str
+    run: object                                   # run(A, B) для одной игры или run(пачка) для batch
+    max_elements: int                             # предел rows * cols
+    batch: bool = False
+    max_count: int = None                         # предел числа игр в пачке
+
+
+@dataclass
+class Measurement:
+    name: str
+    mode: str
+    input: str
+    rows: int
+    cols: int
+    count: int
+    seconds: float = None                         # минимум по повторам
+    mean: float = None
+    repeats: int = 0
+    peak_mib: float = None
+    error: str = None
+
+    @property
+    def key(self):
+        return f"{self.name}/{self.mode}/{self.input}/{self.rows}x{self.cols}x{self.count}"
+
+
+def _batch_saddle(games):
+    # Пакетная проверка седловых точек без ЛП (как в solve_zero_sum_batch)
+    matrix1 = games.matrix1
+    return (matrix1.min(axis=2).max(axis=1) == matrix1.max(axis=1).min(axis=1)).sum()
+
+
+def _batch_nash(games):
+    found = 0
+    for k in range(games.count):
+        found += sum(1 for _ in game_engine.iter_pure_nash(*games.game(k)))
+    return found
+
+
+CASES = [
+    Case("maximin_minimax", lambda a, b: game_engine.maximin_minimax(a), 5000 * 5000),
+    Case("dominance_strict", lambda a, b: game_engine.remove_dominated((a, b), game_engine.ROW, True), 500 * 500),
+    Case("dominance_weak", lambda a, b: game_engine.remove_dominated((a, b), game_engine.ROW, False), 500 * 500),
+    Case("iterated_strict", lambda a, b: dominance.iterated_elimination(a, b, strict=True), 1000 * 1000),
+    Case("iterated_weak", lambda a, b: dominance.iterated_elimination(a, b, strict=False), 1000 * 1000),
+    Case("pure_nash", lambda a, b: game_engine.pure_nash_equilibria(a, b), 5000 * 5000),
+    Case("zero_sum_lp", lambda a, b: zerosum.solve_zero_sum(a), 500 * 500),
+    Case("never_best_response", lambda a, b: never_best_response.remove_never_best_responses(a, b), 200 * 200),
+    Case("lemke_howson", lambda a, b: mixed_nash.lemke_howson(a, b), 100 * 100),
+    Case("support_enumeration", lambda a, b: mixed_nash.support_enumeration(a, b, workers=1), 8 * 8),
+    Case("correlated_welfare", lambda a, b: correlated.correlated_equilibrium(a, b), 300 * 300),
+    Case("batch_saddle", _batch_saddle, 10 * 10, batch=True),
+    Case("batch_zero_sum", lambda games: zerosum.solve_zero_sum_batch(games.matrix1), 3 * 3, batch=True,
+         max_count=1000),
+    Case("batch_pure_nash", _batch_nash, 10 * 10, batch=True),
+]
+
+
+def make_input(kind, rows, cols, count=None, seed=0):
+    rng = generators.make_rng(seed)
+    if kind == "dense":
+        return generators.random_bimatrix(rows, cols, count, rng, distribution="uniform")
+    if kind == "degenerate":
+        return generators.random_bimatrix(rows, cols, count, rng, distribution="integers", low=0, high=1)
+    raise ValueError(f"Неизвестный вид входа: {kind!r}")
+
+
+def measure(fn, min_time=0.2, max_repeats=50):
+    # Возвращает (минимум, среднее, число повторов, пик памяти в МиБ)
+    # Прогон под tracemalloc идёт первым и заодно прогревает ленивые импорты (scipy) и кэши
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times = []
+    while len(times) < max_repeats and (not times or sum(times) < min_time):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times), len(times), peak / 2 ** 20
+
+
+def run_cases(preset="quick", names=None, inputs=INPUTS, max_size=None, min_time=0.2, log=None):
+    results = []
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        plan = ([(shape, min(count, case.max_count or count)) for shape, count in BATCH_SIZES[preset]] if case.batch
+                else [(shape, 1) for shape in SIZES[preset]])
+        for (rows, cols), count in plan:
+            if rows * cols > case.max_elements or (max_size and max(rows, cols) > max_size):
+                continue
+            for kind in inputs:
+                m = Measurement(name=case.name, mode="batch" if case.batch else "single", input=kind,
+                                rows=rows, cols=cols, count=count)
+                games = make_input(kind, rows, cols, count if case.batch else None)
+                fn = (lambda: case.run(games)) if case.batch else (lambda: case.run(*games.matrices))
+                try:
+                    m.seconds, m.mean, m.repeats, m.peak_mib = measure(fn, min_time)
+                except Exception as e:
+                    m.error = f"{type(e).__name__}: {e}"
+                results.append(m)
+                if log is not None:
+                    status = m.error or f"{m.seconds * 1000:.3f} мс, пик {m.peak_mib:.1f} МиБ"
+                    log(f"{m.key}: {status}")
+    return results
+
+
+def environment():
+    return {"timestamp": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform(), "processor": platform.processor()}
+
+
+def save_report(path, results, preset):
+    report = {"environment": environment(), "preset": preset,
+              "results": {m.key: asdict(m) for m in results}}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=1)
+
+
+def compare(results, baseline_path, threshold=1.25, noise=1e-4):
+    # Возвращает список строк сравнения и список ключей с регрессией.
+    # Случаи быстрее noise секунд не считаются регрессией: их время — шум таймера.
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    lines = []
+    regressions = []
+    for m in results:
+        old = baseline.get(m.key)
+        if old is None or old.get("seconds") is None or m.seconds is None:
+            lines.append(f"{m.key}: нет данных для сравнения")
+            continue
+        ratio = m.seconds / old["seconds"]
+        mark = ""
+        if ratio > threshold and m.seconds > noise:
+            mark = "  <-- РЕГРЕССИЯ"
+            regressions.append(m.key)
+        lines.append(f"{m.key}: {old['seconds'] * 1000:.3f} -> {m.seconds * 1000:.3f} мс (x{ratio:.2f}){mark}")
+    return lines, regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритмов анализа игр")
+    parser.add_argument("--preset", choices=sorted(SIZES), default="quick", help="набор размеров")
+    parser.add_argument("--cases", default=None,
+                        help=f"случаи через запятую (по умолчанию все): {', '.join(c.name for c in CASES)}")
+    parser.add_argument("--inputs", default=",".join(INPUTS), help="виды входа через запятую")
+    parser.add_argument("--max-size", type=int, default=None, help="пропустить игры с большей стороной")
+    parser.add_argument("--min-time", type=float, default=0.2, help="минимальное суммарное время повторов, с")
+    parser.add_argument("-o", "--output", default=None, help="записать результаты в JSON")
+    parser.add_argument("--baseline", default=None, help="сравнить с сохранённым JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="допустимое замедление относительно базы")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = set(args.cases.split(",")) if args.cases else None
+    inputs = tuple(args.inputs.split(","))
+    results = run_cases(args.preset, names, inputs, args.max_size, args.min_time,
+                        log=lambda line: print(line, flush=True))
+    if args.output:
+        save_report(args.output, results, args.preset)
+    if args.baseline:
+        lines, regressions = compare(results, args.baseline, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"Регрессий: {len(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+import numpy as np
+from dataclasses import dataclass
+
+from game_engine import as_bimatrix
+from zerosum import require_linprog
+from instrumentation import timed
+
+
+# ---------------------------
+# Коррелированные равновесия биматричных игр
+# ---------------------------
+# Распределение p на профилях (i, j) — коррелированное равновесие, если ни одному
+# игроку не выгодно отклоняться от рекомендованной стратегии:
+#   sum_j p[i, j] (A[k, j] - A[i, j]) <= 0   для всех строк i != k,
+#   sum_i p[i, j] (B[i, l] - B[i, j]) <= 0   для всех столбцов j != l.
+# Множество таких p — многогранник, поэтому равновесие с наибольшим значением
+# линейной цели находится одной задачей ЛП за полиномиальное время.
+#
+# Ограничение (i, k) затрагивает только n переменных строки i распределения,
+# ограничение (j, l) — только m переменных столбца j, поэтому матрица ограничений
+# строится сразу разреженной (CSR) блоками пар, без плотной матрицы m(m-1) + n(n-1) на mn.
+# Не попадают в неё нулевые коэффициенты и ограничения, выполненные при любом p >= 0
+# (отклонение k нигде не лучше рекомендации i).
+# Переменные нумеруются по строкам: p[i, j] — переменная i * n + j.
+#
+# Ненулевых коэффициентов всё равно ~ m^2 n + n^2 m (для 300 x 300 — 54 млн), поэтому
+# ограничения добавляются по мере нарушения: ЛП решается с текущим набором, по найденному p
+# матричными произведениями считаются выигрыши всех отклонений, и все нарушенные
+# добавляются в задачу. Когда нарушений не остаётся, решение оптимально и для полной задачи.
+# С пакетом highspy модель HiGHS сохраняется между раундами и симплекс продолжает
+# с прежнего базиса; без него задача каждый раунд собирается заново для linprog.
+# У игр с независимыми выигрышами активных ограничений единицы и раундов немного;
+# у почти антагонистических (B ~ -A) активна заметная доля всех ограничений, поэтому, если
+# полный набор не больше full_nonzeros, он добавляется целиком, как только отсечения
+# набирают его долю. Такая задача решается внутренней точкой: 60 x 60 — секунды,
+# 100 x 100 — порядка минуты-двух, дальше время растёт примерно как куб числа ограничений.
+#
+# Цели: welfare — сумма выигрышей, row / column — выигрыш игрока,
+# egalitarian — выигрыш худшего из игроков, или матрица весов (m, n);
+# maximize=False ищет худшее по цели равновесие (кроме egalitarian).
+
+OBJECTIVES = ("welfare", "row", "column", "egalitarian")
+TOLERANCE = 1e-9
+
+# Допустимый выигрыш от отклонения (относительно наибольшего модуля выигрыша):
+# ЛП выполняет ограничения с точностью решателя
+VIOLATION_TOLERANCE = 1e-7
+
+# Коэффициентов в одном блоке при построении ограничений
+CONSTRAINT_BLOCK_ELEMENTS = 2 ** 22
+
+# Не больше стольких ненулевых коэффициентов — полный набор ограничений можно построить
+FULL_NONZEROS = 2 ** 23
+
+# Когда отсечения набирают 1 / FULL_FRACTION полного числа коэффициентов, добавляются все
+# ограничения сразу: у почти антагонистических игр активна большая часть ограничений,
+# и раунды отсечений лишь повторяют полную задачу по частям
+FULL_FRACTION = 8
+
+# Начиная с этого числа ненулевых коэффициентов ограничений внутренняя точка (highs-ipm)
+# быстрее симплекса: у почти антагонистических игр 60 x 60 — 8 с против 34 с
+IPM_NONZEROS = 2 ** 16
+
+# Методы linprog и соответствующие им решатели HiGHS
+METHODS = {"highs": "choose", "highs-ds": "simplex", "highs-ipm": "ipm"}
+
+
+@dataclass
+class CorrelatedEquilibrium:
+    distribution: np.ndarray                      # (m, n) вероятности профилей
+    row_payoff: float
+    col_payoff: float
+    objective: float                              # значение цели
+    constraints: int                              # ограничений стимулов в последней задаче ЛП
+    nonzeros: int                                 # ненулевых коэффициентов в них
+    rounds: int = 1                               # решённых задач ЛП
+
+    @property
+    def welfare(self):
+        return self.row_payoff + self.col_payoff
+
+    @property
+    def support(self):
+        # Профили (строка, столбец) с положительной вероятностью
+        return [(int(i), int(j)) for i, j in np.argwhere(self.distribution > TOLERANCE)]
+
+
+def require_sparse():
+    try:
+        from scipy import sparse
+    except ImportError as e:
+        raise ImportError("Для поиска коррелированных равновесий требуется пакет scipy") from e
+    return sparse
+
+
+# ---------------------------
+# Ограничения стимулов
+# ---------------------------
+# Метки ограничений — массив (K, 3): [игрок (0 — строки, 1 — столбцы), рекомендация, отклонение].
+# Ограничения игрока по столбцам строятся так же, как для строк матрицы B^T.
+def binding_pairs(payoff, block_elements=CONSTRAINT_BLOCK_ELEMENTS):
+    # Пары (i, k), где отклонение k хоть в одном столбце выгоднее рекомендации i
+    rows, cols = payoff.shape
+    block = max(1, block_elements // max(1, rows * cols))
+    found = []
+    for start in range(0, rows, block):
+        gains = payoff[None, :, :] - payoff[start:start + block, None, :]
+        recommended, deviation = np.nonzero((gains > 0).any(axis=2))
+        found.append(np.column_stack([recommended + start, deviation]))
+    return np.concatenate(found)
+
+
+def constraint_matrix(matrix1, matrix2, labels, block_elements=CONSTRAINT_BLOCK_ELEMENTS):
+    # Разреженная матрица G (CSR) ограничений G p <= 0 с метками labels.
+    # Строки идут в порядке меток, метки должны быть упорядочены по игроку.
+    sparse = require_sparse()
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    rows, cols = matrix1.shape
+    labels = np.asarray(labels, dtype=np.int64).reshape(-1, 3)
+    if (np.diff(labels[:, 0]) < 0).any():
+        raise ValueError("Метки ограничений должны идти сначала для игрока 0, затем для игрока 1")
+    payoffs = (matrix1, np.ascontiguousarray(matrix2.T))
+    counts, indices, data = [], [], []
+    for player in (0, 1):
+        payoff = payoffs[player]
+        own = labels[labels[:, 0] == player]
+        block = max(1, block_elements // payoff.shape[1])
+        for start in range(0, own.shape[0], block):
+            recommended, deviation = own[start:start + block, 1], own[start:start + block, 2]
+            # Коэффициенты рекомендации i: выигрыш отклонения k минус выигрыш i по стратегиям соперника
+            coefficients = payoff[deviation] - payoff[recommended]
+            local, variable = np.nonzero(coefficients)
+            counts.append(np.bincount(local, minlength=recommended.size))
+            if player == 0:
+                indices.append(recommended[local] * cols + variable)
+            else:
+                indices.append(variable * cols + recommended[local])
+            data.append(coefficients[local, variable])
+    if not counts:
+        return sparse.csr_matrix((0, rows * cols))
+    indptr = np.concatenate([[0], np.cumsum(np.concatenate(counts))])
+    index_dtype = np.int32 if rows * cols < 2 ** 31 and indptr[-1] < 2 ** 31 else np.int64
+    return sparse.csr_matrix((np.concatenate(data), np.concatenate(indices).astype(index_dtype),
+                              indptr.astype(index_dtype)), shape=(labels.shape[0], rows * cols))
+
+
+def incentive_constraints(matrix1, matrix2, block_elements=CONSTRAINT_BLOCK_ELEMENTS):
+    # Все ограничения, которые могут быть нарушены: (G, метки)
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    labels = []
+    for player, payoff in enumerate((matrix1, np.ascontiguousarray(matrix2.T))):
+        pairs = binding_pairs(payoff, block_elements)
+        labels.append(np.column_stack([np.full(len(pairs), player), pairs]))
+    labels = np.concatenate(labels).astype(np.int64)
+    return constraint_matrix(matrix1, matrix2, labels, block_elements), labels
+
+
+def deviation_gains(matrix1, matrix2, distribution):
+    # Выигрыши отклонений: row[i, k] = sum_j p[i, j] (A[k, j] - A[i, j]),
+    # col[j, l] = sum_i p[i, j] (B[i, l] - B[i, j])
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    p = np.asarray(distribution, dtype=float)
+    row_values = p @ matrix1.T
+    col_values = p.T @ matrix2
+    return row_values - np.diag(row_values)[:, None], col_values - np.diag(col_values)[:, None]
+
+
+def regret(matrix1, matrix2, distribution):
+    # Наибольший выигрыш от отклонения от рекомендации (<= 0 у коррелированного равновесия)
+    row_gains, col_gains = deviation_gains(matrix1, matrix2, distribution)
+    return float(max(row_gains.max(), col_gains.max()))
+
+
+def is_correlated_equilibrium(matrix1, matrix2, distribution, tol=1e-7):
+    p = np.asarray(distribution, dtype=float)
+    return bool((p >= -tol).all() and abs(p.sum() - 1.0) <= tol and regret(matrix1, matrix2, p) <= tol)
+
+
+# ---------------------------
+# Задача ЛП
+# ---------------------------
+def _objective_weights(matrix1, matrix2, objective):
+    if isinstance(objective, str):
+        if objective == "welfare":
+            return matrix1 + matrix2
+        if objective == "row":
+            return matrix1
+        if objective == "column":
+            return matrix2
+        raise ValueError(f"Неизвестная цель: {objective!r} (ожидалось одно из {OBJECTIVES} или матрица весов)")
+    weights = np.asarray(objective, dtype=float)
+    if weights.shape != matrix1.shape:
+        raise ValueError(f"Матрица весов цели должна иметь размер {matrix1.shape}, получено {weights.shape}")
+    return weights
+
+
+def require_highs():
+    # Необязательный пакет highspy: модель HiGHS живёт между задачами ЛП.
+    # None — пакета нет, задача собирается заново и решается linprog
+    try:
+        import highspy
+    except ImportError:
+        return None
+    return highspy
+
+
+class _LinprogProblem:
+    # Переменные p (и t для цели egalitarian, weights=None), ограничение sum(p) = 1;
+    # ограничения стимулов G p <= 0 копятся блоками и передаются linprog при каждом решении
+    def __init__(self, matrix1, matrix2, weights, sign):
+        self.linprog = require_linprog()
+        self.sparse = require_sparse()
+        self.matrix1, self.matrix2 = matrix1, matrix2
+        self.weights, self.sign = weights, sign
+        self.blocks = []
+        self.constraints = self.nonzeros = 0
+
+    def add(self, g):
+        self.blocks.append(g)
+        self.constraints += g.shape[0]
+        self.nonzeros += g.nnz
+
+    def solve(self, method):
+        sparse = self.sparse
+        size = self.matrix1.size
+        g = sparse.vstack(self.blocks, format="csr") if self.blocks else sparse.csr_matrix((0, size))
+        if self.weights is None:
+            # Дополнительная переменная t <= выигрыша каждого игрока, цель — t
+            c = np.zeros(size + 1)
+            c[-1] = self.sign
+            utilities = sparse.csr_matrix(np.hstack([-np.vstack([self.matrix1.ravel(), self.matrix2.ravel()]),
+                                                     np.ones((2, 1))]))
+            a_ub = sparse.vstack([sparse.hstack([g, sparse.csr_matrix((g.shape[0], 1))]), utilities], format="csr")
+            a_eq = sparse.csr_matrix(np.append(np.ones(size), 0.0)[None, :])
+            bounds = [(0, None)] * size + [(None, None)]
+        else:
+            c = self.sign * self.weights.ravel()
+            a_ub = g if g.shape[0] else None
+            a_eq = sparse.csr_matrix(np.ones((1, size)))
+            bounds = (0, None)
+        res = self.linprog(c, A_ub=a_ub, b_ub=None if a_ub is None else np.zeros(a_ub.shape[0]),
+                           A_eq=a_eq, b_eq=[1.0], bounds=bounds, method=method)
+        if res.status != 0:
+            raise RuntimeError(f"Не удалось решить задачу ЛП: {res.message}")
+        return res.x[:size], float(self.sign * res.fun)
+
+
+class _HighsProblem(_LinprogProblem):
+    # Та же задача в модели HiGHS: новые ограничения дописываются строками, модель не
+    # перестраивается, и двойственный симплекс стартует с базиса предыдущего решения
+    def __init__(self, highs, matrix1, matrix2, weights, sign):
+        super().__init__(matrix1, matrix2, weights, sign)
+        self.optimal = highs.HighsModelStatus.kOptimal
+        model = self.model = highs.Highs()
+        model.setOptionValue("output_flag", False)
+        inf = model.getInfinity()
+        size = matrix1.size
+        if weights is None:
+            costs = np.zeros(size + 1)
+            costs[-1] = sign
+            lower = np.append(np.zeros(size), -inf)
+        else:
+            costs = sign * weights.ravel().astype(float)
+            lower = np.zeros(size)
+        model.addCols(costs.size, costs, lower, np.full(costs.size, inf), 0,
+                      np.zeros(costs.size, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0))
+        model.addRow(1.0, 1.0, size, np.arange(size, dtype=np.int32), np.ones(size))
+        if weights is None:
+            for payoff in (matrix1, matrix2):
+                model.addRow(-inf, 0.0, size + 1, np.arange(size + 1, dtype=np.int32),
+                             np.append(-payoff.ravel().astype(float), 1.0))
+
+    def add(self, g):
+        if g.shape[0]:
+            self.model.addRows(g.shape[0], np.full(g.shape[0], -self.model.getInfinity()), np.zeros(g.shape[0]),
+                               g.nnz, g.indptr[:-1].astype(np.int32), g.indices.astype(np.int32), g.data)
+        self.constraints += g.shape[0]
+        self.nonzeros += g.nnz
+
+    def solve(self, method):
+        model = self.model
+        model.setOptionValue("solver", METHODS[method])
+        model.run()
+        status = model.getModelStatus()
+        if status != self.optimal:
+            raise RuntimeError(f"Не удалось решить задачу ЛП: {model.modelStatusToString(status)}")
+        return np.array(model.getSolution().col_value)[:self.matrix1.size], float(self.sign * model.getObjectiveValue())
+
+
+def _violated(gains, active, tol):
+    # Все нарушенные отклонения (рекомендация, отклонение), ещё не вошедшие в задачу
+    return np.argwhere((gains > tol) & ~active)
+
+
+@timed()
+def correlated_equilibrium(matrix1, matrix2, objective="welfare", maximize=True, method=None,
+                           full_nonzeros=FULL_NONZEROS, block_elements=CONSTRAINT_BLOCK_ELEMENTS, progress=None):
+    # method — метод linprog; None — highs-ipm для задач с числом ненулевых коэффициентов
+    # от IPM_NONZEROS, иначе highs-ds. progress(None, сообщение) вызывается после каждой
+    # задачи ЛП при добавлении ограничений
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    rows, cols = matrix1.shape
+    if isinstance(objective, str) and objective == "egalitarian":
+        if not maximize:
+            raise ValueError("Цель egalitarian можно только максимизировать")
+        weights = None
+    else:
+        weights = _objective_weights(matrix1, matrix2, objective)
+    if method is not None and method not in METHODS:
+        raise ValueError(f"Неизвестный метод ЛП: {method!r} (ожидалось одно из {tuple(METHODS)})")
+    sign = -1.0 if maximize else 1.0
+    highs = require_highs()
+    if highs is not None:
+        problem = _HighsProblem(highs, matrix1, matrix2, weights, sign)
+    else:
+        problem = _LinprogProblem(matrix1, matrix2, weights, sign)
+
+    def solve():
+        x, value = problem.solve(method or ("highs-ipm" if problem.nonzeros >= IPM_NONZEROS else "highs-ds"))
+        p = np.clip(x, 0.0, None)
+        return (p / p.sum()).reshape(matrix1.shape), value
+
+    # Полный набор ограничений строится, если отсечений набралось больше его доли
+    full = rows * (rows - 1) * cols + cols * (cols - 1) * rows
+    switch = full // FULL_FRACTION if full <= full_nonzeros else None
+    complete = False
+    tol = VIOLATION_TOLERANCE * max(1.0, np.abs(matrix1).max(), np.abs(matrix2).max())
+    active = (np.eye(rows, dtype=bool), np.eye(cols, dtype=bool))
+    rounds = 1
+    while True:
+        p, value = solve()
+        if complete:
+            # Остальные ограничения добавлены в предыдущем раунде — решение окончательное
+            break
+        added = [_violated(gains, active[player], tol)
+                 for player, gains in enumerate(deviation_gains(matrix1, matrix2, p))]
+        count = sum(len(pairs) for pairs in added)
+        if progress is not None:
+            progress(None, f"Задача ЛП {rounds}: ограничений {problem.constraints}, нарушено ещё {count}")
+        if not count:
+            break
+        labels = np.concatenate([np.column_stack([np.full(len(pairs), player), pairs])
+                                 for player, pairs in enumerate(added)])
+        g = constraint_matrix(matrix1, matrix2, labels, block_elements)
+        if switch is not None and problem.nonzeros + g.nnz >= switch:
+            # Отсечения почти ничего не экономят: добавляются все ещё не вошедшие ограничения
+            g, labels = incentive_constraints(matrix1, matrix2, block_elements)
+            known = np.zeros(len(labels), dtype=bool)
+            for player in (0, 1):
+                own = labels[:, 0] == player
+                known[own] = active[player][labels[own, 1], labels[own, 2]]
+            g = g[~known]
+            complete = True
+        for player, pairs in enumerate(added):
+            active[player][pairs[:, 0], pairs[:, 1]] = True
+        problem.add(g)
+        rounds += 1
+    return CorrelatedEquilibrium(distribution=p, row_payoff=float((p * matrix1).sum()),
+                                 col_payoff=float((p * matrix2).sum()), objective=value,
+                                 constraints=problem.constraints, nonzeros=problem.nonzeros, rounds=rounds)
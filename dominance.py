@@ -0,0 +1,245 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+from game_engine import ROW, COLUMN, DominanceResult, as_bimatrix, as_payoff_matrix, negated, widened_dtype
+from instrumentation import timed
+
+
+# ---------------------------
+# Итеративное удаление доминируемых стратегий (IESDS / IEWDS)
+# ---------------------------
+# Для каждого игрока хранятся счётчики попарных сравнений его стратегий
+# по ещё не удалённым стратегиям соперника:
+#   less[i, k]       — число координат, где стратегия i строго хуже k;
+#   less_equal[i, k] — число координат, где стратегия i не лучше k.
+# Строгое доминирование: less[i, k] == число координат,
+# слабое: less_equal[i, k] == число координат и less[i, k] > 0.
+# Удаление стратегии соперника только вычитает её вклад (O(n^2)),
+# поэтому полное сравнение всех пар O(n^2 * m) выполняется один раз.
+
+# Бюджет элементов на один блок при попарном сравнении
+DOMINANCE_BLOCK_ELEMENTS = 1 << 24
+
+
+@dataclass
+class EliminationStep:
+    player: str
+    removed: list                                 # метки удалённых стратегий
+    dominators: list                              # метки доминирующих стратегий (по одной на удалённую)
+
+
+@dataclass
+class IteratedDominanceResult:
+    strict: bool
+    matrices: tuple                               # матрицы после удаления
+    row_index: np.ndarray                         # исходные индексы сохранившихся строк
+    col_index: np.ndarray                         # исходные индексы сохранившихся столбцов
+    row_labels: list                              # метки сохранившихся строк
+    col_labels: list                              # метки сохранившихся столбцов
+    steps: list = field(default_factory=list)
+    rounds: int = 0                               # раундов, удаливших хотя бы одну стратегию
+
+    @property
+    def changed(self):
+        return bool(self.steps)
+
+
+def pairwise_counts(left, right):
+    # Для строк left (n1 x k) и right (n2 x k) считает число координат,
+    # где left[i] < right[k] и left[i] <= right[k]. Обработка блоками строк left.
+    n1, k = left.shape
+    n2 = right.shape[0]
+    less = np.empty((n1, n2), dtype=np.int64)
+    less_equal = np.empty((n1, n2), dtype=np.int64)
+    block = max(1, DOMINANCE_BLOCK_ELEMENTS // max(1, n2 * k))
+    for start in range(0, n1, block):
+        part = left[start:start + block, None, :]
+        less[start:start + block] = np.count_nonzero(part < right[None, :, :], axis=2)
+        less_equal[start:start + block] = np.count_nonzero(part <= right[None, :, :], axis=2)
+    return less, less_equal
+
+
+class PairwiseCounts:
+    def __init__(self, strategies):
+        # strategies — матрица выигрышей игрока, строки которой — его стратегии,
+        # а столбцы — стратегии соперника
+        self.strategies = strategies
+        self.alive = np.ones(strategies.shape[0], dtype=bool)
+        self.coords = strategies.shape[1]
+        self.less, self.less_equal = pairwise_counts(strategies, strategies)
+
+    def drop_coordinates(self, coords):
+        # Соперник удалил стратегии coords: вычитаем их вклад из счётчиков
+        if len(coords) == 0:
+            return
+        columns = self.strategies[:, coords]
+        less, less_equal = pairwise_counts(columns, columns)
+        self.less -= less
+        self.less_equal -= less_equal
+        self.coords -= len(coords)
+
+    def dominance_matrix(self, strict=True):
+        if strict:
+            dominated = self.less == self.coords
+        else:
+            dominated = (self.less_equal == self.coords) & (self.less > 0)
+        dominated &= self.alive[:, None] & self.alive[None, :]
+        np.fill_diagonal(dominated, False)
+        return dominated
+
+    def find_dominated(self, strict=True):
+        # Возвращает индексы доминируемых стратегий и по одной доминирующей для каждой.
+        # Доминирование — строгий частичный порядок, поэтому все найденные стратегии
+        # можно удалить разом: у каждой останется недоминируемый доминатор.
+        dominated = self.dominance_matrix(strict)
+        has_dominator = dominated.any(axis=1)
+        removed = np.flatnonzero(has_dominator)
+        dominators = np.argmax(dominated[removed], axis=1)
+        return removed, dominators
+
+    def remove(self, indices):
+        self.alive[indices] = False
+
+
+@timed()
+def iterated_elimination(matrix1, matrix2=None, strict=True, row_labels=None, col_labels=None,
+                         max_rounds=None, progress=None):
+    # Поочерёдно удаляет доминируемые стратегии игроков до неподвижной точки.
+    # Если matrix2 не задана, игра считается антагонистической (matrix2 = -matrix1).
+    # progress(None, сообщение) вызывается после каждого раунда с удалениями (число раундов заранее неизвестно);
+    # последний проход без удалений раундом не считается.
+    if matrix2 is None:
+        matrix2 = negated(as_payoff_matrix(matrix1, None))
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2, None)
+    rows, cols = matrix1.shape
+    row_labels = list(range(rows)) if row_labels is None else list(row_labels)
+    col_labels = list(range(cols)) if col_labels is None else list(col_labels)
+    if len(row_labels) != rows or len(col_labels) != cols:
+        raise ValueError("Число меток не совпадает с размерами матрицы")
+
+    counts = {ROW: PairwiseCounts(matrix1), COLUMN: PairwiseCounts(matrix2.T)}
+    labels = {ROW: row_labels, COLUMN: col_labels}
+    opponent = {ROW: COLUMN, COLUMN: ROW}
+    steps = []
+    rounds = 0
+    while max_rounds is None or rounds < max_rounds:
+        changed = False
+        for player in (ROW, COLUMN):
+            removed, dominators = counts[player].find_dominated(strict)
+            if removed.size == 0:
+                continue
+            counts[player].remove(removed)
+            counts[opponent[player]].drop_coordinates(removed)
+            steps.append(EliminationStep(player=player,
+                                         removed=[labels[player][i] for i in removed],
+                                         dominators=[labels[player][k] for k in dominators]))
+            changed = True
+        if not changed:
+            break
+        rounds += 1
+        if progress is not None:
+            progress(None, f"Раунд {rounds}: осталось {counts[ROW].alive.sum()}x{counts[COLUMN].alive.sum()}")
+
+    row_index = np.flatnonzero(counts[ROW].alive)
+    col_index = np.flatnonzero(counts[COLUMN].alive)
+    reduced = (matrix1[np.ix_(row_index, col_index)], matrix2[np.ix_(row_index, col_index)])
+    return IteratedDominanceResult(strict=strict, matrices=reduced,
+                                   row_index=row_index, col_index=col_index,
+                                   row_labels=[row_labels[i] for i in row_index],
+                                   col_labels=[col_labels[j] for j in col_index],
+                                   steps=steps, rounds=rounds)
+
+
+# ---------------------------
+# Граф доминирования с инкрементальным обновлением
+# ---------------------------
+# Счётчики less / less_equal строятся один раз для обоих игроков и дают сразу
+# строгие и слабые отношения. Правка ячейки (i, j) меняет одну координату
+# одной стратегии каждого игрока, поэтому пересчитываются только строка и столбец
+# счётчиков этой стратегии: O(n) вместо O(n^2 * m).
+# Семантика та же, что у game_engine.remove_dominated: строки сравниваются
+# по матрице 0, столбцы — по последней матрице (больший выигрыш лучше).
+
+class DominanceGraph:
+    @timed("compute.dominance.DominanceGraph")
+    def __init__(self, *matrices):
+        self.matrices = [as_payoff_matrix(m, None).copy() for m in matrices]
+        if any(m.shape != self.matrices[0].shape for m in self.matrices):
+            raise ValueError("Матрицы выигрышей игроков должны иметь одинаковый размер")
+        # Стратегии каждого игрока — строки своей матрицы (для столбцов — транспонированной)
+        self.strategies = {ROW: self.matrices[0].copy(), COLUMN: self.matrices[-1].T.copy()}
+        self.counts = {player: pairwise_counts(p, p) for player, p in self.strategies.items()}
+
+    @property
+    def shape(self):
+        return self.matrices[0].shape
+
+    def _update_coordinate(self, player, i, j, value):
+        # Стратегия i игрока получает новое значение в координате j
+        strategies = self.strategies[player]
+        less, less_equal = self.counts[player]
+        for sign in (-1, 1):
+            # Сначала вычитаем вклад старого значения, затем добавляем вклад нового.
+            # Диагональ меняется на одинаковую величину при вычитании и добавлении.
+            if sign == 1:
+                strategies[i, j] = value
+            column = strategies[:, j]
+            x = column[i]
+            less[i] += sign * (x < column)
+            less[:, i] += sign * (column < x)
+            less_equal[i] += sign * (x <= column)
+            less_equal[:, i] += sign * (column <= x)
+
+    def update_cell(self, i, j, values):
+        # values — новые значения ячейки (i, j) во всех матрицах.
+        # Значение, не помещающееся в тип матрицы, расширяет тип (как в GameModel)
+        for k, value in enumerate(values):
+            dtype = widened_dtype(self.matrices[k].dtype, value)
+            if dtype != self.matrices[k].dtype:
+                self.matrices[k] = self.matrices[k].astype(dtype)
+            self.matrices[k][i, j] = value
+        for player, source in ((ROW, self.matrices[0]), (COLUMN, self.matrices[-1])):
+            if self.strategies[player].dtype != source.dtype:
+                self.strategies[player] = self.strategies[player].astype(source.dtype)
+        self._update_coordinate(ROW, i, j, self.matrices[0][i, j])
+        self._update_coordinate(COLUMN, j, i, self.matrices[-1][i, j])
+
+    def dominance_matrix(self, player, strict=True):
+        # dominated[i, k] — стратегия i доминируется стратегией k
+        less, less_equal = self.counts[player]
+        coords = self.strategies[player].shape[1]
+        if strict:
+            dominated = less == coords
+        else:
+            dominated = (less_equal == coords) & (less > 0)
+        np.fill_diagonal(dominated, False)
+        return dominated
+
+    def pairs(self, player, strict=True):
+        return [(int(i), int(k)) for i, k in zip(*np.nonzero(self.dominance_matrix(player, strict)))]
+
+    def remove(self, player, indices):
+        # Удаляет стратегии игрока; счётчики соперника теряют вклад этих координат
+        if len(indices) == 0:
+            return
+        opponent = COLUMN if player == ROW else ROW
+        axis = 0 if player == ROW else 1
+        self.matrices = [np.delete(m, indices, axis=axis) for m in self.matrices]
+        less, less_equal = self.counts[player]
+        self.counts[player] = (np.delete(np.delete(less, indices, axis=0), indices, axis=1),
+                               np.delete(np.delete(less_equal, indices, axis=0), indices, axis=1))
+        self.strategies[player] = np.delete(self.strategies[player], indices, axis=0)
+        columns = self.strategies[opponent][:, indices]
+        dropped_less, dropped_less_equal = pairwise_counts(columns, columns)
+        less, less_equal = self.counts[opponent]
+        self.counts[opponent] = (less - dropped_less, less_equal - dropped_less_equal)
+        self.strategies[opponent] = np.delete(self.strategies[opponent], indices, axis=1)
+
+    def remove_dominated(self, player, strict=True):
+        # Аналог game_engine.remove_dominated: один шаг удаления для игрока.
+        # Граф переходит к уменьшенной игре и остаётся пригодным для следующих запросов.
+        pairs = self.pairs(player, strict)
+        removed = sorted({i for i, _ in pairs})
+        self.remove(player, removed)
+        return DominanceResult(player=player, strict=strict, removed=removed, pairs=pairs,
+                               matrices=tuple(m.copy() for m in self.matrices))
@@ -0,0 +1,244 @@
+import numpy as np
+from dataclasses import dataclass
+
+from game_engine import as_bimatrix
+import generators
+from instrumentation import timed
+
+
+# ---------------------------
+# Эволюционная динамика популяций
+# ---------------------------
+# Состояние — пара смешанных стратегий x (доли строк) и y (доли столбцов).
+# Тысячи начальных условий интегрируются одновременно: x — массив (K, rows),
+# y — (K, cols), векторное поле считается матричными произведениями на всю пачку.
+#
+# Динамики (fx = A y, fy = B^T x — выигрыши чистых стратегий против популяции):
+#   replicator    — x_i' = x_i (fx_i - x·fx);
+#   best_response — x' = BR(x) - x, BR — равномерная смесь всех лучших ответов;
+#   logit         — x' = softmax(fx / temperature) - x.
+# Для матричной игры (matrix2=None) B = -A.
+#
+# Методы:
+#   fixed    — классический Рунге-Кутта 4 с шагом dt;
+#   adaptive — Богацкого-Шампайна 3(2): у каждой траектории свой шаг,
+#              выбираемый по оценке локальной ошибки (atol) и не больше max_dt:
+#              без предела шаг у устойчивой точки растёт до границы устойчивости
+#              метода, и траектория колеблется с амплитудой ~atol, не сходясь.
+# После шага состояние проецируется на симплекс (отсечение и нормировка).
+#
+# Траектория останавливается, когда max |x'|, |y'| < tol (сошлась) или время
+# достигло t_max; остановленные траектории исключаются из вычислений.
+# При path снимки всех траекторий раз в record_every шагов дописываются в файл
+# последовательностью np.save, в памяти хранится только текущее состояние.
+# Снимки читаются генератором iter_snapshots(path).
+
+DYNAMICS = ("replicator", "best_response", "logit")
+METHODS = ("adaptive", "fixed")
+BEST_RESPONSE_TOLERANCE = 1e-12
+
+
+@dataclass
+class DynamicsResult:
+    dynamics: str
+    x: np.ndarray                                 # (K, rows) конечные состояния
+    y: np.ndarray                                 # (K, cols)
+    times: np.ndarray                             # (K,) время остановки каждой траектории
+    converged: np.ndarray                         # (K,) траектория сошлась к стационарной точке
+    steps: int                                    # шагов интегрирования (по самой долгой траектории)
+    evaluations: int                              # вычислений поля (траектория x вычисление)
+    path: str = None                              # файл снимков
+
+    @property
+    def count(self):
+        return self.x.shape[0]
+
+
+def initial_states(count, rows, cols, rng=None, concentration=1.0):
+    # Случайные начальные смеси: распределение Дирихле (concentration=1 — равномерно по симплексу)
+    rng = generators.make_rng(rng)
+    return (rng.dirichlet(np.full(rows, concentration), size=count),
+            rng.dirichlet(np.full(cols, concentration), size=count))
+
+
+def _check_states(x, y, rows, cols):
+    x = np.array(x, dtype=float, ndmin=2)
+    y = np.array(y, dtype=float, ndmin=2)
+    if x.shape[1] != rows or y.shape[1] != cols or x.shape[0] != y.shape[0]:
+        raise ValueError(f"Начальные состояния должны иметь формы (K, {rows}) и (K, {cols})")
+    if (x < 0).any() or (y < 0).any():
+        raise ValueError("Доли стратегий не могут быть отрицательными")
+    return _project(x), _project(y)
+
+
+def _project(z):
+    np.clip(z, 0.0, None, out=z)
+    total = z.sum(axis=1, keepdims=True)
+    # Вырожденное состояние (все доли обнулились) заменяется равномерной смесью
+    bad = total[:, 0] <= 0
+    if bad.any():
+        z[bad] = 1.0
+        total[bad] = z.shape[1]
+    z /= total
+    return z
+
+
+def _best_response(payoff):
+    best = payoff.max(axis=1, keepdims=True)
+    mask = payoff >= best - BEST_RESPONSE_TOLERANCE * np.maximum(1.0, np.abs(best))
+    return mask / mask.sum(axis=1, keepdims=True)
+
+
+def _softmax(payoff, temperature):
+    z = payoff / temperature
+    z -= z.max(axis=1, keepdims=True)
+    np.exp(z, out=z)
+    return z / z.sum(axis=1, keepdims=True)
+
+
+def vector_field(dynamics, matrix1, matrix2, x, y, temperature=0.1):
+    # Производные (x', y') для пачки состояний
+    fx = y @ matrix1.T
+    fy = x @ matrix2
+    if dynamics == "replicator":
+        return (x * (fx - np.einsum("ki,ki->k", x, fx)[:, None]),
+                y * (fy - np.einsum("kj,kj->k", y, fy)[:, None]))
+    if dynamics == "best_response":
+        return _best_response(fx) - x, _best_response(fy) - y
+    if dynamics == "logit":
+        return _softmax(fx, temperature) - x, _softmax(fy, temperature) - y
+    raise ValueError(f"Неизвестная динамика: {dynamics!r} (ожидалось одно из {DYNAMICS})")
+
+
+def _speed(dx, dy):
+    return np.maximum(np.abs(dx).max(axis=1), np.abs(dy).max(axis=1))
+
+
+class SnapshotWriter:
+    # Снимок: время (K,), x (K, rows), y (K, cols) — три np.save подряд
+    def __init__(self, path, count, rows, cols):
+        self.path = path
+        self.file = open(path, "wb")
+        np.save(self.file, np.array([count, rows, cols], dtype=np.int64))
+
+    def write(self, times, x, y):
+        np.save(self.file, times)
+        np.save(self.file, x)
+        np.save(self.file, y)
+
+    def close(self):
+        self.file.close()
+
+
+def iter_snapshots(path):
+    # Выдаёт (times, x, y) для каждого записанного снимка
+    with open(path, "rb") as file:
+        np.load(file)
+        while True:
+            try:
+                times = np.load(file)
+            except EOFError:
+                return
+            yield times, np.load(file), np.load(file)
+
+
+@timed()
+def simulate(matrix1, matrix2=None, x0=None, y0=None, count=1000, dynamics="replicator", method="adaptive",
+             dt=0.01, t_max=100.0, tol=1e-8, atol=1e-6, max_dt=1.0, temperature=0.1, record_every=None, path=None,
+             rng=None, progress=None):
+    # Интегрирует count траекторий (или заданные x0, y0) до сходимости или t_max.
+    # progress(доля, сообщение) вызывается раз в 50 шагов; доля — время самой отстающей траектории.
+    if dynamics not in DYNAMICS:
+        raise ValueError(f"Неизвестная динамика: {dynamics!r} (ожидалось одно из {DYNAMICS})")
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method!r} (ожидалось одно из {METHODS})")
+    if dt <= 0 or t_max <= 0:
+        raise ValueError("Шаг и время интегрирования должны быть положительными")
+    if dynamics == "logit" and temperature <= 0:
+        raise ValueError("Температура логит-динамики должна быть положительной")
+    if matrix2 is None:
+        matrix2 = -np.asarray(matrix1, dtype=float)
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    rows, cols = matrix1.shape
+    if x0 is None or y0 is None:
+        x0, y0 = initial_states(count, rows, cols, rng)
+    x, y = _check_states(x0, y0, rows, cols)
+    total = x.shape[0]
+
+    def field(xs, ys):
+        return vector_field(dynamics, matrix1, matrix2, xs, ys, temperature)
+
+    times = np.zeros(total)
+    steps_taken = np.full(total, dt)              # текущий шаг каждой траектории (adaptive)
+    converged = np.zeros(total, dtype=bool)
+    active = np.arange(total)
+    writer = SnapshotWriter(path, total, rows, cols) if path is not None else None
+    steps = 0
+    evaluations = 0
+    try:
+        if writer is not None:
+            writer.write(times, x, y)
+        while active.size:
+            xa, ya, ta = x[active], y[active], times[active]
+            k1x, k1y = field(xa, ya)
+            evaluations += active.size
+            done = _speed(k1x, k1y) < tol
+            converged[active[done]] = True
+            if done.any():
+                keep = ~done
+                active, xa, ya, ta, k1x, k1y = active[keep], xa[keep], ya[keep], ta[keep], k1x[keep], k1y[keep]
+                if not active.size:
+                    break
+            h = np.minimum(steps_taken[active], t_max - ta)[:, None]
+            if method == "fixed":
+                k2x, k2y = field(xa + h / 2 * k1x, ya + h / 2 * k1y)
+                k3x, k3y = field(xa + h / 2 * k2x, ya + h / 2 * k2y)
+                k4x, k4y = field(xa + h * k3x, ya + h * k3y)
+                evaluations += 3 * active.size
+                xa = xa + h / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+                ya = ya + h / 6 * (k1y + 2 * k2y + 2 * k3y + k4y)
+                accepted = np.ones(active.size, dtype=bool)
+            else:
+                k2x, k2y = field(xa + h / 2 * k1x, ya + h / 2 * k1y)
+                k3x, k3y = field(xa + 3 * h / 4 * k2x, ya + 3 * h / 4 * k2y)
+                nx = xa + h * (2 * k1x + 3 * k2x + 4 * k3x) / 9
+                ny = ya + h * (2 * k1y + 3 * k2y + 4 * k3y) / 9
+                k4x, k4y = field(nx, ny)
+                evaluations += 3 * active.size
+                # Разность решений 3-го и 2-го порядка — оценка локальной ошибки
+                ex = h * np.abs(-5 * k1x / 72 + k2x / 12 + k3x / 9 - k4x / 8).max(axis=1, keepdims=True)
+                ey = h * np.abs(-5 * k1y / 72 + k2y / 12 + k3y / 9 - k4y / 8).max(axis=1, keepdims=True)
+                error = np.maximum(ex, ey)[:, 0]
+                accepted = error <= atol
+                factor = np.clip(0.9 * (atol / np.maximum(error, 1e-300)) ** (1 / 3), 0.2, 5.0)
+                steps_taken[active] = np.clip(h[:, 0] * factor, 1e-12, max_dt)
+                xa = np.where(accepted[:, None], nx, xa)
+                ya = np.where(accepted[:, None], ny, ya)
+            x[active] = _project(xa)
+            y[active] = _project(ya)
+            times[active] = ta + np.where(accepted, h[:, 0], 0.0)
+            steps += 1
+            active = active[times[active] < t_max]
+            if writer is not None and record_every and steps % record_every == 0:
+                writer.write(times, x, y)
+            if progress is not None and steps % 50 == 0:
+                slowest = times[active].min() if active.size else t_max
+                progress(slowest / t_max, f"Шаг {steps}: активных траекторий {active.size} из {total}")
+        if writer is not None and (not record_every or steps % record_every != 0):
+            writer.write(times, x, y)
+    finally:
+        if writer is not None:
+            writer.close()
+    return DynamicsResult(dynamics=dynamics, x=x, y=y, times=times, converged=converged, steps=steps,
+                          evaluations=evaluations, path=path)
+
+
+def endpoint_summary(result, decimals=3):
+    # Стационарные точки, к которым сошлись траектории (с округлением), и размеры
+    # их областей притяжения: [(x, y, число траекторий)] по убыванию числа
+    states = np.round(np.hstack([result.x[result.converged], result.y[result.converged]]), decimals) + 0.0
+    if not len(states):
+        return []
+    unique, counts = np.unique(states, axis=0, return_counts=True)
+    rows = result.x.shape[1]
+    return [(unique[k, :rows], unique[k, rows:], int(counts[k])) for k in np.argsort(-counts, kind="stable")]
@@ -0,0 +1,269 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+from instrumentation import timed
+
+
+# ---------------------------
+# Движок анализа игр без GUI
+# ---------------------------
+# Все функции принимают и возвращают массивы NumPy и не зависят от Tk,
+# поэтому их можно вызывать из рабочих процессов и серверов без дисплея.
+# Индексы стратегий в результатах начинаются с 0.
+#
+# Выигрыши хранятся в самом узком точном типе (compact_dtype): int8 / int16 / int32,
+# затем float32 и float64. Функции сравнения (максимин, доминирование, лучшие ответы)
+# работают с массивами в их собственном типе — это в 2-8 раз меньше памяти
+# и чтения, а равенства вроде maximin == minimax на целых точные.
+# Функции с арифметикой (ЛП, Лемке-Хоусон, динамика) по-прежнему переводят выигрыши в float64.
+
+ROW = "row"
+COLUMN = "column"
+# Целые типы по возрастанию; диапазон берётся симметричным (-max..max),
+# чтобы смена знака (B = -A) не переполняла тип
+COMPACT_INT_DTYPES = (np.int8, np.int16, np.int32)
+
+
+@dataclass
+class MaximinResult:
+    maximin: float
+    maximin_row: int
+    minimax: float
+    minimax_col: int
+    saddle: bool
+    row_minima: np.ndarray
+    col_maxima: np.ndarray
+
+
+@dataclass
+class DominanceResult:
+    player: str
+    strict: bool
+    removed: list                                 # удалённые индексы стратегий (по возрастанию)
+    pairs: list                                   # пары (доминируемая, доминирующая)
+    matrices: tuple                               # матрицы после удаления
+
+    @property
+    def changed(self):
+        return bool(self.removed)
+
+
+@dataclass
+class NashResult:
+    equilibria: list = field(default_factory=list)  # пары (строка, столбец)
+
+    @property
+    def found(self):
+        return bool(self.equilibria)
+
+
+# ---------------------------
+# Типы хранения выигрышей
+# ---------------------------
+def compact_dtype(values):
+    # Самый узкий тип из COMPACT_INT_DTYPES, float32, float64, точно представляющий все значения
+    values = np.asarray(values)
+    if values.dtype.kind not in "iuf":
+        values = values.astype(float)
+    if values.size == 0:
+        return np.dtype(COMPACT_INT_DTYPES[0])
+    integral = values.dtype.kind in "iu" or (np.isfinite(values).all() and (values == np.rint(values)).all())
+    if integral:
+        low, high = values.min(), values.max()
+        for dtype in COMPACT_INT_DTYPES:
+            limit = np.iinfo(dtype).max
+            if -limit <= low and high <= limit:
+                return np.dtype(dtype)
+        if values.dtype.kind in "iu":
+            return np.dtype(np.int64) if high <= np.iinfo(np.int64).max else values.dtype
+    if values.dtype.itemsize <= 4 and values.dtype.kind == "f":
+        return values.dtype
+    if np.array_equal(values.astype(np.float32), values, equal_nan=True):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def compact(data):
+    # Массив в самом узком точном типе (без копии, если тип уже подходит)
+    array = np.asarray(data)
+    return array.astype(compact_dtype(array), copy=False)
+
+
+def widened_dtype(dtype, values):
+    # Тип, в котором точно помещаются и старые значения типа dtype, и values
+    return np.promote_types(dtype, compact_dtype(values))
+
+
+def negated(matrix):
+    # -matrix без переполнения: -min у целых типов непредставимо, тогда тип расширяется
+    if matrix.dtype.kind == "u":
+        matrix = matrix.astype(np.promote_types(matrix.dtype, np.int8))
+    elif matrix.dtype.kind == "i" and matrix.size and matrix.min() == np.iinfo(matrix.dtype).min:
+        matrix = matrix.astype({1: np.int16, 2: np.int32, 4: np.int64}.get(matrix.dtype.itemsize, float))
+    return -matrix
+
+
+# ---------------------------
+# Проверка входных данных
+# ---------------------------
+def as_payoff_matrix(data, dtype=float):
+    # dtype=None сохраняет числовой тип входа (для функций, которые только сравнивают выигрыши)
+    matrix = np.asarray(data, dtype=dtype)
+    if matrix.dtype.kind not in "iuf":
+        matrix = matrix.astype(float)
+    if matrix.ndim != 2:
+        raise ValueError("Матрица выигрышей должна быть двумерной")
+    rows, cols = matrix.shape
+    if rows < 1 or cols < 1:
+        raise ValueError("Размеры матрицы должны быть положительными!")
+    if rows == 1 and cols == 1:
+        raise ValueError("Недопустимая размерность матрицы. Допустимые размеры: 1x2, 2x1 или NxN, где N >= 2")
+    return matrix
+
+
+def as_bimatrix(data1, data2, dtype=float):
+    matrix1 = as_payoff_matrix(data1, dtype)
+    matrix2 = as_payoff_matrix(data2, dtype)
+    if matrix1.shape != matrix2.shape:
+        raise ValueError("Матрицы выигрышей игроков должны иметь одинаковый размер")
+    return matrix1, matrix2
+
+
+def _player_axis(player):
+    if player == ROW:
+        return 0
+    if player == COLUMN:
+        return 1
+    raise ValueError(f"Неизвестный игрок: {player!r} (ожидалось 'row' или 'column')")
+
+
+# ---------------------------
+# Максимин / минимакс
+# ---------------------------
+@timed()
+def maximin_minimax(matrix):
+    matrix = as_payoff_matrix(matrix, None)
+    # Для игрока по строкам
+    row_minima = np.min(matrix, axis=1)
+    maximin_row = int(np.argmax(row_minima))
+    # Для игрока по столбцам
+    col_maxima = np.max(matrix, axis=0)
+    minimax_col = int(np.argmin(col_maxima))
+    maximin = row_minima[maximin_row].item()
+    minimax = col_maxima[minimax_col].item()
+    return MaximinResult(maximin=maximin, maximin_row=maximin_row,
+                         minimax=minimax, minimax_col=minimax_col,
+                         saddle=(maximin == minimax),
+                         row_minima=row_minima, col_maxima=col_maxima)
+
+
+@timed()
+def maximin_minimax_batch(games):
+    # games — массив (k, rows, cols) игр одного размера; возвращает список MaximinResult
+    games = np.asarray(games)
+    if games.ndim != 3:
+        raise ValueError("Ожидался массив игр размерности (k, rows, cols)")
+    row_minima = games.min(axis=2)
+    col_maxima = games.max(axis=1)
+    maximin_rows = row_minima.argmax(axis=1)
+    minimax_cols = col_maxima.argmin(axis=1)
+    index = np.arange(games.shape[0])
+    maximins = row_minima[index, maximin_rows]
+    minimaxes = col_maxima[index, minimax_cols]
+    return [MaximinResult(maximin=maximins[k].item(), maximin_row=int(maximin_rows[k]),
+                          minimax=minimaxes[k].item(), minimax_col=int(minimax_cols[k]),
+                          saddle=bool(maximins[k] == minimaxes[k]),
+                          row_minima=row_minima[k], col_maxima=col_maxima[k])
+            for k in range(games.shape[0])]
+
+
+# ---------------------------
+# Доминирование стратегий
+# ---------------------------
+def dominance_pairs(payoff, player, strict=True):
+    # Стратегии игрока лежат вдоль строк (row) или столбцов (column) матрицы payoff.
+    # Возвращает пары (i, k): стратегия i доминируется стратегией k.
+    payoff = as_payoff_matrix(payoff, None)
+    strategies = payoff if _player_axis(player) == 0 else payoff.T
+    less = strategies[:, None, :] < strategies[None, :, :]
+    if strict:
+        dominated = np.all(less, axis=2)
+    else:
+        less_equal = strategies[:, None, :] <= strategies[None, :, :]
+        dominated = np.all(less_equal, axis=2) & np.any(less, axis=2)
+    np.fill_diagonal(dominated, False)
+    return [(int(i), int(k)) for i, k in zip(*np.nonzero(dominated))]
+
+
+@timed()
+def remove_dominated(matrices, player, strict=True, payoff_index=None):
+    # matrices — кортеж матриц одинакового размера (одна для матричной игры,
+    # две для биматричной). Доминирование проверяется по матрице payoff_index
+    # (по умолчанию: строки — матрица 0, столбцы — последняя матрица),
+    # удаление применяется ко всем матрицам.
+    matrices = tuple(as_payoff_matrix(m, None) for m in matrices)
+    axis = _player_axis(player)
+    if payoff_index is None:
+        payoff_index = 0 if axis == 0 else len(matrices) - 1
+    pairs = dominance_pairs(matrices[payoff_index], player, strict)
+    removed = sorted({i for i, _ in pairs})
+    if removed:
+        matrices = tuple(np.delete(m, removed, axis=axis) for m in matrices)
+    return DominanceResult(player=player, strict=strict, removed=removed,
+                           pairs=pairs, matrices=matrices)
+
+
+# ---------------------------
+# Равновесия Нэша в чистых стратегиях
+# ---------------------------
+# Бюджет на один блок строк (в элементах матрицы): маски лучших ответов
+# строятся поблочно, поэтому игры 10000x10000 укладываются в ограниченную память.
+NASH_BLOCK_ELEMENTS = 1 << 22
+
+
+def _block_rows(cols, block_elements=NASH_BLOCK_ELEMENTS):
+    return max(1, block_elements // max(1, cols))
+
+
+def iter_pure_nash(matrix1, matrix2, chunk_rows=None, progress=None):
+    # Генератор равновесий: пары (строка, столбец) выдаются по мере обработки
+    # блоков строк, без построения полного списка.
+    # progress(доля, сообщение) вызывается после каждого блока.
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2, None)
+    rows, cols = matrix1.shape
+    if chunk_rows is None:
+        chunk_rows = _block_rows(cols)
+    # Лучший ответ игрока 1 — максимум по столбцу matrix1
+    col_maxima = np.max(matrix1, axis=0)
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        block1 = matrix1[start:stop]
+        block2 = matrix2[start:stop]
+        # Лучший ответ игрока 2 — максимум по строке matrix2
+        mask = block1 >= col_maxima
+        mask &= block2 >= np.max(block2, axis=1, keepdims=True)
+        for i, j in zip(*np.nonzero(mask)):
+            yield int(i) + start, int(j)
+        if progress is not None:
+            progress(stop / rows, f"Строк обработано: {stop} из {rows}")
+
+
+@timed()
+def pure_nash_equilibria(matrix1, matrix2, chunk_rows=None, progress=None):
+    return NashResult(equilibria=list(iter_pure_nash(matrix1, matrix2, chunk_rows, progress)))
+
+
+@timed()
+def pure_nash_batch(matrix1, matrix2):
+    # Пачка игр (k, rows, cols) одним сравнением масок; возвращает список NashResult
+    matrix1 = np.asarray(matrix1)
+    matrix2 = np.asarray(matrix2)
+    if matrix1.ndim != 3 or matrix1.shape != matrix2.shape:
+        raise ValueError("Ожидались два массива игр одинаковой размерности (k, rows, cols)")
+    mask = matrix1 >= matrix1.max(axis=1, keepdims=True)
+    mask &= matrix2 >= matrix2.max(axis=2, keepdims=True)
+    games, rows, cols = np.nonzero(mask)
+    # np.nonzero выдаёт индексы по возрастанию игры — режем по границам игр
+    bounds = np.searchsorted(games, np.arange(matrix1.shape[0] + 1))
+    pairs = list(zip(rows.tolist(), cols.tolist()))
+    return [NashResult(equilibria=pairs[bounds[k]:bounds[k + 1]]) for k in range(matrix1.shape[0])]
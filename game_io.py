@@ -0,0 +1,183 @@
+import io
+import os
+
+import numpy as np
+
+from game_engine import compact
+from instrumentation import timed
+
+
+# ---------------------------
+# Загрузка и сохранение игр
+# ---------------------------
+# Поддерживаемые форматы:
+#   .txt / .csv — первая строка "rows cols", далее rows строк матрицы A
+#                 (для биматричной игры — ещё rows строк матрицы B).
+#                 Разделитель — пробелы/табуляция, запятая или точка с запятой,
+#                 в каждой строке любой из них (как в _split_line).
+#   .npy        — матрица (rows, cols) или биматрица одним массивом (2, rows, cols);
+#                 открывается через np.load(mmap_mode='r') без копирования в память.
+#   .npz        — массивы "A" (и "B" для биматричной игры).
+# Игры N лиц (nplayer) хранятся только в двоичном виде: .npy с массивом
+# (N, s_1, ..., s_N) или .npz с массивом "payoffs" (load_nplayer / save_nplayer).
+# Текст разбирается целиком одним вызовом np.loadtxt (парсер на C); построчный
+# разбор на Python выполняется только для диагностики, если файл повреждён.
+# Текст и .npz приводятся к самому узкому точному типу (game_engine.compact),
+# .npy отображается в память в типе файла.
+
+TEXT_EXTENSIONS = (".txt", ".csv")
+BINARY_EXTENSIONS = (".npy", ".npz")
+FILE_TYPES = [("Игры", "*.txt *.csv *.npy *.npz"), ("Text files", "*.txt"), ("CSV", "*.csv"),
+              ("NumPy", "*.npy *.npz"), ("All files", "*.*")]
+
+
+class GameFileError(ValueError):
+    pass
+
+
+# Запятая и точка с запятой считаются пробелом — и в заголовке, и в данных
+_SEPARATORS = str.maketrans(",;", "  ")
+
+
+def _split_line(line):
+    return line.translate(_SEPARATORS).split()
+
+
+def _load_values(text):
+    # Тот же разбор, что и у построчной диагностики: разделители приводятся к пробелу
+    return np.loadtxt(io.StringIO(text.translate(_SEPARATORS)), ndmin=2)
+
+
+def _check_dims(rows, cols):
+    if rows < 1 or cols < 1:
+        raise GameFileError("Размеры матрицы должны быть положительными!")
+    if rows == 1 and cols == 1:
+        raise GameFileError("Матрица из файла не может быть размером 1x1!\nДопустимые размеры: 1x2, 2x1 или NxN.")
+
+
+def _diagnose(lines, rows, cols, players, error=None):
+    # Медленный построчный разбор тем же парсером: только чтобы указать номер ошибочной строки
+    if len(lines) < 1 + players * rows:
+        if players == 1:
+            raise GameFileError("Недостаточно строк с данными в файле!")
+        raise GameFileError("В файле недостаточно строк для биматричной игры!")
+    for idx in range(1, 1 + players * rows):
+        try:
+            count = _load_values(lines[idx]).size
+        except ValueError:
+            raise GameFileError(f"Некорректный ввод данных в строке {idx + 1} (ожидались числа)!")
+        if count != cols:
+            raise GameFileError(f"В строке {idx + 1} должно быть {cols} чисел, найдено {count}!")
+    raise GameFileError(f"Не удалось разобрать данные матрицы: {error}")
+
+
+def parse_text(text, players=None):
+    # Возвращает кортеж матриц. players=None — определить по числу строк.
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise GameFileError("Файл пуст!\n")
+    try:
+        dims = [int(v) for v in _split_line(lines[0])]
+    except ValueError:
+        raise GameFileError("Некорректный формат размеров матрицы в файле!")
+    if len(dims) != 2:
+        raise GameFileError("Первая строка должна содержать ровно два числа (количество строк и столбцов)!")
+    rows, cols = dims
+    _check_dims(rows, cols)
+    if players is None:
+        players = 2 if len(lines) == 1 + 2 * rows else 1
+    # Строки после нужного числа матриц игнорируются (как и раньше: из файла
+    # биматричной игры на вкладку матричных игр загружается матрица A)
+    lines = lines[:1 + players * rows]
+
+    try:
+        values = _load_values("\n".join(lines[1:]))
+        error = None
+    except ValueError as e:
+        values, error = None, e
+    if values is None or values.shape != (players * rows, cols):
+        _diagnose(lines, rows, cols, players, error)
+    return tuple(compact(m) for m in values.reshape(players, rows, cols))
+
+
+def _from_array(array, players):
+    if array.ndim == 2:
+        found = (array,)
+    elif array.ndim == 3 and array.shape[0] == 2:
+        found = (array[0], array[1])
+    else:
+        raise GameFileError(f"Неподдерживаемая форма массива {array.shape}: "
+                            f"ожидалось (rows, cols) или (2, rows, cols)")
+    if players is not None and len(found) != players:
+        raise GameFileError(f"В файле {len(found)} матриц(ы), ожидалось {players}")
+    _check_dims(*found[0].shape)
+    return found
+
+
+@timed("parse.game_io.load_game")
+def load_game(path, players=None, mmap=True):
+    # Возвращает кортеж матриц (A,) или (A, B). Для .npy при mmap=True
+    # это отображения файла в память только для чтения.
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return _from_array(np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False), players)
+    if ext == ".npz":
+        with np.load(path, allow_pickle=False) as archive:
+            if "A" not in archive:
+                raise GameFileError("В архиве .npz нет массива 'A'")
+            found = tuple(compact(archive[name]) for name in ("A", "B") if name in archive)
+        if players is not None and len(found) != players:
+            raise GameFileError(f"В файле {len(found)} матриц(ы), ожидалось {players}")
+        if any(m.ndim != 2 or m.shape != found[0].shape for m in found):
+            raise GameFileError("Матрицы в архиве должны быть двумерными и одного размера")
+        _check_dims(*found[0].shape)
+        return found
+    with open(path, "r") as file:
+        return parse_text(file.read(), players)
+
+
+@timed("output.game_io.save_game")
+def save_game(path, *matrices):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        np.save(path, matrices[0] if len(matrices) == 1 else np.stack(matrices))
+    elif ext == ".npz":
+        np.savez(path, **dict(zip(("A", "B"), matrices)))
+    else:
+        sep = "," if ext == ".csv" else " "
+        rows, cols = matrices[0].shape
+        with open(path, "w") as file:
+            file.write(f"{rows}{sep}{cols}\n")
+            for matrix in matrices:
+                np.savetxt(file, matrix, fmt="%.17g", delimiter=sep)
+
+
+@timed("parse.game_io.load_nplayer")
+def load_nplayer(path, mmap=True):
+    # Возвращает массив выигрышей (N, s_1, ..., s_N); для .npy при mmap=True — отображение файла
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        payoffs = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    elif ext == ".npz":
+        with np.load(path, allow_pickle=False) as archive:
+            if "payoffs" not in archive:
+                raise GameFileError("В архиве .npz нет массива 'payoffs'")
+            payoffs = compact(archive["payoffs"])
+    else:
+        raise GameFileError("Игры N лиц загружаются только из файлов .npy и .npz")
+    if payoffs.ndim < 3 or payoffs.shape[0] != payoffs.ndim - 1:
+        raise GameFileError(f"Неподдерживаемая форма массива {payoffs.shape}: ожидалось (N, s_1, ..., s_N)")
+    if min(payoffs.shape[1:]) < 1:
+        raise GameFileError("Число стратегий каждого игрока должно быть положительным!")
+    return payoffs
+
+
+@timed("output.game_io.save_nplayer")
+def save_nplayer(path, payoffs):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        np.savez(path, payoffs=payoffs)
+    elif ext == ".npy":
+        np.save(path, payoffs)
+    else:
+        raise GameFileError("Игры N лиц сохраняются только в файлы .npy и .npz")
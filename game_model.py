@@ -0,0 +1,130 @@
+import numpy as np
+
+from game_engine import compact, widened_dtype
+from history import CellDelta, RestrictDelta, ReplaceDelta
+
+
+# ---------------------------
+# Модель игры: массивы выигрышей — единственный источник истины
+# ---------------------------
+# Виджеты только отображают модель и передают в неё правки отдельных ячеек.
+# Анализы читают массивы напрямую, без разбора текста из полей ввода.
+# Изменённые с момента последней выборки ячейки копятся в dirty,
+# а version растёт при каждом изменении — по нему потребители (кэши,
+# инкрементальные анализы) понимают, что модель изменилась.
+# Если подключена история (history.ModelHistory), каждое изменение передаётся
+# ей компактной дельтой; методы restore_* применяют дельты при отмене и повторе
+# и в историю не пишут.
+# Массивы хранятся в самом узком точном типе (game_engine.compact_dtype): при замене
+# тип выбирается заново, а значение, не помещающееся в тип, расширяет его.
+# Целые значения ячеек не проходят через float, поэтому int64 больше 2^53 точны.
+
+CELL = "cell"        # изменена одна ячейка: подписчик получает (CELL, (i, j))
+RESET = "reset"      # массивы заменены целиком: подписчик получает (RESET, None)
+
+
+def cell_value(value):
+    # Целое число (в том числе строка вида "123") — точное int, остальное — float
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return float(value)
+
+
+class GameModel:
+    def __init__(self, *payoffs):
+        if not payoffs:
+            raise ValueError("Нужна хотя бы одна матрица выигрышей")
+        self.payoffs = []
+        self.dirty = set()
+        self.version = 0
+        self.listeners = []
+        self.history = None
+        self.replace(*payoffs)
+
+    @property
+    def shape(self):
+        return self.payoffs[0].shape
+
+    @property
+    def layer_count(self):
+        return len(self.payoffs)
+
+    @property
+    def matrices(self):
+        return tuple(self.payoffs)
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def notify(self, kind, cell):
+        for callback in self.listeners:
+            callback(kind, cell)
+
+    # --- Изменения ---
+    def replace(self, *payoffs, label=""):
+        if self.payoffs and len(payoffs) != len(self.payoffs):
+            raise ValueError(f"Ожидалось матриц: {len(self.payoffs)}")
+        arrays = [compact(np.array(p)) for p in payoffs]
+        if any(a.ndim != 2 or a.shape != arrays[0].shape for a in arrays):
+            raise ValueError("Матрицы выигрышей должны быть двумерными и одного размера")
+        # Старые массивы модели больше не нужны — история забирает их без копирования
+        delta = ReplaceDelta(before=self.payoffs, after=[a.copy() for a in arrays], label=label) \
+            if self.history is not None else None
+        self.restore_arrays(arrays)
+        self.record(delta)
+
+    def resize(self, rows, cols):
+        self.replace(*[np.zeros((rows, cols), dtype=np.int8) for _ in self.payoffs], label="Изменение размера")
+
+    def restrict(self, row_index, col_index, label=""):
+        # Оставляет только стратегии row_index и col_index (удаление доминируемых и т.п.)
+        row_index = np.asarray(row_index, dtype=np.intp)
+        col_index = np.asarray(col_index, dtype=np.intp)
+        delta = RestrictDelta.capture(self.payoffs, row_index, col_index, label) \
+            if self.history is not None else None
+        self.restore_arrays([p[np.ix_(row_index, col_index)] for p in self.payoffs])
+        self.record(delta)
+
+    def get_cell(self, i, j):
+        return tuple(p[i, j].item() for p in self.payoffs)
+
+    def set_cell(self, i, j, values):
+        values = tuple(cell_value(v) for v in values)
+        if values == self.get_cell(i, j):
+            return
+        delta = CellDelta(i, j, self.get_cell(i, j), values) if self.history is not None else None
+        self.restore_cell(i, j, values)
+        self.record(delta)
+
+    def record(self, delta):
+        # Дельта записывается после применения, чтобы снимок истории видел новое состояние
+        if delta is not None:
+            self.history.record(delta)
+
+    # --- Применение изменений без записи в историю ---
+    def restore_cell(self, i, j, values):
+        for k, value in enumerate(values):
+            dtype = widened_dtype(self.payoffs[k].dtype, value)
+            if dtype != self.payoffs[k].dtype:
+                self.payoffs[k] = self.payoffs[k].astype(dtype)
+            self.payoffs[k][i, j] = value
+        self.dirty.add((i, j))
+        self.version += 1
+        self.notify(CELL, (i, j))
+
+    def restore_arrays(self, arrays):
+        self.payoffs = list(arrays)
+        self.dirty.clear()
+        self.version += 1
+        self.notify(RESET, None)
+
+    def take_dirty(self):
+        # Возвращает изменённые ячейки и сбрасывает отметки
+        cells = self.dirty
+        self.dirty = set()
+        return cells
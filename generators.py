@@ -0,0 +1,204 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+# ---------------------------
+# Генерация случайных игр
+# ---------------------------
+# Все генераторы векторизованы: count=None даёт одну игру (rows, cols),
+# count=N — пачку массивом (N, rows, cols), без циклов по играм и ячейкам.
+# Случайность берётся только из переданного np.random.Generator (или seed),
+# поэтому результаты воспроизводимы. Для независимых потоков в разных
+# процессах — spawn_rngs(seed, n).
+#
+# Семейства игр:
+#   random_bimatrix  — независимые матрицы игроков;
+#   zero_sum         — B = -A;
+#   constant_sum     — B = total - A;
+#   coordination     — B = A (общие интересы);
+#   covariant        — нормальные выигрыши с корреляцией rho между A и B
+#                      (rho = -1 — антагонистическая, rho = 1 — координационная);
+#   planted_saddle   — антагонистическая игра с седловой точкой в заданной/случайной ячейке;
+#   planted_equilibria — биматрица с k заложенными равновесиями Нэша в чистых стратегиях.
+# Игры N лиц (nplayer) — random_nplayer: массив (N, s_1, ..., s_N) или (count, N, s_1, ..., s_N).
+
+DISTRIBUTIONS = ("integers", "uniform", "normal")
+FAMILIES = ("random", "zero_sum", "constant_sum", "coordination", "covariant",
+            "planted_saddle", "planted_equilibria")
+
+
+@dataclass
+class GameBatch:
+    matrix1: np.ndarray                           # (rows, cols) или (count, rows, cols)
+    matrix2: np.ndarray
+    planted: np.ndarray = None                    # заложенные ячейки: (..., k, 2) — пары (строка, столбец)
+
+    @property
+    def matrices(self):
+        return self.matrix1, self.matrix2
+
+    @property
+    def count(self):
+        return None if self.matrix1.ndim == 2 else self.matrix1.shape[0]
+
+    def game(self, index):
+        # Одна игра из пачки в виде (A, B)
+        return self.matrix1[index], self.matrix2[index]
+
+
+def make_rng(seed=None):
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_rngs(seed, n):
+    # Независимые воспроизводимые потоки (например, по одному на рабочий процесс)
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+def _shape(rows, cols, count):
+    if rows < 1 or cols < 1:
+        raise ValueError("Размеры матрицы должны быть положительными!")
+    return (rows, cols) if count is None else (count, rows, cols)
+
+
+def sample_payoffs(rng, shape, distribution="integers", low=-10, high=10, dtype=float):
+    # integers — целые из [low, high]; uniform — из [low, high); normal — N((low+high)/2, ((high-low)/4)^2)
+    rng = make_rng(rng)
+    if distribution == "integers":
+        values = rng.integers(low, high, size=shape, endpoint=True)
+    elif distribution == "uniform":
+        values = rng.uniform(low, high, size=shape)
+    elif distribution == "normal":
+        values = rng.normal((low + high) / 2, (high - low) / 4, size=shape)
+    else:
+        raise ValueError(f"Неизвестное распределение: {distribution!r} (ожидалось одно из {DISTRIBUTIONS})")
+    return values.astype(dtype, copy=False)
+
+
+def random_game(rows, cols, count=None, rng=None, distribution="integers", low=-10, high=10, dtype=float):
+    # Одна матрица выигрышей (матричная игра)
+    return sample_payoffs(rng, _shape(rows, cols, count), distribution, low, high, dtype)
+
+
+def random_bimatrix(rows, cols, count=None, rng=None, distribution="integers", low=-10, high=10, dtype=float):
+    rng = make_rng(rng)
+    shape = _shape(rows, cols, count)
+    return GameBatch(sample_payoffs(rng, shape, distribution, low, high, dtype),
+                     sample_payoffs(rng, shape, distribution, low, high, dtype))
+
+
+def random_nplayer(strategies, count=None, rng=None, distribution="integers", low=-10, high=10, dtype=float):
+    # strategies — числа стратегий игроков (s_1, ..., s_N)
+    strategies = tuple(int(s) for s in strategies)
+    if len(strategies) < 2 or min(strategies) < 1:
+        raise ValueError("Нужно не меньше двух игроков с положительным числом стратегий")
+    shape = (len(strategies),) + strategies
+    return sample_payoffs(rng, shape if count is None else (count,) + shape, distribution, low, high, dtype)
+
+
+def zero_sum(rows, cols, count=None, rng=None, distribution="integers", low=-10, high=10, dtype=float):
+    matrix1 = random_game(rows, cols, count, rng, distribution, low, high, dtype)
+    return GameBatch(matrix1, -matrix1)
+
+
+def constant_sum(rows, cols, count=None, rng=None, total=0, distribution="integers", low=-10, high=10,
+                 dtype=float):
+    matrix1 = random_game(rows, cols, count, rng, distribution, low, high, dtype)
+    return GameBatch(matrix1, (total - matrix1).astype(dtype, copy=False))
+
+
+def coordination(rows, cols, count=None, rng=None, distribution="integers", low=-10, high=10, dtype=float):
+    matrix1 = random_game(rows, cols, count, rng, distribution, low, high, dtype)
+    return GameBatch(matrix1, matrix1.copy())
+
+
+def covariant(rows, cols, count=None, rng=None, rho=0.0, low=-10, high=10, dtype=float):
+    # Пары (A[i, j], B[i, j]) — двумерное нормальное распределение с корреляцией rho,
+    # затем линейно переводятся в шкалу [low, high] (для целых dtype — с округлением)
+    if not -1.0 <= rho <= 1.0:
+        raise ValueError("Коэффициент корреляции rho должен лежать в [-1, 1]")
+    rng = make_rng(rng)
+    shape = _shape(rows, cols, count)
+    z1 = rng.standard_normal(shape)
+    z2 = rho * z1 + np.sqrt(1.0 - rho * rho) * rng.standard_normal(shape)
+    center, spread = (low + high) / 2, (high - low) / 4
+
+    def scale(z):
+        values = center + spread * z
+        if np.issubdtype(np.dtype(dtype), np.integer):
+            values = np.rint(np.clip(values, low, high))
+        return values.astype(dtype, copy=False)
+
+    return GameBatch(scale(z1), scale(z2))
+
+
+def _random_cells(rng, batch, rows, cols, k):
+    # k ячеек с попарно различными строками и столбцами для каждой игры: (batch, k, 2)
+    if k > min(rows, cols):
+        raise ValueError(f"Нельзя заложить {k} равновесий в игру {rows}x{cols}: нужно k <= min(rows, cols)")
+    row_keys = rng.random((batch, rows)).argsort(axis=1)[:, :k]
+    col_keys = rng.random((batch, cols)).argsort(axis=1)[:, :k]
+    return np.stack([row_keys, col_keys], axis=-1)
+
+
+def planted_saddle(rows, cols, count=None, rng=None, cell=None, distribution="integers", low=-10, high=10,
+                   dtype=float):
+    # Антагонистическая игра, где A[i, j] — минимум строки i и максимум столбца j.
+    # cell=(i, j) задаёт ячейку для всех игр, иначе она выбирается случайно для каждой игры.
+    rng = make_rng(rng)
+    matrix1 = random_game(rows, cols, count, rng, distribution, low, high, dtype)
+    games = matrix1.reshape((-1, rows, cols))
+    batch = games.shape[0]
+    if cell is None:
+        cells = np.stack([rng.integers(0, rows, batch), rng.integers(0, cols, batch)], axis=-1)
+    else:
+        cells = np.tile(np.asarray(cell, dtype=np.intp), (batch, 1))
+    index = np.arange(batch)
+    i, j = cells[:, 0], cells[:, 1]
+    value = games[index, i, j]
+    # Строка i не ниже значения, столбец j не выше — значение становится седловым
+    games[index, i, :] = np.maximum(games[index, i, :], value[:, None])
+    games[index, :, j] = np.minimum(games[index, :, j], value[:, None])
+    planted = cells[:, None, :]
+    if count is None:
+        planted = planted[0]
+    return GameBatch(matrix1, -matrix1, planted)
+
+
+def planted_equilibria(rows, cols, k=1, count=None, rng=None, distribution="integers", low=-10, high=10,
+                       margin=1, dtype=float):
+    # Биматрица с k равновесиями Нэша в чистых стратегиях в ячейках с разными строками
+    # и столбцами: в каждой такой ячейке A больше остального столбца, B — остальной строки
+    # на margin. Другие равновесия могут появиться случайно.
+    rng = make_rng(rng)
+    games = random_bimatrix(rows, cols, count, rng, distribution, low, high, dtype)
+    matrix1 = games.matrix1.reshape((-1, rows, cols))
+    matrix2 = games.matrix2.reshape((-1, rows, cols))
+    batch = matrix1.shape[0]
+    cells = _random_cells(rng, batch, rows, cols, k)
+    index = np.arange(batch)[:, None]
+    i, j = cells[..., 0], cells[..., 1]
+    # Ячейки не делят строк и столбцов, поэтому присваивания не мешают друг другу
+    matrix1[index, i, j] = matrix1.max(axis=1)[index, j] + margin
+    matrix2[index, i, j] = matrix2.max(axis=2)[index, i] + margin
+    games.planted = cells if count is not None else cells[0]
+    return games
+
+
+def generate(family, rows, cols, count=None, rng=None, **options):
+    # Единая точка входа по имени семейства (для CLI и бенчмарков)
+    makers = {"random": random_bimatrix, "zero_sum": zero_sum, "constant_sum": constant_sum,
+              "coordination": coordination, "covariant": covariant,
+              "planted_saddle": planted_saddle, "planted_equilibria": planted_equilibria}
+    if family not in makers:
+        raise ValueError(f"Неизвестное семейство игр: {family!r} (ожидалось одно из {FAMILIES})")
+    return makers[family](rows, cols, count=count, rng=rng, **options)
+
+
+def iter_batches(family, rows, cols, count, batch_size=100000, seed=None, **options):
+    # Пачки по batch_size игр, чтобы миллионы игр не держать в памяти одновременно
+    rng = make_rng(seed)
+    for start in range(0, count, batch_size):
+        yield generate(family, rows, cols, count=min(batch_size, count - start), rng=rng, **options)
@@ -0,0 +1,199 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+# ---------------------------
+# История изменений модели игры (отмена / повтор)
+# ---------------------------
+# Каждое изменение хранится как компактная дельта:
+#   CellDelta     — одна ячейка: старые и новые значения во всех матрицах;
+#   RestrictDelta — удаление стратегий: оставшиеся индексы и удалённые строки/столбцы;
+#   ReplaceDelta  — замена матриц целиком (загрузка, генерация, изменение размера):
+#                   здесь старое и новое состояние хранятся полностью — по-другому нельзя.
+# Отмена и повтор применяют одну дельту: правка ячейки — O(1), удаление стратегий —
+# одна пересборка массивов без хранения их полных копий.
+# Полный снимок (контрольная точка) запоминается, когда суммарная стоимость дельт
+# с прошлого снимка превысит checkpoint_ratio размеров матриц: тогда повтор цепочки
+# дороже копирования. Тысячи правок ячеек большой матрицы снимков не порождают.
+# Переход к далёкой версии идёт от ближайшего снимка, если так дешевле,
+# чем отменять/повторять дельты по одной.
+
+
+@dataclass
+class CellDelta:
+    i: int
+    j: int
+    old: tuple
+    new: tuple
+
+    def undo(self, model):
+        model.restore_cell(self.i, self.j, self.old)
+
+    def redo(self, model):
+        model.restore_cell(self.i, self.j, self.new)
+
+    @property
+    def cost(self):
+        return 1
+
+    def describe(self):
+        old = ";".join(f"{v:g}" for v in self.old)
+        new = ";".join(f"{v:g}" for v in self.new)
+        return f"Ячейка ({self.i + 1}, {self.j + 1}): {old} -> {new}"
+
+
+@dataclass
+class RestrictDelta:
+    shape: tuple                                  # размер до удаления
+    row_index: np.ndarray                         # оставшиеся строки
+    col_index: np.ndarray                         # оставшиеся столбцы
+    removed_rows: np.ndarray                      # индексы удалённых строк
+    removed_cols: np.ndarray                      # индексы удалённых столбцов
+    row_values: list                              # по матрице: удалённые строки целиком
+    col_values: list                              # по матрице: удалённые столбцы на оставшихся строках
+    label: str = ""
+
+    @classmethod
+    def capture(cls, payoffs, row_index, col_index, label=""):
+        rows, cols = payoffs[0].shape
+        removed_rows = np.setdiff1d(np.arange(rows), row_index)
+        removed_cols = np.setdiff1d(np.arange(cols), col_index)
+        return cls(shape=(rows, cols), row_index=np.asarray(row_index), col_index=np.asarray(col_index),
+                   removed_rows=removed_rows, removed_cols=removed_cols,
+                   row_values=[p[removed_rows] for p in payoffs],
+                   col_values=[p[np.ix_(row_index, removed_cols)] for p in payoffs],
+                   label=label)
+
+    def undo(self, model):
+        restored = []
+        for p, row_values, col_values in zip(model.payoffs, self.row_values, self.col_values):
+            # Тип модели мог расшириться после удаления, но не сузиться
+            full = np.empty(self.shape, dtype=np.result_type(p.dtype, row_values.dtype, col_values.dtype))
+            full[np.ix_(self.row_index, self.col_index)] = p
+            full[self.removed_rows] = row_values
+            full[np.ix_(self.row_index, self.removed_cols)] = col_values
+            restored.append(full)
+        model.restore_arrays(restored)
+
+    def redo(self, model):
+        model.restore_arrays([p[np.ix_(self.row_index, self.col_index)] for p in model.payoffs])
+
+    @property
+    def cost(self):
+        return self.shape[0] * self.shape[1]
+
+    def describe(self):
+        parts = []
+        if self.removed_rows.size:
+            parts.append("строки " + ", ".join(str(i + 1) for i in self.removed_rows))
+        if self.removed_cols.size:
+            parts.append("столбцы " + ", ".join(str(j + 1) for j in self.removed_cols))
+        text = "Удалены " + "; ".join(parts) if parts else "Удаление стратегий"
+        return f"{self.label}: {text}" if self.label else text
+
+
+@dataclass
+class ReplaceDelta:
+    before: list
+    after: list
+    label: str = ""
+
+    # Массивы дельты не должны меняться, поэтому в модель отдаются их копии
+    def undo(self, model):
+        model.restore_arrays([p.copy() for p in self.before])
+
+    def redo(self, model):
+        model.restore_arrays([p.copy() for p in self.after])
+
+    @property
+    def cost(self):
+        return self.after[0].size + self.before[0].size
+
+    def describe(self):
+        rows, cols = self.after[0].shape
+        return f"{self.label or 'Замена матрицы'} ({rows}x{cols})"
+
+
+class ModelHistory:
+    def __init__(self, model, checkpoint_ratio=2.0):
+        self.model = model
+        self.checkpoint_ratio = checkpoint_ratio
+        self.deltas = []
+        self.position = 0                         # сколько дельт применено
+        self.checkpoints = {0: [p.copy() for p in model.payoffs]}
+        self.cost_since_checkpoint = 0
+        self.listeners = []                       # вызываются без аргументов при изменении истории
+        model.history = self
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def _changed(self):
+        for callback in self.listeners:
+            callback()
+
+    # --- Запись (вызывается моделью) ---
+    def record(self, delta):
+        if self.position < len(self.deltas):
+            # Новая правка после отмены отбрасывает ветку повтора
+            del self.deltas[self.position:]
+            self.checkpoints = {k: v for k, v in self.checkpoints.items() if k <= self.position}
+            last = max(self.checkpoints)
+            self.cost_since_checkpoint = sum(d.cost for d in self.deltas[last:])
+        self.deltas.append(delta)
+        self.position += 1
+        self.cost_since_checkpoint += delta.cost
+        if self.cost_since_checkpoint > self.checkpoint_ratio * self.model.payoffs[0].size:
+            self.checkpoints[self.position] = [p.copy() for p in self.model.payoffs]
+            self.cost_since_checkpoint = 0
+        self._changed()
+
+    # --- Отмена / повтор ---
+    @property
+    def can_undo(self):
+        return self.position > 0
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.deltas)
+
+    def undo(self):
+        if not self.can_undo:
+            return False
+        self.position -= 1
+        self.deltas[self.position].undo(self.model)
+        self._changed()
+        return True
+
+    def redo(self):
+        if not self.can_redo:
+            return False
+        self.deltas[self.position].redo(self.model)
+        self.position += 1
+        self._changed()
+        return True
+
+    def goto(self, position):
+        # Переход к версии position (0 — исходное состояние)
+        if not 0 <= position <= len(self.deltas):
+            raise ValueError(f"Нет версии {position} (доступно 0..{len(self.deltas)})")
+        checkpoint = max(k for k in self.checkpoints if k <= position)
+        if position >= self.position:
+            direct = sum(d.cost for d in self.deltas[self.position:position])
+        else:
+            direct = sum(d.cost for d in self.deltas[position:self.position])
+        via_checkpoint = self.checkpoints[checkpoint][0].size + sum(d.cost for d in self.deltas[checkpoint:position])
+        if via_checkpoint < direct:
+            self.model.restore_arrays([p.copy() for p in self.checkpoints[checkpoint]])
+            self.position = checkpoint
+        while self.position > position:
+            self.position -= 1
+            self.deltas[self.position].undo(self.model)
+        while self.position < position:
+            self.deltas[self.position].redo(self.model)
+            self.position += 1
+        self._changed()
+
+    def entries(self):
+        # Описания версий: [(номер, описание)], версия 0 — исходная матрица
+        return [(0, "Исходная матрица")] + [(k + 1, d.describe()) for k, d in enumerate(self.deltas)]
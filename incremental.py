@@ -0,0 +1,112 @@
+import numpy as np
+
+from game_engine import MaximinResult, NashResult, as_payoff_matrix, widened_dtype
+from instrumentation import timed
+
+
+# ---------------------------
+# Инкрементальный анализ при правке отдельных ячеек
+# ---------------------------
+# Сводки игры хранятся и поддерживаются при изменении одной ячейки (i, j):
+#   row_minima[i]  — минимум строки i матрицы A (гарантированный выигрыш игрока 1);
+#   col_maxima[j]  — максимум столбца j матрицы A: и минимакс, и значение лучшего
+#                    ответа игрока 1 на столбец j;
+#   row_maxima[i]  — максимум строки i матрицы B, значение лучшего ответа игрока 2
+#                    на строку i (для матричной игры B = -A и это -row_minima[i]);
+#   nash           — маска профилей, где оба игрока отвечают наилучшим образом.
+# Правка ячейки меняет только row_minima[i], row_maxima[i], col_maxima[j] и маску
+# в строке i и столбце j, поэтому пересчитываются лишь они — O(rows + cols) на правку.
+# Максимин, минимакс и наличие седловой точки берутся из сводок за O(rows + cols),
+# множество равновесий обновляется только в изменившихся профилях.
+# Полный проход O(rows * cols) выполняется один раз при построении.
+#
+# Результаты совпадают с game_engine.maximin_minimax и pure_nash_equilibria.
+# Матрицы копируются; значение, не помещающееся в тип, расширяет его (как в GameModel).
+
+
+class IncrementalAnalysis:
+    @timed("compute.incremental.IncrementalAnalysis")
+    def __init__(self, matrix1, matrix2=None):
+        self.matrices = [as_payoff_matrix(m, None).copy() for m in (matrix1, matrix2) if m is not None]
+        if any(m.shape != self.matrices[0].shape for m in self.matrices):
+            raise ValueError("Матрицы выигрышей игроков должны иметь одинаковый размер")
+        matrix = self.matrices[0]
+        self.row_minima = matrix.min(axis=1)
+        self.col_maxima = matrix.max(axis=0)
+        self.row_maxima = self.matrices[1].max(axis=1) if self.bimatrix else None
+        self.nash = (matrix >= self.col_maxima) & self._column_player_best(slice(None), slice(None))
+        self.equilibria = set(map(tuple, np.argwhere(self.nash).tolist()))
+        self.edits = 0
+
+    @property
+    def shape(self):
+        return self.matrices[0].shape
+
+    @property
+    def bimatrix(self):
+        return len(self.matrices) == 2
+
+    def _column_player_best(self, rows, cols):
+        # Маска: столбец — лучший ответ игрока 2 на строку (по срезу rows x cols)
+        if self.bimatrix:
+            return self.matrices[1][rows, cols] >= self.row_maxima[rows, None]
+        return self.matrices[0][rows, cols] <= self.row_minima[rows, None]
+
+    def _refresh(self, rows, cols, mask):
+        # Заменяет участок маски равновесий и переносит изменения в множество
+        changed = np.argwhere(mask != self.nash[rows, cols])
+        if not changed.size:
+            return
+        i0, j0 = rows.start or 0, cols.start or 0
+        for di, dj in changed.tolist():
+            cell = (i0 + di, j0 + dj)
+            if mask[di, dj]:
+                self.equilibria.add(cell)
+            else:
+                self.equilibria.discard(cell)
+        self.nash[rows, cols] = mask
+
+    @timed()
+    def update_cell(self, i, j, values):
+        # values — новые значения ячейки (i, j) во всех матрицах
+        for k, value in enumerate(values):
+            dtype = widened_dtype(self.matrices[k].dtype, value)
+            if dtype != self.matrices[k].dtype:
+                self.matrices[k] = self.matrices[k].astype(dtype)
+            self.matrices[k][i, j] = value
+        matrix = self.matrices[0]
+        if self.row_minima.dtype != matrix.dtype:
+            self.row_minima = self.row_minima.astype(matrix.dtype)
+            self.col_maxima = self.col_maxima.astype(matrix.dtype)
+        if self.bimatrix and self.row_maxima.dtype != self.matrices[1].dtype:
+            self.row_maxima = self.row_maxima.astype(self.matrices[1].dtype)
+
+        self.row_minima[i] = matrix[i].min()
+        self.col_maxima[j] = matrix[:, j].max()
+        if self.bimatrix:
+            self.row_maxima[i] = self.matrices[1][i].max()
+        # Строка i: изменился лучший ответ игрока 2 на неё; столбец j — лучший ответ игрока 1
+        row = slice(i, i + 1)
+        column = slice(j, j + 1)
+        self._refresh(row, slice(None), (matrix[row] >= self.col_maxima) & self._column_player_best(row, slice(None)))
+        self._refresh(slice(None), column,
+                      (matrix[:, column] >= self.col_maxima[j]) & self._column_player_best(slice(None), column))
+        self.edits += 1
+
+    # --- Результаты ---
+    @property
+    def saddle(self):
+        return bool(self.row_minima.max() == self.col_maxima.min())
+
+    def maximin_result(self):
+        maximin_row = int(np.argmax(self.row_minima))
+        minimax_col = int(np.argmin(self.col_maxima))
+        maximin = self.row_minima[maximin_row].item()
+        minimax = self.col_maxima[minimax_col].item()
+        return MaximinResult(maximin=maximin, maximin_row=maximin_row,
+                             minimax=minimax, minimax_col=minimax_col,
+                             saddle=(maximin == minimax),
+                             row_minima=self.row_minima.copy(), col_maxima=self.col_maxima.copy())
+
+    def nash_result(self):
+        return NashResult(equilibria=sorted(self.equilibria))
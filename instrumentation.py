@@ -0,0 +1,250 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+
+
+# ---------------------------
+# Профилирование этапов анализа
+# ---------------------------
+# Этапы называются "<вид>.<имя>": parse.* — чтение и разбор входа, compute.* — расчёты
+# движка, render.* / output.* — перерисовка таблицы, журнал, запись результатов,
+# job.* — полное время фоновой задачи GUI от запуска до результата (с ожиданием в очереди).
+#
+#   with instrumentation.stage("parse.input"): ...
+#   @instrumentation.timed()          — функция движка как этап compute.<модуль>.<функция>
+#
+# Выключенный профилировщик (по умолчанию) стоит одной проверки флага на вызов:
+# stage() возвращает общий пустой контекст, timed() сразу вызывает функцию.
+# Включённый копит по каждому этапу число вызовов, суммарное/минимальное/максимальное
+# время и последние max_events событий. С memory=True ещё и пик памяти этапа по
+# tracemalloc (NumPy сообщает ему о своих буферах); tracemalloc общий для всех потоков,
+# поэтому при параллельных этапах пик приблизителен, а сам учёт замедляет выделения памяти.
+# В рабочих процессах свой профилировщик: пакетный режим собирает этапы каждого файла
+# через capture() и переносит их в отчёт главного процесса.
+# Переменная окружения GAME_PROFILE=1 включает профилирование при запуске (=memory — с памятью).
+
+PROFILE_ENV = "GAME_PROFILE"
+
+
+@dataclass
+class StageEvent:
+    name: str
+    started: float                                # время начала (time.time())
+    seconds: float
+    peak_bytes: int = None                        # пик памяти сверх уровня на входе в этап
+    thread: str = ""
+    info: dict = field(default_factory=dict)
+
+
+@dataclass
+class StageStats:
+    count: int = 0
+    total: float = 0.0
+    min: float = None
+    max: float = 0.0
+    peak_bytes: int = None
+
+    def add(self, event):
+        self.count += 1
+        self.total += event.seconds
+        self.min = event.seconds if self.min is None else min(self.min, event.seconds)
+        self.max = max(self.max, event.seconds)
+        if event.peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, event.peak_bytes)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler, name, info):
+        self.profiler = profiler
+        self.name = name
+        self.info = info
+
+    def __enter__(self):
+        self.memory = self.profiler.memory and tracemalloc.is_tracing()
+        if self.memory:
+            # Пик вложенного этапа сбрасывает общий пик tracemalloc, поэтому
+            # внешние этапы получают пики вложенных через стек
+            self.base, outer_peak = tracemalloc.get_traced_memory()
+            stack = self.profiler._memory_stack()
+            if stack:
+                stack[-1] = max(stack[-1], outer_peak)
+            stack.append(0)
+            tracemalloc.reset_peak()
+        self.started = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        peak = None
+        if self.memory:
+            stack = self.profiler._memory_stack()
+            peak_abs = max(tracemalloc.get_traced_memory()[1], stack.pop())
+            if stack:
+                stack[-1] = max(stack[-1], peak_abs)
+            peak = max(0, peak_abs - self.base)
+        self.profiler.add(StageEvent(self.name, self.started, seconds, peak,
+                                     threading.current_thread().name, self.info))
+        return False
+
+
+class Profiler:
+    def __init__(self, max_events=1000):
+        self.enabled = False
+        self.memory = False
+        self.max_events = max_events
+        self.events = deque(maxlen=max_events)
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started_tracing = False
+
+    def enable(self, memory=False):
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.memory = False
+
+    def _memory_stack(self):
+        stack = getattr(self.local, "memory", None)
+        if stack is None:
+            stack = self.local.memory = []
+        return stack
+
+    # --- Запись ---
+    def stage(self, name, **info):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, info)
+
+    def record(self, name, seconds, peak_bytes=None, **info):
+        # Этап, измеренный снаружи (задача в другом процессе, этапы рабочего процесса)
+        if self.enabled:
+            self.add(StageEvent(name, time.time() - seconds, seconds, peak_bytes,
+                                threading.current_thread().name, info))
+
+    def add(self, event):
+        with self.lock:
+            self.events.append(event)
+            self.stats.setdefault(event.name, StageStats()).add(event)
+        captured = getattr(self.local, "captured", None)
+        if captured is not None:
+            captured.append(event)
+
+    def capture(self):
+        # with profiler.capture() as events: — события текущего потока внутри блока
+        return _Capture(self)
+
+    # --- Отчёт ---
+    def reset(self):
+        with self.lock:
+            self.events.clear()
+            self.stats.clear()
+
+    def summary(self):
+        # {этап: {count, total, mean, min, max, peak_bytes}} по убыванию суммарного времени
+        with self.lock:
+            items = sorted(self.stats.items(), key=lambda item: -item[1].total)
+            return {name: dict(asdict(s), mean=s.mean) for name, s in items}
+
+    def report(self, events=True):
+        report = {"timestamp": datetime.now().isoformat(timespec="seconds"), "pid": os.getpid(),
+                  "enabled": self.enabled, "memory": self.memory, "stages": self.summary()}
+        if events:
+            with self.lock:
+                report["events"] = [asdict(e) for e in self.events]
+        return report
+
+    def export_json(self, path, events=True):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(events), file, ensure_ascii=False, indent=1)
+
+
+class _Capture:
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.outer = getattr(self.profiler.local, "captured", None)
+        self.events = []
+        self.profiler.local.captured = self.events
+        return self.events
+
+    def __exit__(self, *exc):
+        self.profiler.local.captured = self.outer
+        if self.outer is not None:
+            self.outer.extend(self.events)
+        return False
+
+
+PROFILER = Profiler()
+
+
+def stage(name, **info):
+    return PROFILER.stage(name, **info)
+
+
+def timed(name=None):
+    # Декоратор: вызов функции — этап name (по умолчанию compute.<модуль>.<функция>).
+    # functools.wraps сохраняет __module__ и __qualname__, поэтому ключи кэша
+    # и передача функции в пул процессов не меняются.
+    def decorate(fn):
+        stage_name = name or f"compute.{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            with _Stage(PROFILER, stage_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable(memory=False):
+    PROFILER.enable(memory)
+
+
+def disable():
+    PROFILER.disable()
+
+
+def report(events=True):
+    return PROFILER.report(events)
+
+
+def export_json(path, events=True):
+    PROFILER.export_json(path, events)
+
+
+if os.environ.get(PROFILE_ENV):
+    enable(memory=os.environ[PROFILE_ENV].lower() == "memory")
@@ -0,0 +1,187 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError, Future, InvalidStateError
+
+
+# ---------------------------
+# Фоновое выполнение анализов для GUI
+# ---------------------------
+# Анализы выполняются в пуле потоков (NumPy и HiGHS отпускают GIL) или, по запросу,
+# в пуле процессов. Результаты, ошибки и прогресс передаются в главный поток Tk
+# опросом через after(), поэтому обработчики on_done/on_error/on_progress
+# могут свободно работать с виджетами.
+#
+# У каждой задачи есть ключ: новая задача с тем же ключом отменяет старую.
+# Задачи группируются по владельцу (вкладке), и при изменении матрицы
+# все устаревшие задачи вкладки отменяются разом.
+#
+# Отмена кооперативная: функции движка, принимающие progress=, вызывают его
+# между блоками работы, и при отменённой задаче вызов бросает JobCancelled.
+# Уже запущенную в процессе задачу прервать нельзя — её результат просто отбрасывается.
+# Процессы — multiprocessing.Pool: его рабочие процессы принадлежат планировщику,
+# и shutdown завершает их через terminate(), не дожидаясь долгих задач.
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _settle(method, value):
+    # Вызывается потоком результатов multiprocessing.Pool; отменённая задача результата не ждёт
+    try:
+        method(value)
+    except InvalidStateError:
+        pass
+
+
+class JobContext:
+    def __init__(self):
+        self.cancel_event = threading.Event()
+        self.updates = queue.SimpleQueue()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, fraction, message=""):
+        # Вызывается из рабочего потока
+        self.check()
+        self.updates.put((fraction, message))
+
+
+class Job:
+    def __init__(self, key, owner, title, future, context, on_done, on_error, on_progress):
+        self.key = key
+        self.owner = owner
+        self.title = title
+        self.future = future
+        self.context = context
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.progress = None
+
+    @property
+    def cancelled(self):
+        return self.context.cancelled
+
+    def cancel(self):
+        self.context.cancel_event.set()
+        self.future.cancel()
+
+
+class JobScheduler:
+    def __init__(self, root, threads=None, processes=None, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.thread_pool = ThreadPoolExecutor(max_workers=threads or min(8, (os.cpu_count() or 1) + 2))
+        self.process_count = processes
+        self.process_pool = None
+        self.jobs = {}
+        self.listeners = []  # вызываются как callback(owner) при изменении списка задач
+        self.polling = False
+
+    def _submit_process(self, fn, args, kwargs):
+        # Результат multiprocessing.Pool передаётся в Future, как у задач пула потоков
+        if self.process_pool is None:
+            self.process_pool = multiprocessing.Pool(self.process_count)
+        future = Future()
+        self.process_pool.apply_async(fn, args, kwargs,
+                                      callback=lambda result: _settle(future.set_result, result),
+                                      error_callback=lambda error: _settle(future.set_exception, error))
+        return future
+
+    def submit(self, key, fn, *args, owner=None, title="", in_process=False, report_progress=False,
+               on_done=None, on_error=None, on_progress=None, **kwargs):
+        # report_progress=True передаёт в fn аргумент progress=context.report
+        # (только для потоков: в другой процесс обратный вызов не передать)
+        self.cancel(key)
+        context = JobContext()
+        if in_process:
+            future = self._submit_process(fn, args, kwargs)
+        else:
+            if report_progress:
+                kwargs["progress"] = context.report
+            future = self.thread_pool.submit(self._run, context, fn, args, kwargs)
+        job = Job(key, owner, title, future, context, on_done, on_error, on_progress)
+        self.jobs[key] = job
+        self._notify(owner)
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self.poll)
+        return job
+
+    @staticmethod
+    def _run(context, fn, args, kwargs):
+        context.check()
+        return fn(*args, **kwargs)
+
+    def cancel(self, key):
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            job.cancel()
+            self._notify(job.owner)
+
+    def cancel_owner(self, owner):
+        for key, job in list(self.jobs.items()):
+            if job.owner is owner:
+                self.cancel(key)
+
+    def running(self, owner=None):
+        return [job for job in self.jobs.values() if owner is None or job.owner is owner]
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def _notify(self, owner):
+        for callback in self.listeners:
+            callback(owner)
+
+    def poll(self):
+        for key, job in list(self.jobs.items()):
+            latest = None
+            while True:
+                try:
+                    latest = job.context.updates.get_nowait()
+                except queue.Empty:
+                    break
+            if latest is not None and not job.cancelled:
+                job.progress = latest
+                if job.on_progress is not None:
+                    job.on_progress(*latest)
+            if not job.future.done():
+                continue
+            del self.jobs[key]
+            self._notify(job.owner)
+            if job.cancelled:
+                continue
+            try:
+                result = job.future.result()
+            except (JobCancelled, CancelledError):
+                continue
+            except Exception as e:
+                if job.on_error is not None:
+                    job.on_error(e)
+                continue
+            if job.on_done is not None:
+                job.on_done(result)
+        if self.jobs:
+            self.root.after(self.poll_ms, self.poll)
+        else:
+            self.polling = False
+
+    def shutdown(self):
+        for key in list(self.jobs):
+            self.cancel(key)
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool is not None:
+            # Запущенную в процессе задачу иначе не прервать — завершаем рабочие процессы
+            self.process_pool.terminate()
+            self.process_pool.join()
+            self.process_pool = None
@@ -0,0 +1,258 @@
+import tkinter as tk
+import numpy as np
+from tkinter import messagebox
+
+from game_model import CELL, cell_value
+from instrumentation import timed
+
+
+# ---------------------------
+# Виртуализированная таблица матрицы на Canvas
+# ---------------------------
+# Таблица — представление game_model.GameModel: одна матрица для матричной игры,
+# две — для биматричной (ячейка отображается как "a;b"). Правка ячейки
+# передаётся в модель, а модель сообщает таблице, что перерисовать.
+# На Canvas рисуются только видимые ячейки, поэтому изменение размеров,
+# загрузка и случайное заполнение стоят одну перерисовку, а не пересоздание
+# тысяч виджетов. Редактирование — одним полем ввода поверх ячейки.
+
+def format_value(value):
+    # Целые выводятся полностью (у :g 6 значащих цифр)
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return f"{value:g}"
+
+
+class MatrixSheet(tk.Frame):
+    def __init__(self, master, model, cell_width=70, cell_height=24, header_width=60,
+                 width=800, height=300):
+        super().__init__(master)
+        self.model = model
+        self.layer_count = model.layer_count
+        self.cell_width = cell_width if self.layer_count == 1 else cell_width + 30
+        self.cell_height = cell_height
+        self.header_width = header_width
+        self.header_height = cell_height
+        self.cell_items = {}  # (i, j) -> id текста видимой ячейки
+        self.editor = None
+        self.editor_cell = None
+        self.editor_text = ""                     # текст ячейки при открытии редактора
+        self.history_commands = None              # (undo, redo) для Ctrl+Z / Ctrl+Y
+
+        self.canvas = tk.Canvas(self, width=width, height=height, background="white",
+                                highlightthickness=0)
+        v_scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        h_scrollbar = tk.Scrollbar(self, orient="horizontal", command=self.xview)
+        self.canvas.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        model.subscribe(self.on_model_changed)
+        self.on_model_changed(None, None)
+
+    # --- Данные ---
+    @property
+    def shape(self):
+        return self.model.shape
+
+    def cell_text(self, i, j):
+        return ";".join(format_value(p[i, j]) for p in self.model.payoffs)
+
+    def on_model_changed(self, kind, cell):
+        if kind == CELL:
+            # Перерисовываем только изменённую ячейку, если она видна
+            item = self.cell_items.get(cell)
+            if item is not None:
+                self.canvas.itemconfigure(item, text=self.cell_text(*cell))
+            return
+        self.cancel_edit()
+        rows, cols = self.shape
+        self.canvas.configure(scrollregion=(0, 0,
+                                            self.header_width + cols * self.cell_width,
+                                            self.header_height + rows * self.cell_height))
+        self.redraw()
+
+    # --- Прокрутка ---
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def xview(self, *args):
+        self.canvas.xview(*args)
+        self.redraw()
+
+    def on_wheel(self, event):
+        self.yview("scroll", -1 if event.delta > 0 else 1, "units")
+
+    # --- Отрисовка только видимой области ---
+    def visible_range(self):
+        rows, cols = self.shape
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        right = left + max(self.canvas.winfo_width(), int(self.canvas["width"]))
+        bottom = top + max(self.canvas.winfo_height(), int(self.canvas["height"]))
+        first_row = max(0, int((top - self.header_height) // self.cell_height))
+        last_row = min(rows, int((bottom - self.header_height) // self.cell_height) + 1)
+        first_col = max(0, int((left - self.header_width) // self.cell_width))
+        last_col = min(cols, int((right - self.header_width) // self.cell_width) + 1)
+        return first_row, last_row, first_col, last_col
+
+    @timed("render.matrix_sheet.redraw")
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("cell")
+        self.cell_items = {}
+        rows, cols = self.shape
+        if rows == 0 or cols == 0:
+            return
+        first_row, last_row, first_col, last_col = self.visible_range()
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        w, h = self.cell_width, self.cell_height
+        x0, y0 = self.header_width, self.header_height
+        for i in range(first_row, last_row):
+            y = y0 + i * h
+            for j in range(first_col, last_col):
+                x = x0 + j * w
+                canvas.create_rectangle(x, y, x + w, y + h, outline="#c0c0c0", tags="cell")
+                self.cell_items[(i, j)] = canvas.create_text(x + w / 2, y + h / 2, text=self.cell_text(i, j),
+                                                             tags="cell")
+        # Заголовки закреплены у края видимой области
+        for j in range(first_col, last_col):
+            x = x0 + j * w
+            canvas.create_rectangle(x, top, x + w, top + y0, fill="#eeeeee", outline="#c0c0c0", tags="cell")
+            canvas.create_text(x + w / 2, top + y0 / 2, text=f"Col {j + 1}", tags="cell")
+        for i in range(first_row, last_row):
+            y = y0 + i * h
+            canvas.create_rectangle(left, y, left + x0, y + h, fill="#eeeeee", outline="#c0c0c0", tags="cell")
+            canvas.create_text(left + x0 / 2, y + h / 2, text=f"Row {i + 1}", tags="cell")
+        canvas.create_rectangle(left, top, left + x0, top + y0, fill="#eeeeee", outline="#c0c0c0", tags="cell")
+        if self.editor is not None:
+            self.place_editor()
+
+    # --- Редактирование ячейки на месте ---
+    def cell_at(self, x, y):
+        cx = self.canvas.canvasx(x) - self.header_width
+        cy = self.canvas.canvasy(y) - self.header_height
+        if cx < 0 or cy < 0:
+            return None
+        i, j = int(cy // self.cell_height), int(cx // self.cell_width)
+        rows, cols = self.shape
+        if i >= rows or j >= cols:
+            return None
+        return i, j
+
+    def on_click(self, event):
+        # Фокус на таблицу, чтобы Ctrl+Z / Ctrl+Y работали и без открытого редактора
+        self.canvas.focus_set()
+        cell = self.cell_at(event.x, event.y)
+        if not self.commit_edit():
+            return
+        if cell is not None:
+            self.start_edit(*cell)
+
+    def start_edit(self, i, j):
+        self.editor_cell = (i, j)
+        self.editor_text = self.cell_text(i, j)
+        self.editor = tk.Entry(self.canvas, justify="center")
+        self.editor.insert(0, self.editor_text)
+        self.editor.select_range(0, tk.END)
+        self.editor.bind("<Return>", lambda e: self.move_edit(1, 0))
+        self.editor.bind("<Tab>", lambda e: self.move_edit(0, 1) or "break")
+        self.editor.bind("<Escape>", lambda e: self.cancel_edit())
+        if self.history_commands is not None:
+            for key in ("z", "Z"):
+                self.editor.bind(f"<Control-{key}>", self.editor_undo)
+            for key in ("y", "Y"):
+                self.editor.bind(f"<Control-{key}>", self.editor_redo)
+        self.place_editor()
+        self.editor.focus_set()
+
+    # --- Отмена и повтор с клавиатуры ---
+    def bind_history(self, undo, redo):
+        # Ctrl+Z / Ctrl+Y работают и на таблице, и в поле ввода ячейки, куда переходит фокус при правке
+        self.history_commands = (undo, redo)
+        for key in ("z", "Z"):
+            self.canvas.bind(f"<Control-{key}>", lambda e: undo())
+        for key in ("y", "Y"):
+            self.canvas.bind(f"<Control-{key}>", lambda e: redo())
+
+    def editor_undo(self, event):
+        # Сначала откатывается ещё не принятый текст ячейки, затем — история модели.
+        # "break" не даёт сработать привязкам класса Entry.
+        if self.editor.get() != self.editor_text:
+            self.editor.delete(0, tk.END)
+            self.editor.insert(0, self.editor_text)
+            self.editor.select_range(0, tk.END)
+        else:
+            self.cancel_edit()
+            self.canvas.focus_set()
+            self.history_commands[0]()
+        return "break"
+
+    def editor_redo(self, event):
+        # Повтор отменённой правки заменил бы ячейку, поэтому набранный текст сохраняется,
+        # пока его не откатят (Ctrl+Z) или не примут
+        if self.editor.get() == self.editor_text:
+            self.cancel_edit()
+            self.canvas.focus_set()
+            self.history_commands[1]()
+        return "break"
+
+    def place_editor(self):
+        i, j = self.editor_cell
+        self.canvas.delete("editor")
+        self.canvas.create_window(self.header_width + j * self.cell_width,
+                                  self.header_height + i * self.cell_height,
+                                  window=self.editor, anchor="nw", tags="editor",
+                                  width=self.cell_width, height=self.cell_height)
+
+    def move_edit(self, di, dj):
+        if self.editor_cell is None:
+            return
+        i, j = self.editor_cell
+        if not self.commit_edit():
+            return
+        rows, cols = self.shape
+        i, j = i + di, j + dj
+        if j >= cols:
+            i, j = i + 1, 0
+        if i < rows:
+            self.start_edit(i, j)
+
+    def parse_cell(self, text):
+        parts = text.split(";")
+        if len(parts) != self.layer_count:
+            raise ValueError
+        return [cell_value(p) for p in parts]
+
+    def commit_edit(self):
+        # Возвращает False, если введено некорректное значение (редактор остаётся открытым)
+        if self.editor is None:
+            return True
+        i, j = self.editor_cell
+        try:
+            values = self.parse_cell(self.editor.get())
+        except ValueError:
+            hint = "число" if self.layer_count == 1 else "пару чисел через ;"
+            messagebox.showerror("Ошибка", f"Ячейка ({i + 1}, {j + 1}): введите {hint}")
+            self.editor.focus_set()
+            return False
+        self.cancel_edit()
+        self.model.set_cell(i, j, values)
+        return True
+
+    def cancel_edit(self):
+        if self.editor is not None:
+            self.canvas.delete("editor")
+            self.editor.destroy()
+        self.editor = None
+        self.editor_cell = None
@@ -0,0 +1,308 @@
+import os
+from dataclasses import dataclass
+from collections import deque
+from itertools import combinations, islice
+from math import comb
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_engine import as_bimatrix
+from instrumentation import timed
+
+
+# ---------------------------
+# Равновесия Нэша в смешанных стратегиях для биматричных игр
+# ---------------------------
+# Два режима:
+#   lemke_howson        — комплементарный поворот, быстро находит одно равновесие;
+#   support_enumeration — перебор пар носителей всех размеров: все равновесия невырожденной
+#                         игры, у вырожденной — по равновесию на каждую подходящую пару
+#                         носителей. Пары распределяются по пулу процессов, носители
+#                         равного размера перебираются первыми.
+# balanced_only=True оставляет только носители равного размера: у невырожденной игры
+# других не бывает, но вырожденные (например, с целыми выигрышами) теряют равновесия.
+
+TOLERANCE = 1e-9
+
+# Меньше этого числа пар носителей пул процессов не запускается
+PARALLEL_MIN_PAIRS = 20000
+
+# Носителей столбцов в одном блоке проверки и предел числа носителей одного размера,
+# которые строятся один раз и хранятся в процессе
+COLUMN_BLOCK = 4096
+CACHED_COLUMN_SUPPORTS = 1 << 16
+
+
+@dataclass
+class MixedEquilibrium:
+    row_strategy: np.ndarray
+    col_strategy: np.ndarray
+    row_payoff: float
+    col_payoff: float
+
+    @property
+    def row_support(self):
+        return np.flatnonzero(self.row_strategy > TOLERANCE)
+
+    @property
+    def col_support(self):
+        return np.flatnonzero(self.col_strategy > TOLERANCE)
+
+    @property
+    def pure(self):
+        return self.row_support.size == 1 and self.col_support.size == 1
+
+
+def _equilibrium(matrix1, matrix2, x, y):
+    return MixedEquilibrium(row_strategy=x, col_strategy=y,
+                            row_payoff=float(x @ matrix1 @ y), col_payoff=float(x @ matrix2 @ y))
+
+
+def is_equilibrium(matrix1, matrix2, x, y, tol=1e-7):
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    row_values = matrix1 @ y
+    col_values = x @ matrix2
+    return bool(np.max(row_values) <= x @ row_values + tol and np.max(col_values) <= col_values @ y + tol)
+
+
+# ---------------------------
+# Алгоритм Лемке — Хоусона
+# ---------------------------
+# Многогранники P = {x >= 0, B^T x <= 1} и Q = {y >= 0, A y <= 1} для положительных A, B.
+# Метки 0..m-1 соответствуют стратегиям игрока 1, m..m+n-1 — игрока 2;
+# номер столбца таблицы совпадает с номером метки переменной.
+def _pivot(tableau, basis, column, slack_columns):
+    # Лексикографическое правило минимального отношения — защита от зацикливания
+    # на вырожденных играх
+    positive = np.flatnonzero(tableau[:, column] > TOLERANCE)
+    if positive.size == 0:
+        raise RuntimeError("Неограниченное направление в алгоритме Лемке — Хоусона")
+    keys = np.column_stack([tableau[positive, -1], tableau[positive][:, slack_columns]])
+    keys = np.round(keys / tableau[positive, column][:, None], 12)
+    order = np.lexsort(keys.T[::-1])
+    row = positive[order[0]]
+    tableau[row] /= tableau[row, column]
+    others = np.arange(tableau.shape[0]) != row
+    tableau[others] -= np.outer(tableau[others, column], tableau[row])
+    leaving = basis[row]
+    basis[row] = column
+    return leaving
+
+
+@timed()
+def lemke_howson(matrix1, matrix2, dropped_label=0, max_pivots=None):
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    m, n = matrix1.shape
+    if not 0 <= dropped_label < m + n:
+        raise ValueError(f"Метка должна быть в диапазоне 0..{m + n - 1}")
+    # Сдвиг выигрышей не меняет равновесий, но делает многогранники ограниченными
+    a = matrix1 - matrix1.min() + 1.0
+    b = matrix2 - matrix2.min() + 1.0
+    # P: столбцы x_0..x_{m-1}, s_0..s_{n-1}, правая часть
+    tableau_p = np.hstack([b.T, np.eye(n), np.ones((n, 1))])
+    basis_p = list(range(m, m + n))
+    # Q: столбцы r_0..r_{m-1}, y_0..y_{n-1}, правая часть
+    tableau_q = np.hstack([np.eye(m), a, np.ones((m, 1))])
+    basis_q = list(range(m))
+    slack_p = np.arange(m, m + n)
+    slack_q = np.arange(m)
+
+    if max_pivots is None:
+        max_pivots = 10 * (m + n) ** 2 + 100
+    entering = dropped_label
+    in_p = dropped_label < m
+    for _ in range(max_pivots):
+        if in_p:
+            leaving = _pivot(tableau_p, basis_p, entering, slack_p)
+        else:
+            leaving = _pivot(tableau_q, basis_q, entering, slack_q)
+        if leaving == dropped_label:
+            break
+        entering = leaving
+        in_p = not in_p
+    else:
+        raise RuntimeError("Превышено число итераций алгоритма Лемке — Хоусона")
+
+    x = np.zeros(m)
+    y = np.zeros(n)
+    for row, label in enumerate(basis_p):
+        if label < m:
+            x[label] = tableau_p[row, -1]
+    for row, label in enumerate(basis_q):
+        if label >= m:
+            y[label - m] = tableau_q[row, -1]
+    return _equilibrium(matrix1, matrix2, x / x.sum(), y / y.sum())
+
+
+# ---------------------------
+# Перебор носителей
+# ---------------------------
+def support_sizes(rows, cols, max_support=None, balanced_only=False):
+    # Пары размеров носителей: сначала равные (k, k) по возрастанию k,
+    # затем — по возрастанию разности размеров. Носитель игрока — до всех его стратегий
+    limit = max(rows, cols) if max_support is None else min(max_support, max(rows, cols))
+    sizes = [(k1, k2) for k1 in range(1, min(rows, limit) + 1) for k2 in range(1, min(cols, limit) + 1)]
+    if balanced_only:
+        sizes = [(k1, k2) for k1, k2 in sizes if k1 == k2]
+    return sorted(sizes, key=lambda s: (abs(s[0] - s[1]), max(s), s))
+
+
+def _solve_indifference(payoff, tol):
+    # payoff — пачка (c, k1, k2). Ищет стратегию z (c, k2) на носителе,
+    # делающую все k1 строк безразличными: payoff @ z = u, sum(z) = 1.
+    c, k1, k2 = payoff.shape
+    system = np.zeros((c, k1 + 1, k2 + 1))
+    system[:, :k1, :k2] = payoff
+    system[:, :k1, k2] = -1.0
+    system[:, k1, :k2] = 1.0
+    rhs = np.zeros(k1 + 1)
+    rhs[k1] = 1.0
+    solution = np.full((c, k2 + 1), np.nan)
+    if k1 == k2:
+        regular = np.abs(np.linalg.det(system)) > tol
+        if regular.any():
+            rhs_batch = np.broadcast_to(rhs, (int(regular.sum()), k1 + 1))[..., None]
+            solution[regular] = np.linalg.solve(system[regular], rhs_batch)[..., 0]
+        irregular = np.flatnonzero(~regular)
+    else:
+        irregular = np.arange(c)
+    # Вырожденные и неквадратные системы — метод наименьших квадратов с проверкой невязки
+    for idx in irregular:
+        z, *_ = np.linalg.lstsq(system[idx], rhs, rcond=None)
+        if np.allclose(system[idx] @ z, rhs, atol=1e-7):
+            solution[idx] = z
+    return solution[:, :k2], solution[:, k2]
+
+
+def _check_support(matrix1, matrix2, rows, col_supports, tol):
+    # Проверяет носитель строк rows со всеми носителями столбцов col_supports (c, k2)
+    rows = list(rows)
+    a_rows = matrix1[rows]
+    b_rows = matrix2[rows]
+    # y уравнивает выигрыши игрока 1 на rows, x уравнивает выигрыши игрока 2 на столбцах
+    y, u = _solve_indifference(np.transpose(a_rows[:, col_supports], (1, 0, 2)), tol)
+    x, v = _solve_indifference(np.transpose(b_rows[:, col_supports], (1, 2, 0)), tol)
+    valid = np.all(y > tol, axis=1) & np.all(x > tol, axis=1)
+    found = []
+    for idx in np.flatnonzero(valid):
+        cols = col_supports[idx]
+        # Ни одна стратегия вне носителя не даёт большего выигрыша
+        if np.max(matrix1[:, cols] @ y[idx]) > u[idx] + 1e-7:
+            continue
+        if np.max(x[idx] @ b_rows) > v[idx] + 1e-7:
+            continue
+        full_x = np.zeros(matrix1.shape[0])
+        full_y = np.zeros(matrix1.shape[1])
+        full_x[rows] = x[idx]
+        full_y[cols] = y[idx]
+        found.append((full_x, full_y))
+    return found
+
+
+_worker_game = None
+_column_supports = {}                             # (cols, k2) -> список блоков носителей столбцов
+
+
+def _init_worker(matrix1, matrix2):
+    global _worker_game
+    _worker_game = (matrix1, matrix2)
+    _column_supports.clear()
+
+
+def _blocks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        block = list(islice(iterator, size))
+        if not block:
+            return
+        yield block
+
+
+def _column_blocks(cols, k2):
+    # Носители столбцов размера k2 блоками по COLUMN_BLOCK. Если их немного, блоки
+    # строятся один раз на размер и процесс; иначе перебираются лениво, без списка всех
+    if (cols, k2) in _column_supports:
+        return _column_supports[(cols, k2)]
+    blocks = (np.array(block) for block in _blocks(combinations(range(cols), k2), COLUMN_BLOCK))
+    if comb(cols, k2) <= CACHED_COLUMN_SUPPORTS:
+        blocks = _column_supports[(cols, k2)] = list(blocks)
+    return blocks
+
+
+def _support_task(task):
+    row_supports, k2, tol = task
+    matrix1, matrix2 = _worker_game
+    found = []
+    for col_supports in _column_blocks(matrix1.shape[1], k2):
+        for rows in row_supports:
+            found.extend(_check_support(matrix1, matrix2, rows, col_supports, tol))
+    return found
+
+
+def _tasks(rows, sizes, tol, chunk):
+    # Порции носителей строк выдаются лениво, по мере отправки в работу
+    for k1, k2 in sizes:
+        for row_supports in _blocks(combinations(range(rows), k1), chunk):
+            yield row_supports, k2, tol
+
+
+def _task_count(rows, sizes, chunk):
+    return sum(-(-comb(rows, k1) // chunk) for k1, _ in sizes)
+
+
+def pair_count(rows, cols, max_support=None, balanced_only=False):
+    # Число пар носителей, которые перебирает support_enumeration
+    return sum(comb(rows, k1) * comb(cols, k2) for k1, k2 in support_sizes(rows, cols, max_support, balanced_only))
+
+
+def iter_support_enumeration(matrix1, matrix2, max_support=None, balanced_only=False,
+                             workers=None, chunk=64, tol=TOLERANCE, progress=None):
+    # Генератор равновесий в порядке перебора размеров носителей.
+    # progress(доля, сообщение) вызывается после каждой порции носителей.
+    # В пуле одновременно находится не больше 2 * workers порций.
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    rows, cols = matrix1.shape
+    sizes = support_sizes(rows, cols, max_support, balanced_only)
+    tasks = _tasks(rows, sizes, tol, chunk)
+    total = _task_count(rows, sizes, chunk)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def report(done):
+        if progress is not None:
+            progress(done / total, f"Порций носителей: {done} из {total}")
+
+    if workers <= 1 or pair_count(rows, cols, max_support, balanced_only) < PARALLEL_MIN_PAIRS:
+        _init_worker(matrix1, matrix2)
+        for done, task in enumerate(tasks, 1):
+            found = _support_task(task)
+            report(done)
+            for x, y in found:
+                yield _equilibrium(matrix1, matrix2, x, y)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(matrix1, matrix2)) as pool:
+        pending = deque(pool.submit(_support_task, task) for task in islice(tasks, 2 * workers))
+        done = 0
+        while pending:
+            found = pending.popleft().result()
+            for task in islice(tasks, 1):
+                pending.append(pool.submit(_support_task, task))
+            done += 1
+            report(done)
+            for x, y in found:
+                yield _equilibrium(matrix1, matrix2, x, y)
+
+
+@timed()
+def support_enumeration(matrix1, matrix2, max_support=None, balanced_only=False, workers=None, tol=TOLERANCE,
+                        progress=None):
+    equilibria = []
+    for eq in iter_support_enumeration(matrix1, matrix2, max_support, balanced_only, workers, tol=tol,
+                                       progress=progress):
+        # Вырожденные игры могут дать одно равновесие на разных парах носителей
+        if not any(np.allclose(eq.row_strategy, e.row_strategy) and np.allclose(eq.col_strategy, e.col_strategy)
+                   for e in equilibria):
+            equilibria.append(eq)
+    return equilibria
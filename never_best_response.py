@@ -0,0 +1,160 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+from game_engine import ROW, COLUMN, as_bimatrix
+from dominance import pairwise_counts
+from zerosum import require_linprog
+from instrumentation import timed
+
+
+# ---------------------------
+# Удаление НЛО-стратегий (никогда не лучших ответов)
+# ---------------------------
+# Стратегия i — лучший ответ, если существует смешанная стратегия соперника y,
+# при которой max_k (P[k] - P[i]) y <= 0. Это проверяется задачей ЛП
+#   min z  при  (P[k] - P[i]) y <= z,  sum(y) = 1,  y >= 0.
+# Перед решением ЛП стратегии отсеиваются дешёвыми проверками:
+#   1) лучший ответ на чистую стратегию соперника — точно не НЛО;
+#   2) строго доминируемая чистой стратегией — точно НЛО;
+#   3) лучший ответ на одну из уже найденных смешанных стратегий y
+#      (решения предыдущих ЛП) — точно не НЛО.
+# Третья проверка играет роль тёплого старта: решение одной ЛП
+# часто закрывает сразу несколько следующих.
+
+TOLERANCE = 1e-9
+
+
+@dataclass
+class NbrStep:
+    player: str
+    removed: list                                 # метки удалённых стратегий
+    by_dominance: int                             # из них отсеяно проверкой доминирования
+
+
+@dataclass
+class NbrResult:
+    matrices: tuple
+    row_index: np.ndarray
+    col_index: np.ndarray
+    row_labels: list
+    col_labels: list
+    steps: list = field(default_factory=list)
+    rounds: int = 0                               # раундов, удаливших хотя бы одну стратегию
+    lp_solved: int = 0
+
+    @property
+    def changed(self):
+        return bool(self.steps)
+
+
+def _best_response_witness(payoff, i, linprog, tol):
+    # Возвращает смешанную стратегию соперника, против которой i — лучший ответ,
+    # или None, если такой нет
+    rows, cols = payoff.shape
+    a_ub = np.hstack([payoff - payoff[i], -np.ones((rows, 1))])
+    c = np.zeros(cols + 1)
+    c[-1] = 1.0
+    a_eq = np.ones((1, cols + 1))
+    a_eq[0, -1] = 0.0
+    res = linprog(c, A_ub=a_ub, b_ub=np.zeros(rows), A_eq=a_eq, b_eq=[1.0],
+                  bounds=[(0, None)] * cols + [(None, None)], method="highs")
+    if res.status != 0:
+        raise RuntimeError(f"Не удалось решить задачу ЛП: {res.message}")
+    if res.fun > tol:
+        return None
+    y = np.clip(res.x[:cols], 0.0, None)
+    return y / y.sum()
+
+
+def find_never_best_responses(payoff, witnesses=None, tol=TOLERANCE, progress=None):
+    # payoff — выигрыши игрока: строки — его стратегии, столбцы — стратегии соперника.
+    # witnesses — список смешанных стратегий соперника из предыдущих ЛП (дополняется).
+    # Возвращает (индексы НЛО-стратегий, сколько из них строго доминируемы, число ЛП).
+    # progress(None, сообщение) вызывается после каждой решённой ЛП.
+    payoff = np.asarray(payoff, dtype=float)
+    rows, cols = payoff.shape
+    if witnesses is None:
+        witnesses = []
+    certified = np.zeros(rows, dtype=bool)
+    # 1) Лучшие ответы на чистые стратегии
+    certified |= np.any(payoff >= payoff.max(axis=0) - tol, axis=1)
+    # 3) Лучшие ответы на ранее найденные смешанные стратегии
+    if witnesses and not certified.all():
+        values = payoff @ np.column_stack(witnesses)
+        certified |= np.any(values >= values.max(axis=0) - tol, axis=1)
+
+    never = np.zeros(rows, dtype=bool)
+    # 2) Строгое доминирование чистой стратегией
+    candidates = np.flatnonzero(~certified)
+    if candidates.size:
+        less, _ = pairwise_counts(payoff[candidates], payoff)
+        never[candidates[np.any(less == cols, axis=1)]] = True
+    by_dominance = int(never.sum())
+
+    linprog = None
+    lp_solved = 0
+    for i in np.flatnonzero(~certified & ~never):
+        if certified[i]:
+            continue
+        if linprog is None:
+            linprog = require_linprog()
+        y = _best_response_witness(payoff, i, linprog, tol)
+        lp_solved += 1
+        if progress is not None:
+            progress(None, f"Решено задач ЛП: {lp_solved}")
+        if y is None:
+            never[i] = True
+            continue
+        # Найденная y подтверждает все стратегии, которые на неё лучшие ответы
+        witnesses.append(y)
+        values = payoff @ y
+        certified |= values >= values.max() - tol
+    return np.flatnonzero(never), by_dominance, lp_solved
+
+
+@timed()
+def remove_never_best_responses(matrix1, matrix2=None, row_labels=None, col_labels=None,
+                                tol=TOLERANCE, max_rounds=None, progress=None):
+    # Поочерёдно удаляет НЛО-стратегии обоих игроков до неподвижной точки.
+    # Если matrix2 не задана, игра антагонистическая (matrix2 = -matrix1).
+    if matrix2 is None:
+        matrix2 = -np.asarray(matrix1, dtype=float)
+    matrix1, matrix2 = as_bimatrix(matrix1, matrix2)
+    rows, cols = matrix1.shape
+    row_labels = list(range(rows)) if row_labels is None else list(row_labels)
+    col_labels = list(range(cols)) if col_labels is None else list(col_labels)
+    if len(row_labels) != rows or len(col_labels) != cols:
+        raise ValueError("Число меток не совпадает с размерами матрицы")
+
+    alive = {ROW: np.arange(rows), COLUMN: np.arange(cols)}
+    labels = {ROW: row_labels, COLUMN: col_labels}
+    steps = []
+    lp_solved = 0
+    rounds = 0
+    while max_rounds is None or rounds < max_rounds:
+        changed = False
+        for player in (ROW, COLUMN):
+            if player == ROW:
+                payoff = matrix1[np.ix_(alive[ROW], alive[COLUMN])]
+            else:
+                payoff = matrix2[np.ix_(alive[ROW], alive[COLUMN])].T
+            # Свидетели зависят от набора стратегий соперника, поэтому живут в пределах шага
+            never, by_dominance, solved = find_never_best_responses(payoff, tol=tol, progress=progress)
+            lp_solved += solved
+            if never.size == 0:
+                continue
+            removed = alive[player][never]
+            alive[player] = np.delete(alive[player], never)
+            steps.append(NbrStep(player=player, removed=[labels[player][i] for i in removed],
+                                 by_dominance=by_dominance))
+            changed = True
+        if not changed:
+            break
+        rounds += 1
+
+    row_index, col_index = alive[ROW], alive[COLUMN]
+    reduced = (matrix1[np.ix_(row_index, col_index)], matrix2[np.ix_(row_index, col_index)])
+    return NbrResult(matrices=reduced, row_index=row_index, col_index=col_index,
+                     row_labels=[row_labels[i] for i in row_index],
+                     col_labels=[col_labels[j] for j in col_index],
+                     steps=steps, rounds=rounds, lp_solved=lp_solved)
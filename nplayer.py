@@ -0,0 +1,189 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+from game_engine import NashResult, NASH_BLOCK_ELEMENTS
+from dominance import EliminationStep, PairwiseCounts
+from instrumentation import timed
+
+
+# ---------------------------
+# Игры N лиц в нормальной форме
+# ---------------------------
+# Выигрыши хранятся одним массивом payoffs формы (N, s_1, ..., s_N):
+# payoffs[p][a_1, ..., a_N] — выигрыш игрока p в профиле (a_1, ..., a_N),
+# ось p + 1 массива (ось p матрицы payoffs[p]) — стратегии игрока p.
+# Для N = 2 это тот же массив (2, rows, cols), что и у биматричных игр.
+# Игроки и стратегии в результатах нумеруются с 0.
+#
+# Равновесия в чистых стратегиях: профиль — равновесие, если каждый игрок p
+# получает в нём максимум вдоль своей оси (лучший ответ). Маски лучших ответов
+# строятся векторно и пересекаются поблочно по стратегиям игрока 0:
+# максимумы игрока 0 по его оси считаются заранее одним проходом, для остальных
+# игроков вся ось лежит внутри блока. Если одна стратегия игрока 0 больше блока,
+# блоки режутся и по стратегиям игрока 1, и его максимумы тоже считаются заранее.
+# Память блока — не больше block_elements, без циклов на Python по профилям,
+# поэтому десятки миллионов профилей обрабатываются за секунды.
+#
+# Итеративное удаление доминируемых стратегий: стратегии игрока p — строки матрицы
+# (s_p x произведение остальных s_q), счётчики попарных сравнений (dominance.PairwiseCounts)
+# строятся один раз, а удаление стратегий соперника вычитает вклад его гиперплоскости.
+
+
+@dataclass
+class NPlayerDominanceResult:
+    strict: bool
+    payoffs: np.ndarray                           # выигрыши после удаления (N, s'_1, ..., s'_N)
+    indices: list                                 # по игроку: исходные индексы сохранившихся стратегий
+    steps: list = field(default_factory=list)     # EliminationStep, player — номер игрока
+    rounds: int = 0                               # раундов, удаливших хотя бы одну стратегию
+
+    @property
+    def changed(self):
+        return bool(self.steps)
+
+
+def as_payoff_tensor(data):
+    # Тип выигрышей сохраняется: все проверки здесь — сравнения
+    payoffs = np.asarray(data)
+    if payoffs.dtype.kind not in "iuf":
+        payoffs = payoffs.astype(float)
+    if payoffs.ndim < 3 or payoffs.shape[0] != payoffs.ndim - 1:
+        raise ValueError(f"Выигрыши игры N лиц должны иметь форму (N, s_1, ..., s_N), получено {payoffs.shape}")
+    strategies = payoffs.shape[1:]
+    if min(strategies) < 1:
+        raise ValueError("Число стратегий каждого игрока должно быть положительным!")
+    if max(strategies) < 2:
+        raise ValueError("Хотя бы у одного игрока должно быть не меньше двух стратегий")
+    return payoffs
+
+
+def _check_player(payoffs, player):
+    if not 0 <= player < payoffs.shape[0]:
+        raise ValueError(f"Нет игрока {player} (игроки 0..{payoffs.shape[0] - 1})")
+
+
+def profiles(payoffs):
+    # Число профилей стратегий
+    return int(np.prod(payoffs.shape[1:], dtype=np.int64))
+
+
+# ---------------------------
+# Равновесия Нэша в чистых стратегиях
+# ---------------------------
+def _block_shape(payoffs, block_elements):
+    # Блок — (стратегий игрока 0, стратегий игрока 1) со всеми стратегиями остальных:
+    # N * block0 * block1 * s_3 * ... * s_N элементов не больше block_elements.
+    # Если не помещается даже одна стратегия игрока 0, блок режется и по оси игрока 1.
+    players, first, second = payoffs.shape[:3]
+    per_pair = players * profiles(payoffs) // (first * second)
+    if per_pair > block_elements:
+        raise ValueError(f"Блок в {block_elements} элементов меньше одной пары стратегий игроков 1 и 2 "
+                         f"({per_pair} элементов); увеличьте block_elements")
+    per_strategy = per_pair * second
+    if per_strategy <= block_elements:
+        return min(first, block_elements // per_strategy), second
+    return 1, block_elements // per_pair
+
+
+def best_response_mask(payoffs, player):
+    # Маска профилей, где стратегия игрока — лучший ответ на стратегии остальных
+    payoffs = as_payoff_tensor(payoffs)
+    _check_player(payoffs, player)
+    own = payoffs[player]
+    return own >= own.max(axis=player, keepdims=True)
+
+
+def iter_pure_nash(payoffs, block_elements=NASH_BLOCK_ELEMENTS, progress=None):
+    # Генератор равновесий: кортежи (a_1, ..., a_N) в лексикографическом порядке
+    payoffs = as_payoff_tensor(payoffs)
+    players, first, second = payoffs.shape[:3]
+    block0, block1 = _block_shape(payoffs, block_elements)
+    # Максимумы игрока 0 по его оси — бегущий максимум по блокам
+    best0 = payoffs[0, :block0].max(axis=0)
+    for start in range(block0, first, block0):
+        np.maximum(best0, payoffs[0, start:start + block0].max(axis=0), out=best0)
+    # Если ось игрока 1 режется на части, его максимумы тоже считаются заранее
+    best1 = payoffs[1].max(axis=1) if block1 < second else None
+    for start0 in range(0, first, block0):
+        stop0 = min(start0 + block0, first)
+        for start1 in range(0, second, block1):
+            stop1 = min(start1 + block1, second)
+            chunk = payoffs[:, start0:stop0, start1:stop1]
+            mask = chunk[0] >= best0[start1:stop1]
+            if best1 is None:
+                mask &= chunk[1] >= chunk[1].max(axis=1, keepdims=True)
+            else:
+                mask &= chunk[1] >= best1[start0:stop0, np.newaxis]
+            for p in range(2, players):
+                mask &= chunk[p] >= chunk[p].max(axis=p, keepdims=True)
+            found = np.argwhere(mask)
+            found[:, 0] += start0
+            found[:, 1] += start1
+            for profile in found:
+                yield tuple(int(a) for a in profile)
+        if progress is not None:
+            progress(stop0 / first, f"Стратегий игрока 1 обработано: {stop0} из {first}")
+
+
+@timed()
+def pure_nash_equilibria(payoffs, block_elements=NASH_BLOCK_ELEMENTS, progress=None):
+    return NashResult(equilibria=list(iter_pure_nash(payoffs, block_elements, progress)))
+
+
+# ---------------------------
+# Доминирование стратегий
+# ---------------------------
+def strategy_matrix(payoffs, player):
+    # Стратегии игрока — строки, столбцы — профили остальных игроков (в порядке осей)
+    own = payoffs[player]
+    return np.moveaxis(own, player, 0).reshape(own.shape[player], -1)
+
+
+def dominance_pairs(payoffs, player, strict=True):
+    # Пары (i, k): стратегия i игрока доминируется стратегией k
+    payoffs = as_payoff_tensor(payoffs)
+    _check_player(payoffs, player)
+    counts = PairwiseCounts(strategy_matrix(payoffs, player))
+    return [(int(i), int(k)) for i, k in zip(*np.nonzero(counts.dominance_matrix(strict)))]
+
+
+@timed()
+def iterated_elimination(payoffs, strict=True, max_rounds=None, progress=None):
+    # Поочерёдно удаляет доминируемые стратегии игроков 0, 1, ..., N-1 до неподвижной точки.
+    # progress(None, сообщение) вызывается после каждого раунда с удалениями.
+    payoffs = as_payoff_tensor(payoffs)
+    players = payoffs.shape[0]
+    shape = payoffs.shape[1:]
+    counts = [PairwiseCounts(strategy_matrix(payoffs, p)) for p in range(players)]
+    # Для каждого игрока — ещё не вычтенные координаты (профили остальных игроков)
+    live = [np.ones(shape[:p] + shape[p + 1:], dtype=bool) for p in range(players)]
+    steps = []
+    rounds = 0
+    while max_rounds is None or rounds < max_rounds:
+        changed = False
+        for p in range(players):
+            removed, dominators = counts[p].find_dominated(strict)
+            if removed.size == 0:
+                continue
+            counts[p].remove(removed)
+            for q in range(players):
+                if q == p:
+                    continue
+                # Координаты игрока q, где игрок p выбирает удалённую стратегию
+                hit = np.zeros_like(live[q])
+                np.moveaxis(hit, p if p < q else p - 1, 0)[removed] = True
+                hit &= live[q]
+                live[q] &= ~hit
+                counts[q].drop_coordinates(np.flatnonzero(hit))
+            steps.append(EliminationStep(player=p, removed=removed.tolist(), dominators=dominators.tolist()))
+            changed = True
+        if not changed:
+            break
+        rounds += 1
+        if progress is not None:
+            remaining = "x".join(str(int(c.alive.sum())) for c in counts)
+            progress(None, f"Раунд {rounds}: осталось {remaining}")
+
+    indices = [np.flatnonzero(c.alive) for c in counts]
+    reduced = payoffs[np.ix_(np.arange(players), *indices)]
+    return NPlayerDominanceResult(strict=strict, payoffs=reduced, indices=indices, steps=steps, rounds=rounds)
@@ -0,0 +1,172 @@
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from game_engine import MaximinResult, NashResult, negated
+from instrumentation import timed
+
+
+# ---------------------------
+# Анализ игр больше оперативной памяти
+# ---------------------------
+# Матрицы читаются последовательными блоками строк фиксированного объёма
+# (block_bytes) из np.memmap (game_io.load_game для .npy открывает файл именно так)
+# или любого массива, поддерживающего срезы строк. В памяти одновременно находятся
+# не больше двух блоков и векторы длины rows / cols.
+# Следующий блок читается фоновым потоком, пока обрабатывается текущий: копирование
+# из отображения отпускает GIL, поэтому чтение с диска перекрывается с вычислениями.
+# Для memmap ядру сообщается о последовательном доступе (MADV_SEQUENTIAL).
+#
+# Результаты совпадают с game_engine.maximin_minimax и pure_nash_equilibria.
+# matrix2=None означает антагонистическую игру: блоки -A считаются на лету.
+
+BLOCK_BYTES = 64 * 2 ** 20
+
+
+def block_rows(cols, itemsize=8, block_bytes=BLOCK_BYTES):
+    return max(1, block_bytes // max(1, cols * itemsize))
+
+
+def _advise_sequential(array):
+    # np.memmap хранит объект mmap в _mmap; у видов на memmap — у базового массива
+    base = array
+    while base is not None:
+        handle = getattr(base, "_mmap", None)
+        if handle is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+            try:
+                handle.madvise(mmap.MADV_SEQUENTIAL)
+            except (OSError, ValueError):
+                pass
+            return
+        base = getattr(base, "base", None)
+
+
+def _check_shapes(matrix1, matrix2):
+    if len(matrix1.shape) != 2:
+        raise ValueError("Матрица выигрышей должна быть двумерной")
+    rows, cols = matrix1.shape
+    if rows < 1 or cols < 1:
+        raise ValueError("Размеры матрицы должны быть положительными!")
+    if rows == 1 and cols == 1:
+        raise ValueError("Недопустимая размерность матрицы. Допустимые размеры: 1x2, 2x1 или NxN, где N >= 2")
+    if matrix2 is not None and tuple(matrix2.shape) != tuple(matrix1.shape):
+        raise ValueError("Матрицы выигрышей игроков должны иметь одинаковый размер")
+    return rows, cols
+
+
+def iter_blocks(*matrices, rows_per_block=None, block_bytes=BLOCK_BYTES, prefetch=True):
+    # Выдаёт (start, stop, блоки) — копии строк [start, stop) всех матриц в памяти
+    # в типе файла: узкие целые читаются и сравниваются без перевода в float
+    rows, cols = matrices[0].shape
+    if rows_per_block is None:
+        rows_per_block = block_rows(cols, sum(m.dtype.itemsize for m in matrices), block_bytes)
+    for matrix in matrices:
+        _advise_sequential(matrix)
+
+    def read(start):
+        stop = min(start + rows_per_block, rows)
+        return start, stop, [np.array(m[start:stop]) for m in matrices]
+
+    starts = range(0, rows, rows_per_block)
+    if not prefetch or len(starts) == 1:
+        for start in starts:
+            yield read(start)
+        return
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = reader.submit(read, starts[0])
+        for start in starts[1:]:
+            current = pending.result()
+            pending = reader.submit(read, start)
+            yield current
+        yield pending.result()
+
+
+def _report(progress, stop, rows, passes=1, current=1):
+    if progress is not None:
+        done = ((current - 1) * rows + stop) / (passes * rows)
+        progress(done, f"Проход {current} из {passes}: строк {stop} из {rows}")
+
+
+def _running(ufunc, accumulated, value):
+    # Бегущий минимум / максимум по блокам; первый блок задаёт начальное значение
+    if accumulated is None:
+        return value
+    return ufunc(accumulated, value, out=accumulated)
+
+
+def row_min_col_max(matrix, block_bytes=BLOCK_BYTES, progress=None, transpose=False):
+    # Минимумы строк и максимумы столбцов за один проход.
+    # transpose=True — то же для matrix.T (минимумы столбцов и максимумы строк),
+    # не транспонируя файл: нужно для игрока по столбцам в биматричной игре.
+    rows, cols = _check_shapes(matrix, None)
+    # Накопители в типе файла и с первого блока (а не с ±inf): целые остаются точными целыми
+    row_minima = np.empty(rows, dtype=matrix.dtype) if not transpose else None
+    col_maxima = None if not transpose else np.empty(rows, dtype=matrix.dtype)
+    for start, stop, (block,) in iter_blocks(matrix, block_bytes=block_bytes):
+        if transpose:
+            row_minima = _running(np.minimum, row_minima, block.min(axis=0))
+            col_maxima[start:stop] = block.max(axis=1)
+        else:
+            row_minima[start:stop] = block.min(axis=1)
+            col_maxima = _running(np.maximum, col_maxima, block.max(axis=0))
+        _report(progress, stop, rows)
+    return row_minima, col_maxima
+
+
+@timed()
+def maximin_minimax(matrix, block_bytes=BLOCK_BYTES, progress=None, transpose=False):
+    # Потоковый аналог game_engine.maximin_minimax (для matrix.T при transpose=True)
+    row_minima, col_maxima = row_min_col_max(matrix, block_bytes, progress, transpose)
+    maximin_row = int(np.argmax(row_minima))
+    minimax_col = int(np.argmin(col_maxima))
+    maximin = row_minima[maximin_row].item()
+    minimax = col_maxima[minimax_col].item()
+    return MaximinResult(maximin=maximin, maximin_row=maximin_row,
+                         minimax=minimax, minimax_col=minimax_col,
+                         saddle=(maximin == minimax),
+                         row_minima=row_minima, col_maxima=col_maxima)
+
+
+def iter_saddle_points(matrix, result=None, block_bytes=BLOCK_BYTES, progress=None):
+    # Все седловые точки: A[i, j] — минимум строки i и максимум столбца j.
+    # Если result (MaximinResult) не передан, сначала выполняется проход maximin_minimax.
+    if result is None:
+        result = maximin_minimax(matrix, block_bytes)
+    if not result.saddle:
+        return
+    rows = len(result.row_minima)
+    value = result.maximin
+    # Кандидаты — строки и столбцы, где минимум / максимум равен цене игры
+    row_ok = result.row_minima == value
+    col_ok = result.col_maxima == value
+    for start, stop, (block,) in iter_blocks(matrix, block_bytes=block_bytes):
+        if row_ok[start:stop].any():
+            mask = (block == value) & row_ok[start:stop, None] & col_ok[None, :]
+            for i, j in zip(*np.nonzero(mask)):
+                yield int(i) + start, int(j)
+        _report(progress, stop, rows)
+
+
+def iter_pure_nash(matrix1, matrix2=None, block_bytes=BLOCK_BYTES, progress=None):
+    # Потоковый аналог game_engine.iter_pure_nash: проход 1 — максимумы столбцов A,
+    # проход 2 — маски лучших ответов по блокам строк A и B
+    rows, cols = _check_shapes(matrix1, matrix2)
+    col_maxima = None
+    for start, stop, (block,) in iter_blocks(matrix1, block_bytes=block_bytes):
+        col_maxima = _running(np.maximum, col_maxima, block.max(axis=0))
+        _report(progress, stop, rows, 2, 1)
+    matrices = (matrix1,) if matrix2 is None else (matrix1, matrix2)
+    for start, stop, blocks in iter_blocks(*matrices, block_bytes=block_bytes):
+        block1 = blocks[0]
+        block2 = negated(block1) if matrix2 is None else blocks[1]
+        mask = block1 >= col_maxima
+        mask &= block2 >= np.max(block2, axis=1, keepdims=True)
+        for i, j in zip(*np.nonzero(mask)):
+            yield int(i) + start, int(j)
+        _report(progress, stop, rows, 2, 2)
+
+
+@timed()
+def pure_nash_equilibria(matrix1, matrix2=None, block_bytes=BLOCK_BYTES, progress=None):
+    return NashResult(equilibria=list(iter_pure_nash(matrix1, matrix2, block_bytes, progress)))
@@ -0,0 +1,284 @@
+import dataclasses
+import hashlib
+import importlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# ---------------------------
+# Кэш результатов анализа
+# ---------------------------
+# Ключ — хэш BLAKE2b от имени анализа, байтов, формы и dtype каждого массива
+# выигрышей и остальных параметров, поэтому одинаковые игры совпадают по ключу
+# независимо от того, откуда загружены. Соль хэша — CACHE_VERSION: после смены
+# формата записи или полей результатов старые записи просто не находятся.
+#
+# Запись — архив .npz без pickle: структура результата в JSON, массивы отдельными
+# элементами архива, чтение через np.load(allow_pickle=False). Из файла
+# восстанавливаются только числа, строки, списки, кортежи, словари, массивы
+# и dataclass-результаты модулей из RECORD_MODULES, поэтому подложенный в каталог
+# кэша файл не может выполнить код. Результат других типов не кэшируется.
+#
+# Два уровня:
+#   память — LRU с ограничением по суммарному размеру (результаты хранятся
+#            сериализованными, каждый get возвращает новую копию);
+#   диск   — необязательный каталог: файл на ключ, запись через временный файл
+#            и os.replace, поэтому каталог могут одновременно использовать GUI
+#            и рабочие процессы пакетного режима. Переживает перезапуск.
+# Каталог по умолчанию задаётся переменной окружения GAME_CACHE_DIR.
+
+CACHE_DIR_ENV = "GAME_CACHE_DIR"
+CACHE_VERSION = 3
+RECORD_MODULES = {"game_engine", "dominance", "never_best_response", "zerosum", "mixed_nash",
+                  "correlated", "nplayer", "dynamics"}
+SUFFIX = ".npz"
+MISSING = object()
+
+
+def _update(digest, value):
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f"ndarray{value.shape}{value.dtype.str}".encode())
+        digest.update(memoryview(value).cast("B"))
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}{len(value)}(".encode())
+        for item in value:
+            _update(digest, item)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        digest.update(b"dict(")
+        for name in sorted(value):
+            digest.update(f"{name}=".encode())
+            _update(digest, value[name])
+        digest.update(b")")
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b";")
+
+
+def analysis_name(fn):
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def make_key(analysis, *args, **params):
+    # analysis — имя анализа (строка); args и params могут содержать массивы и кортежи массивов
+    digest = hashlib.blake2b(digest_size=20, salt=f"v{CACHE_VERSION}".encode())
+    _update(digest, analysis)
+    _update(digest, args)
+    _update(digest, params)
+    return digest.hexdigest()
+
+
+# ---------------------------
+# Сериализация записей
+# ---------------------------
+def _encode(value, arrays):
+    # Структура результата для JSON; массивы и скаляры numpy уходят в arrays
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (np.ndarray, np.generic)):
+        if value.dtype.hasobject:
+            raise TypeError("Объектные массивы не поддерживаются кэшем")
+        arrays.append(np.asarray(value))
+        kind = "array" if isinstance(value, np.ndarray) else "scalar"
+        return {kind: len(arrays) - 1}
+    if isinstance(value, list):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(item, arrays) for item in value]}
+    if isinstance(value, dict):
+        return {"dict": [[_encode(k, arrays), _encode(v, arrays)] for k, v in value.items()]}
+    cls = type(value)
+    if dataclasses.is_dataclass(value) and cls.__module__ in RECORD_MODULES:
+        fields = {f.name: _encode(getattr(value, f.name), arrays) for f in dataclasses.fields(value)}
+        return {"dataclass": [cls.__module__, cls.__qualname__], "fields": fields}
+    raise TypeError(f"Тип {cls.__name__} не поддерживается кэшем")
+
+
+def _decode(node, archive):
+    if not isinstance(node, (list, dict)):
+        return node
+    if isinstance(node, list):
+        return [_decode(item, archive) for item in node]
+    if "array" in node:
+        return archive[f"a{node['array']}"]
+    if "scalar" in node:
+        return archive[f"a{node['scalar']}"][()]
+    if "tuple" in node:
+        return tuple(_decode(item, archive) for item in node["tuple"])
+    if "dict" in node:
+        return {_decode(k, archive): _decode(v, archive) for k, v in node["dict"]}
+    module, name = node["dataclass"]
+    if module not in RECORD_MODULES:
+        raise ValueError(f"Модуль {module} не разрешён для записей кэша")
+    cls = getattr(importlib.import_module(module), name)
+    if not (isinstance(cls, type) and dataclasses.is_dataclass(cls)):
+        raise ValueError(f"{module}.{name} не является результатом анализа")
+    return cls(**{k: _decode(v, archive) for k, v in node["fields"].items()})
+
+
+def dumps(value):
+    arrays = []
+    tree = json.dumps(_encode(value, arrays))
+    buffer = io.BytesIO()
+    np.savez(buffer, record=np.frombuffer(tree.encode(), dtype=np.uint8),
+             **{f"a{k}": array for k, array in enumerate(arrays)})
+    return buffer.getvalue()
+
+
+def loads(data):
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        return _decode(json.loads(archive["record"].tobytes()), archive)
+
+
+class ResultCache:
+    def __init__(self, max_bytes=64 * 2 ** 20, directory=None, disk_max_bytes=1 * 2 ** 30):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self.entries = OrderedDict()              # ключ -> сериализованный результат
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_writes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    # --- Память ---
+    def _remember(self, key, data):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self.entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    # --- Диск ---
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + SUFFIX)
+
+    def _read_disk(self, key):
+        try:
+            with open(self._path(key), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            # Дисковый уровень необязателен: ошибка записи не мешает анализу
+            return
+        self.disk_writes += 1
+        if self.disk_writes % 100 == 0:
+            self.prune_disk()
+
+    def prune_disk(self):
+        # Удаляет самые давно использованные файлы, пока каталог не уложится в disk_max_bytes
+        if self.directory is None or self.disk_max_bytes is None:
+            return
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(SUFFIX):
+                    continue                      # временные файлы других процессов
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    # --- Интерфейс ---
+    def get(self, key, default=MISSING):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return loads(data)
+        if self.directory is not None:
+            data = self._read_disk(key)
+            if data is not None:
+                try:
+                    value = loads(data)
+                except Exception:
+                    # Повреждённый или несовместимый файл считается промахом
+                    value = MISSING
+                if value is not MISSING:
+                    try:
+                        # Время изменения служит отметкой последнего использования для prune_disk
+                        os.utime(self._path(key))
+                    except OSError:
+                        pass
+                    with self.lock:
+                        self._remember(key, data)
+                        self.disk_hits += 1
+                    return value
+        with self.lock:
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        try:
+            data = dumps(value)
+        except (TypeError, ValueError):
+            # Объектные массивы и типы вне RECORD_MODULES не кэшируются
+            return
+        with self.lock:
+            self._remember(key, data)
+        if self.directory is not None:
+            self._write_disk(key, data)
+
+    def call(self, fn, *args, **kwargs):
+        # Результат fn(*args, **kwargs) из кэша или с вычислением и запоминанием.
+        # Ключ строится по имени функции и аргументам; progress на результат
+        # не влияет и в ключ не входит.
+        params = {name: value for name, value in kwargs.items() if name != "progress"}
+        key = make_key(analysis_name(fn), *args, **params)
+        value = self.get(key)
+        if value is MISSING:
+            value = fn(*args, **kwargs)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    @property
+    def stats(self):
+        return {"entries": len(self.entries), "bytes": self.size, "hits": self.hits,
+                "disk_hits": self.disk_hits, "misses": self.misses}
+
+
+def default_cache(max_bytes=64 * 2 ** 20):
+    return ResultCache(max_bytes=max_bytes, directory=os.environ.get(CACHE_DIR_ENV) or None)
@@ -0,0 +1,160 @@
+import json
+import os
+import queue
+import threading
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+
+from instrumentation import timed
+
+
+# ---------------------------
+# Журнал результатов
+# ---------------------------
+# ResultLog принимает сообщения от вкладки и раз в flush_ms выводит накопившиеся
+# одной вставкой в tk.Text; метка времени вычисляется один раз на пачку.
+# В окне хранится не больше max_entries последних записей — старые удаляются,
+# поэтому длинная сессия не замедляет виджет.
+#
+# HistoryFile — журнал в файле только на дозапись: .jsonl (по объекту JSON на запись)
+# или текст. Записи складываются в очередь, а пишет их фоновый поток пачками;
+# при превышении max_bytes файл переименовывается в path.1 (path.1 -> path.2 и т.д.,
+# хранится backups старых файлов).
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class HistoryFile:
+    def __init__(self, path, max_bytes=10 * 2 ** 20, backups=5, flush_interval=1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.as_json = os.path.splitext(path)[1].lower() in (".jsonl", ".json")
+        self.records = queue.SimpleQueue()
+        self.closed = threading.Event()
+        self.error = None                         # последняя ошибка записи (поток не падает)
+        # Открытие файла сразу, чтобы ошибка пути была видна вызывающему
+        open(path, "a", encoding="utf-8").close()
+        self.thread = threading.Thread(target=self._run, name="history-file", daemon=True)
+        self.thread.start()
+
+    def write(self, record):
+        # record — словарь с полями time, source, message
+        self.records.put(record)
+
+    def format(self, record):
+        if self.as_json:
+            return json.dumps(record, ensure_ascii=False) + "\n"
+        text = record["message"] if record["message"].endswith("\n") else record["message"] + "\n"
+        source = f" {record['source']}" if record.get("source") else ""
+        return f"[{record['time']}]{source} {text}"
+
+    def _drain(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self.format(self.records.get_nowait()))
+            except queue.Empty:
+                return "".join(lines)
+
+    def _rotate(self):
+        for k in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{k}"):
+                os.replace(f"{self.path}.{k}", f"{self.path}.{k + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    @timed("output.history_file.flush")
+    def flush(self):
+        data = self._drain()
+        if not data:
+            return
+        try:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if size and size + len(data.encode("utf-8")) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(data)
+        except OSError as e:
+            self.error = e
+
+    def _run(self):
+        while not self.closed.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def close(self):
+        self.closed.set()
+        self.thread.join()
+
+
+class ResultLog:
+    def __init__(self, root, text, source=None, max_entries=500, flush_ms=100):
+        self.root = root
+        self.text = text
+        self.source = source
+        self.max_entries = max_entries
+        self.flush_ms = flush_ms
+        self.sink = None                          # HistoryFile или None
+        self.show_in_text = True
+        self.pending = []                         # (сообщение, в окно, в файл)
+        self.entry_lines = deque()                # число строк каждой записи в окне
+        self.scheduled = False
+
+    def append(self, message, to_text=None, to_file=None):
+        to_text = self.show_in_text if to_text is None else to_text
+        to_file = self.sink is not None if to_file is None else to_file and self.sink is not None
+        self.pending.append((message, to_text, to_file))
+        if not self.scheduled:
+            self.scheduled = True
+            self.root.after(self.flush_ms, self.flush)
+
+    @timed("render.result_log.flush")
+    def flush(self):
+        self.scheduled = False
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        if self.sink is not None and self.sink.error is not None:
+            # Ошибку фоновой записи показываем в окне вместе с очередной пачкой
+            error, self.sink.error = self.sink.error, None
+            pending.append((f"Ошибка записи журнала: {error}\n", True, False))
+        chunks = []
+        for message, to_text, to_file in pending:
+            if to_file:
+                self.sink.write({"time": timestamp, "source": self.source, "message": message})
+            if to_text:
+                entry = f"[{timestamp}] {message}"
+                if not entry.endswith("\n"):
+                    entry += "\n"
+                chunks.append(entry)
+                self.entry_lines.append(entry.count("\n"))
+        if not chunks:
+            return
+        self.text.insert(tk.END, "".join(chunks))
+        # Удаляем самые старые записи сверх лимита одним вызовом
+        excess = 0
+        while len(self.entry_lines) > self.max_entries:
+            excess += self.entry_lines.popleft()
+        if excess:
+            self.text.delete("1.0", f"{excess + 1}.0")
+        self.text.see(tk.END)
+
+    def open_file(self, path, **options):
+        self.close_file()
+        self.sink = HistoryFile(path, **options)
+
+    def close_file(self):
+        if self.sink is not None:
+            self.flush()
+            self.sink.close()
+            self.sink = None
+
+    def clear(self):
+        self.text.delete("1.0", tk.END)
+        self.entry_lines.clear()
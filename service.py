@@ -0,0 +1,363 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import batch
+import game_engine
+import instrumentation
+import result_cache
+
+
+# ---------------------------
+# Локальный HTTP/JSON-сервис анализа игр
+# ---------------------------
+# python service.py --port 8765 -j 4
+#
+#   POST /analyze  {"A": [[...]], "B": [[...]], "analyses": ["maximin", "nash"], "timeout": 5}
+#                  или {"games": [{"A": ...}, ...], "analyses": ..., "strict": true, ...}
+#                  (также просто JSON-массив игр). Ответ — запись в формате batch.analyze_game
+#                  или {"results": [...]}; ошибка в одной игре — поле "error" в её записи.
+#   GET  /health   — проверка готовности;  GET /stats — счётчики сервиса и профиль.
+#
+# Работает только на стандартной библиотеке и NumPy, внешние сервисы не нужны.
+#
+# Малые игры (не больше small_elements ячеек) попадают в общую очередь; поток-пакетировщик
+# ждёт до batch_window секунд, собирает до max_batch игр из разных запросов и
+# анализирует игры одного размера одним векторным вызовом (batch.analyze_game_batch).
+# Большие игры отправляются в пул процессов (batch.analyze_game с кэшем процесса).
+#
+# Обратное давление: очередь малых игр ограничена max_pending, число игр в пуле —
+# max_inflight; при переполнении запрос сразу получает 503 с Retry-After, а не ждёт.
+# Таймаут: запрос ждёт результаты не дольше timeout секунд (не больше max_timeout),
+# затем отвечает 504; ещё не начатые задачи отменяются, начатые в процессе дорабатывают,
+# и их результат отбрасывается.
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 2 ** 20
+SMALL_GAME_ELEMENTS = 10000
+
+
+class Overloaded(RuntimeError):
+    pass
+
+
+class RequestError(ValueError):
+    pass
+
+
+def _analyze_large(matrices, analyses, strict, max_equilibria, cache_dir):
+    # Выполняется в рабочем процессе
+    return batch.analyze_game(matrices, analyses, strict, max_equilibria, batch.worker_cache(cache_dir))
+
+
+class Batcher:
+    def __init__(self, window=0.005, max_batch=256, max_pending=10000, count=None):
+        self.window = window
+        self.max_batch = max_batch
+        self.items = queue.Queue(maxsize=max_pending)
+        self.count = count or (lambda name, value=1: None)
+        self.thread = threading.Thread(target=self._run, name="service-batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, matrices, options):
+        future = Future()
+        try:
+            self.items.put_nowait((matrices, options, future))
+        except queue.Full:
+            raise Overloaded("Очередь малых игр переполнена")
+        return future
+
+    def _collect(self):
+        first = self.items.get()
+        if first is None:
+            return None
+        collected = [first]
+        deadline = time.monotonic() + self.window
+        while len(collected) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.items.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.items.put(None)
+                break
+            collected.append(item)
+        return collected
+
+    def _run(self):
+        while True:
+            collected = self._collect()
+            if collected is None:
+                return
+            # Отменённые по таймауту игры не считаются
+            live = [item for item in collected if item[2].set_running_or_notify_cancel()]
+            groups = {}
+            for item in live:
+                matrices, options, _ = item
+                key = (len(matrices), matrices[0].shape, options)
+                groups.setdefault(key, []).append(item)
+            self.count("batches")
+            self.count("batched_games", len(live))
+            for (_, _, options), items in groups.items():
+                analyses, strict, max_equilibria = options
+                try:
+                    records = batch.analyze_game_batch([m for m, _, _ in items], analyses, strict, max_equilibria)
+                except Exception as e:
+                    for _, _, future in items:
+                        future.set_exception(e)
+                    continue
+                for (_, _, future), record in zip(items, records):
+                    future.set_result(record)
+
+    def close(self):
+        self.items.put(None)
+        self.thread.join()
+
+
+class GameService:
+    def __init__(self, workers=None, small_elements=SMALL_GAME_ELEMENTS, batch_window=0.005, max_batch=256,
+                 max_pending=10000, max_inflight=None, timeout=30.0, max_timeout=300.0, cache_dir=None):
+        self.small_elements = small_elements
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.cache_dir = cache_dir
+        self.stats = {"requests": 0, "games": 0, "batches": 0, "batched_games": 0, "pool_games": 0,
+                      "rejected": 0, "timeouts": 0, "errors": 0}
+        self.stats_lock = threading.Lock()
+        self.batcher = Batcher(batch_window, max_batch, max_pending, self.count)
+        workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.inflight = threading.BoundedSemaphore(max_inflight or 4 * workers)
+
+    def count(self, name, value=1):
+        with self.stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    # --- Разбор запроса ---
+    def parse_game(self, game):
+        if not isinstance(game, dict) or "A" not in game:
+            raise RequestError("Игра задаётся объектом {\"A\": [[...]], \"B\": [[...]]} (B — необязательно)")
+        try:
+            matrices = tuple(game_engine.compact(game_engine.as_payoff_matrix(game[name], None))
+                             for name in ("A", "B") if game.get(name) is not None)
+        except (TypeError, ValueError) as e:
+            raise RequestError(str(e))
+        if not all(np.isfinite(m).all() for m in matrices):
+            raise RequestError("Выигрыши должны быть конечными числами (без NaN и бесконечностей)")
+        if len(matrices) == 2 and matrices[0].shape != matrices[1].shape:
+            raise RequestError("Матрицы выигрышей игроков должны иметь одинаковый размер")
+        return matrices
+
+    def parse_options(self, body):
+        analyses = body.get("analyses", batch.ANALYSES)
+        if isinstance(analyses, str):
+            analyses = [a.strip() for a in analyses.split(",") if a.strip()]
+        if not isinstance(analyses, (list, tuple)) or not all(isinstance(a, str) for a in analyses):
+            raise RequestError("analyses задаётся массивом имён анализов или строкой через запятую")
+        unknown = set(analyses) - set(batch.ANALYSES)
+        if unknown:
+            raise RequestError(f"Неизвестные анализы: {', '.join(sorted(unknown))}")
+        strict = body.get("strict", True)
+        if not isinstance(strict, bool):
+            raise RequestError("strict должен быть true или false")
+        try:
+            timeout = min(float(body.get("timeout", self.timeout)), self.max_timeout)
+            max_equilibria = int(body.get("max_equilibria", batch.MAX_EQUILIBRIA))
+        except (TypeError, ValueError, OverflowError):
+            raise RequestError("timeout и max_equilibria должны быть числами")
+        if not timeout > 0:
+            raise RequestError("timeout должен быть положительным")
+        if max_equilibria < 0:
+            raise RequestError("max_equilibria не может быть отрицательным")
+        return (tuple(a for a in batch.ANALYSES if a in analyses), strict, max_equilibria), timeout
+
+    # --- Выполнение ---
+    def submit(self, matrices, options):
+        if matrices[0].size <= self.small_elements:
+            return self.batcher.submit(matrices, options)
+        if not self.inflight.acquire(blocking=False):
+            raise Overloaded("Пул процессов занят")
+        self.count("pool_games")
+        try:
+            future = self.pool.submit(_analyze_large, matrices, *options, self.cache_dir)
+        except Exception:
+            self.inflight.release()
+            raise
+        future.add_done_callback(lambda f: self.inflight.release())
+        return future
+
+    def analyze(self, body):
+        # Возвращает (HTTP-код, объект ответа)
+        self.count("requests")
+        if isinstance(body, list):
+            body = {"games": body}
+        if not isinstance(body, dict):
+            raise RequestError("Ожидался JSON-объект или массив игр")
+        single = "games" not in body
+        games = [body] if single else body["games"]
+        if not isinstance(games, list) or not games:
+            raise RequestError("Поле games должно быть непустым массивом")
+        options, timeout = self.parse_options(body)
+        deadline = time.monotonic() + timeout
+        futures = []
+        records = [None] * len(games)
+        try:
+            for k, game in enumerate(games):
+                try:
+                    futures.append((k, self.submit(self.parse_game(game), options)))
+                except RequestError as e:
+                    if single:
+                        raise
+                    records[k] = {"error": str(e)}
+        except Overloaded:
+            for _, future in futures:
+                future.cancel()
+            self.count("rejected")
+            raise
+        self.count("games", len(futures))
+        done, pending = wait([f for _, f in futures], timeout=max(0.0, deadline - time.monotonic()))
+        if pending:
+            for future in pending:
+                future.cancel()
+            self.count("timeouts")
+            return 504, {"error": f"Превышено время ожидания ({timeout:g} с)"}
+        for k, future in futures:
+            try:
+                records[k] = future.result()
+            except Exception as e:
+                self.count("errors")
+                records[k] = {"error": f"{type(e).__name__}: {e}"}
+        if single:
+            record = records[0]
+            return (500 if "error" in record else 200), record
+        return 200, {"results": records}
+
+    def status(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats["queued"] = self.batcher.items.qsize()
+        return {"service": stats,
+                "profile": instrumentation.PROFILER.summary() if instrumentation.PROFILER.enabled else None}
+
+    def close(self):
+        self.batcher.close()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "GameService/1.0"
+    service = None                                # GameService, задаётся в make_server
+    quiet = False
+
+    def send_json(self, code, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self.send_json(200, self.service.status())
+        else:
+            self.send_json(404, {"error": f"Нет ресурса {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self.send_json(404, {"error": f"Нет ресурса {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {"error": "Некорректный Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.send_json(413, {"error": f"Тело запроса больше {MAX_BODY_BYTES} байт"})
+            return
+        with instrumentation.stage("parse.service.request"):
+            try:
+                body = json.loads(self.rfile.read(length) or b"null")
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                self.send_json(400, {"error": f"Некорректный JSON: {e}"})
+                return
+        try:
+            with instrumentation.stage("job.service.analyze"):
+                code, payload = self.service.analyze(body)
+        except RequestError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except Overloaded as e:
+            self.send_json(503, {"error": str(e)}, headers={"Retry-After": "1"})
+            return
+        with instrumentation.stage("output.service.response"):
+            self.send_json(code, payload)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT, quiet=False):
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Локальный HTTP/JSON-сервис анализа матричных и биматричных игр")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес (по умолчанию только локальные подключения)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="процессов для больших игр")
+    parser.add_argument("--small-elements", type=int, default=SMALL_GAME_ELEMENTS,
+                        help="игры не больше стольких ячеек пакетируются в главном процессе")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="сколько ждать игры для пакета, мс")
+    parser.add_argument("--max-batch", type=int, default=256, help="игр в одном пакете")
+    parser.add_argument("--max-pending", type=int, default=10000, help="предел очереди малых игр")
+    parser.add_argument("--max-inflight", type=int, default=None, help="предел больших игр в пуле (по умолчанию 4 на процесс)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="таймаут запроса по умолчанию, с")
+    parser.add_argument("--max-timeout", type=float, default=300.0, help="наибольший таймаут, который может задать запрос, с")
+    parser.add_argument("--cache-dir", default=os.environ.get(result_cache.CACHE_DIR_ENV) or None,
+                        help=f"каталог дискового кэша результатов (по умолчанию ${result_cache.CACHE_DIR_ENV})")
+    parser.add_argument("--quiet", action="store_true", help="не писать журнал запросов")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    service = GameService(workers=args.workers, small_elements=args.small_elements,
+                          batch_window=args.batch_window_ms / 1000, max_batch=args.max_batch,
+                          max_pending=args.max_pending, max_inflight=args.max_inflight, timeout=args.timeout,
+                          max_timeout=args.max_timeout, cache_dir=args.cache_dir)
+    server = make_server(service, args.host, args.port, args.quiet)
+    print(f"Сервис слушает http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+from itertools import product
+
+import numpy as np
+
+
+# ---------------------------
+# Прямолинейные реализации для сравнения с оптимизированными путями
+# ---------------------------
+def random_game(rng, rows, cols, kind):
+    # kind: "normal" — общего положения, "degenerate" — много равных выигрышей
+    if kind == "degenerate":
+        return rng.integers(0, 2, size=(rows, cols)), rng.integers(0, 2, size=(rows, cols))
+    return rng.normal(size=(rows, cols)), rng.normal(size=(rows, cols))
+
+
+def dominated_pairs(strategies, strict=True):
+    # strategies — список стратегий (списков выигрышей); пары (i, k): i доминируется k
+    pairs = []
+    for i, a in enumerate(strategies):
+        for k, b in enumerate(strategies):
+            if i == k:
+                continue
+            if strict:
+                dominated = all(x < y for x, y in zip(a, b))
+            else:
+                dominated = all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+            if dominated:
+                pairs.append((i, k))
+    return pairs
+
+
+def iterated_elimination(matrix1, matrix2, strict=True):
+    # Поочерёдно удаляет все доминируемые стратегии строк, затем столбцов
+    a, b = np.asarray(matrix1).tolist(), np.asarray(matrix2).tolist()
+    rows, cols = list(range(len(a))), list(range(len(a[0])))
+    while True:
+        changed = False
+        removed = {i for i, _ in dominated_pairs([[a[r][c] for c in cols] for r in rows], strict)}
+        if removed:
+            rows = [r for k, r in enumerate(rows) if k not in removed]
+            changed = True
+        removed = {j for j, _ in dominated_pairs([[b[r][c] for r in rows] for c in cols], strict)}
+        if removed:
+            cols = [c for k, c in enumerate(cols) if k not in removed]
+            changed = True
+        if not changed:
+            return rows, cols
+
+
+def maximin_minimax(matrix):
+    a = np.asarray(matrix).tolist()
+    row_minima = [min(row) for row in a]
+    col_maxima = [max(column) for column in zip(*a)]
+    return max(row_minima), min(col_maxima)
+
+
+def saddle_points(matrix):
+    a = np.asarray(matrix).tolist()
+    return [(i, j) for i, row in enumerate(a) for j, value in enumerate(row)
+            if value == min(row) and value == max(r[j] for r in a)]
+
+
+def pure_nash(matrix1, matrix2):
+    a, b = np.asarray(matrix1).tolist(), np.asarray(matrix2).tolist()
+    return [(i, j) for i in range(len(a)) for j in range(len(a[0]))
+            if a[i][j] == max(r[j] for r in a) and b[i][j] == max(b[i])]
+
+
+def nplayer_pure_nash(payoffs):
+    players, shape = payoffs.shape[0], payoffs.shape[1:]
+    found = []
+    for profile in product(*map(range, shape)):
+        best = True
+        for p in range(players):
+            for s in range(shape[p]):
+                other = profile[:p] + (s,) + profile[p + 1:]
+                if payoffs[(p,) + other] > payoffs[(p,) + profile]:
+                    best = False
+        if best:
+            found.append(profile)
+    return found
+
+
+def nplayer_iterated_elimination(payoffs, strict=True):
+    # Поочерёдно удаляет доминируемые стратегии игроков 0, 1, ..., N-1
+    players, shape = payoffs.shape[0], payoffs.shape[1:]
+    alive = [list(range(s)) for s in shape]
+    while True:
+        changed = False
+        for p in range(players):
+            others = list(product(*[alive[q] for q in range(players) if q != p]))
+            strategies = [[payoffs[(p,) + rest[:p] + (s,) + rest[p:]] for rest in others] for s in alive[p]]
+            removed = {i for i, _ in dominated_pairs(strategies, strict)}
+            if removed:
+                alive[p] = [s for k, s in enumerate(alive[p]) if k not in removed]
+                changed = True
+        if not changed:
+            return alive
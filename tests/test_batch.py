@@ -0,0 +1,75 @@
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+import batch
+import dominance
+import game_io
+import naive
+
+
+@pytest.mark.parametrize("strict", [True, False])
+def test_rounds_count_only_removing_rounds(strict):
+    # Седловая игра 2x2 сводится за один раунд; без доминирования раундов нет
+    assert dominance.iterated_elimination([[1, 2], [3, 4]], strict=strict).rounds == 1
+    assert dominance.iterated_elimination([[1, -1], [-1, 1]], strict=strict).rounds == 0
+    # rounds — наименьший max_rounds, дающий тот же результат, что и без ограничения
+    rng = np.random.default_rng(12)
+    rounds = []
+    for _ in range(30):
+        a, b = rng.integers(0, 4, size=(2, 4, 4))
+        full = dominance.iterated_elimination(a, b, strict=strict)
+        same = dominance.iterated_elimination(a, b, strict=strict, max_rounds=full.rounds)
+        assert same.row_index.tolist() == full.row_index.tolist() and same.steps == full.steps
+        rounds.append(full.rounds)
+        if full.rounds:
+            fewer = dominance.iterated_elimination(a, b, strict=strict, max_rounds=full.rounds - 1)
+            assert len(fewer.steps) < len(full.steps) and fewer.rounds == full.rounds - 1
+    assert max(rounds) >= 2
+
+
+def test_analyze_game_records():
+    record = batch.analyze_game((np.array([[1, 2], [3, 4]]),))
+    assert record["players"] == 1 and record["shape"] == [2, 2]
+    assert record["maximin"] == {"maximin": 3, "maximin_row": 1, "minimax": 3, "minimax_col": 0, "saddle": True}
+    assert record["dominance"] == {"strict": True, "rounds": 1, "rows": [1], "cols": [0], "shape": [1, 1]}
+    assert record["nash"] == {"count": 1, "equilibria": [[1, 0]], "truncated": False}
+    json.dumps(record)
+
+
+@pytest.mark.parametrize("players", [1, 2])
+def test_batch_matches_single_games(players):
+    rng = np.random.default_rng(11)
+    games = []
+    for _ in range(6):
+        a, b = naive.random_game(rng, 4, 3, "degenerate")
+        games.append((a, b)[:players])
+    records = batch.analyze_game_batch(games, max_equilibria=2)
+    assert records == [batch.analyze_game(game, max_equilibria=2) for game in games]
+
+
+def test_run_batch_writes_records_in_input_order(tmp_path):
+    paths = []
+    for k, ext in enumerate((".txt", ".csv", ".npy", ".npz")):
+        path = str(tmp_path / "games" / f"g{k}{ext}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        game_io.save_game(path, np.array([[k, 1], [2, 3]]), np.array([[3, 2], [1, k]]))
+        paths.append(path)
+    broken = str(tmp_path / "games" / "z_broken.txt")
+    with open(broken, "w") as file:
+        file.write("2 2\n1 2\n")
+    with open(str(tmp_path / "games" / "notes.md"), "w") as file:
+        file.write("не игра")
+    found = batch.expand_inputs([str(tmp_path / "games")])
+    assert found == paths + [broken]
+    assert batch.expand_inputs([str(tmp_path / "**" / "*.np?")]) == paths[2:]
+
+    out = io.StringIO()
+    assert batch.run_batch(found, out, analyses=("nash",), workers=1) == (5, 1)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["file"] for r in records] == found
+    assert all(r["players"] == 2 and "maximin" not in r for r in records[:4])
+    assert "error" in records[4]
@@ -0,0 +1,62 @@
+import json
+
+import benchmark
+
+
+def quick_run(names, **options):
+    return benchmark.run_cases("quick", names=names, max_size=10, min_time=0.0, **options)
+
+
+def test_run_cases_respects_limits():
+    lines = []
+    results = quick_run({"maximin_minimax", "support_enumeration"}, log=lines.append)
+    # support_enumeration ограничен 8x8, поэтому 10x10 пропускается
+    keys = {m.key for m in results}
+    assert "maximin_minimax/single/dense/10x10x1" in keys
+    assert "support_enumeration/single/degenerate/2x2x1" in keys
+    assert not any(key.startswith("support_enumeration") and "10x10" in key for key in keys)
+    assert all(m.error is None and m.seconds > 0 and m.repeats >= 1 for m in results)
+    assert len(lines) == len(results)
+
+
+def test_errors_are_recorded_not_raised(monkeypatch):
+    def broken(a, b):
+        raise RuntimeError("сбой")
+
+    monkeypatch.setattr(benchmark, "CASES", [benchmark.Case("broken", broken, 100)])
+    results = quick_run(None, inputs=("dense",))
+    assert [m.error for m in results] == ["RuntimeError: сбой"] * 2
+
+
+def test_report_and_compare(tmp_path):
+    results = quick_run({"maximin_minimax"}, inputs=("dense",))
+    path = str(tmp_path / "base.json")
+    benchmark.save_report(path, results, "quick")
+    with open(path, encoding="utf-8") as file:
+        report = json.load(file)
+    assert set(report["results"]) == {m.key for m in results} and report["preset"] == "quick"
+
+    slow, fast = results
+    slow.seconds = report["results"][slow.key]["seconds"] * 10 + 1.0
+    fast.seconds = report["results"][fast.key]["seconds"] * 10
+    lines, regressions = benchmark.compare(results, path, noise=1.0)
+    # Медленный случай — регрессия; второй замедлился, но быстрее порога шума
+    assert regressions == [slow.key] and "РЕГРЕССИЯ" in lines[0] and "РЕГРЕССИЯ" not in lines[1]
+    results.append(benchmark.Measurement("new", "single", "dense", 2, 2, 1, seconds=1.0))
+    assert benchmark.compare(results, path)[0][-1].endswith("нет данных для сравнения")
+
+
+def test_main_returns_1_on_regression(tmp_path, capsys):
+    base = str(tmp_path / "base.json")
+    # Случаи быстрее 0.1 мс не считаются регрессией — берётся игра 50x50
+    args = ["--cases", "iterated_strict", "--inputs", "degenerate", "--max-size", "50", "--min-time", "0"]
+    assert benchmark.main(args + ["-o", base]) == 0
+    with open(base, encoding="utf-8") as file:
+        report = json.load(file)
+    for record in report["results"].values():
+        record["seconds"] = 1e-12
+    with open(base, "w", encoding="utf-8") as file:
+        json.dump(report, file)
+    assert benchmark.main(args + ["--baseline", base]) == 1
+    assert "Регрессий" in capsys.readouterr().err
+
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+import correlated
+import naive
+
+pytest.importorskip("scipy")
+
+
+def dense_constraints(matrix1, matrix2):
+    # Все m(m-1) + n(n-1) ограничений стимулов плотной матрицей, переменная p[i, j] — i * n + j
+    rows, cols = matrix1.shape
+    constraints = []
+    for i in range(rows):
+        for k in range(rows):
+            if k != i:
+                row = np.zeros((rows, cols))
+                row[i] = matrix1[k] - matrix1[i]
+                constraints.append(row.ravel())
+    for j in range(cols):
+        for l in range(cols):
+            if l != j:
+                row = np.zeros((rows, cols))
+                row[:, j] = matrix2[:, l] - matrix2[:, j]
+                constraints.append(row.ravel())
+    return np.array(constraints)
+
+
+def reference_value(matrix1, matrix2, weights, maximize=True):
+    from scipy.optimize import linprog
+    g = dense_constraints(matrix1, matrix2)
+    sign = -1.0 if maximize else 1.0
+    res = linprog(sign * weights.ravel(), A_ub=g, b_ub=np.zeros(len(g)),
+                  A_eq=np.ones((1, matrix1.size)), b_eq=[1.0], method="highs")
+    assert res.status == 0
+    return sign * res.fun
+
+
+def test_constraint_matrix_matches_dense():
+    rng = np.random.default_rng(40)
+    for kind in ("normal", "degenerate"):
+        matrix1, matrix2 = naive.random_game(rng, 5, 5, kind)
+        g, labels = correlated.incentive_constraints(matrix1, matrix2, block_elements=7)
+        dense = dense_constraints(matrix1, matrix2)
+        # Метки -> номер строки плотной матрицы; пропущены только ограничения без положительных коэффициентов
+        index = [player * 20 + recommended * 4 + deviation - (deviation > recommended)
+                 for player, recommended, deviation in labels]
+        assert np.array_equal(g.toarray(), dense[index])
+        skipped = np.setdiff1d(np.arange(len(dense)), index)
+        assert (dense[skipped] <= 0).all()
+
+
+@pytest.fixture(params=["highs", "linprog"])
+def backend(request, monkeypatch):
+    # highs — модель HiGHS между раундами, linprog — задача собирается заново
+    if request.param == "linprog":
+        monkeypatch.setattr(correlated, "require_highs", lambda: None)
+    elif correlated.require_highs() is None:
+        pytest.skip("HiGHS недоступен")
+    return request.param
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate", "near_zero_sum"])
+def test_cuts_and_full_problem_match_reference(backend, kind):
+    rng = np.random.default_rng(41)
+    for trial in range(8):
+        size = int(rng.integers(2, 7))
+        matrix1, matrix2 = naive.random_game(rng, size, size, "degenerate" if kind == "degenerate" else "normal")
+        if kind == "near_zero_sum":
+            matrix2 = -matrix1 + 0.3 * matrix2
+        weights = rng.normal(size=matrix1.shape)
+        for objective, values in (("welfare", matrix1 + matrix2), ("row", matrix1), ("column", matrix2),
+                                  (weights, weights)):
+            for maximize in (True, False):
+                expected = reference_value(matrix1, matrix2, np.asarray(values, dtype=float), maximize)
+                # full_nonzeros=0 — только отсечения; по умолчанию малые игры переходят к полной задаче
+                for full_nonzeros in (0, correlated.FULL_NONZEROS):
+                    eq = correlated.correlated_equilibrium(matrix1, matrix2, objective, maximize,
+                                                           full_nonzeros=full_nonzeros)
+                    assert eq.objective == pytest.approx(expected, abs=1e-6)
+                    assert (eq.distribution * values).sum() == pytest.approx(expected, abs=1e-6)
+                    assert correlated.is_correlated_equilibrium(matrix1, matrix2, eq.distribution, tol=1e-6)
+
+
+def test_egalitarian(backend):
+    rng = np.random.default_rng(42)
+    matrix1, matrix2 = naive.random_game(rng, 4, 4, "normal")
+    cut = correlated.correlated_equilibrium(matrix1, matrix2, "egalitarian", full_nonzeros=0)
+    full = correlated.correlated_equilibrium(matrix1, matrix2, "egalitarian")
+    assert cut.objective == pytest.approx(full.objective, abs=1e-6)
+    assert cut.objective == pytest.approx(min(cut.row_payoff, cut.col_payoff), abs=1e-6)
+    # Не хуже лучшего по сумме равновесия для худшего игрока
+    welfare = correlated.correlated_equilibrium(matrix1, matrix2, "welfare")
+    assert cut.objective >= min(welfare.row_payoff, welfare.col_payoff) - 1e-6
+    with pytest.raises(ValueError):
+        correlated.correlated_equilibrium(matrix1, matrix2, "egalitarian", maximize=False)
+
+
+def test_cut_rounds_report_progress():
+    rng = np.random.default_rng(43)
+    matrix1 = rng.normal(size=(12, 12))
+    matrix2 = -matrix1 + 0.3 * rng.normal(size=(12, 12))
+    messages = []
+    eq = correlated.correlated_equilibrium(matrix1, matrix2, full_nonzeros=0,
+                                           progress=lambda done, message: messages.append(message))
+    assert eq.rounds == len(messages) and eq.rounds > 1
+    assert eq.constraints < 2 * 12 * 11
+    assert correlated.regret(matrix1, matrix2, eq.distribution) <= 1e-6
+
+
+def test_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        correlated.correlated_equilibrium([[1, 0], [0, 1]], [[1, 0], [0, 1]], method="simplex")
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+import game_engine
+import naive
+from dominance import DominanceGraph, PairwiseCounts, iterated_elimination, pairwise_counts
+from game_engine import COLUMN, ROW
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+def test_pairwise_counts_match_direct_comparison(kind):
+    rng = np.random.default_rng(0)
+    left, right = naive.random_game(rng, 7, 5, kind)
+    less, less_equal = pairwise_counts(left, right)
+    for i in range(7):
+        for k in range(7):
+            assert less[i, k] == sum(x < y for x, y in zip(left[i], right[k]))
+            assert less_equal[i, k] == sum(x <= y for x, y in zip(left[i], right[k]))
+
+
+def test_drop_coordinates_matches_recount():
+    rng = np.random.default_rng(1)
+    strategies = rng.integers(0, 3, size=(6, 8))
+    counts = PairwiseCounts(strategies)
+    counts.drop_coordinates([1, 4, 5])
+    kept = strategies[:, [0, 2, 3, 6, 7]]
+    assert counts.coords == 5
+    for strict in (True, False):
+        expected = naive.dominated_pairs(kept.tolist(), strict)
+        assert sorted(zip(*map(list, np.nonzero(counts.dominance_matrix(strict))))) == sorted(expected)
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+@pytest.mark.parametrize("strict", [True, False])
+def test_iterated_elimination_matches_naive(kind, strict):
+    rng = np.random.default_rng(2)
+    for trial in range(30):
+        rows, cols = rng.integers(2, 7, size=2)
+        matrix1, matrix2 = naive.random_game(rng, rows, cols, kind)
+        result = iterated_elimination(matrix1, matrix2, strict=strict)
+        expected_rows, expected_cols = naive.iterated_elimination(matrix1, matrix2, strict)
+        assert result.row_index.tolist() == expected_rows
+        assert result.col_index.tolist() == expected_cols
+        assert np.array_equal(result.matrices[0], matrix1[np.ix_(expected_rows, expected_cols)])
+        assert np.array_equal(result.matrices[1], matrix2[np.ix_(expected_rows, expected_cols)])
+
+
+def test_iterated_elimination_zero_sum_keeps_integer_dtype():
+    # Без matrix2 игра антагонистическая; -(-128) в int8 не переполняется
+    matrix = np.array([[-128, 5, 3], [-100, 7, 4], [-50, 1, 2]], dtype=np.int8)
+    result = iterated_elimination(matrix, strict=False)
+    expected_rows, expected_cols = naive.iterated_elimination(matrix, -matrix.astype(int), strict=False)
+    assert (result.row_index.tolist(), result.col_index.tolist()) == (expected_rows, expected_cols)
+    assert result.matrices[0].dtype == np.int8
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+def test_dominance_graph_tracks_cell_edits(kind):
+    rng = np.random.default_rng(3)
+    matrix1, matrix2 = naive.random_game(rng, 6, 6, kind)
+    matrix1, matrix2 = matrix1.astype(np.int8) if kind == "degenerate" else matrix1, matrix2
+    graph = DominanceGraph(matrix1, matrix2)
+    reference = [matrix1.astype(float), matrix2.astype(float)]
+    # Правки с расширением типа: int8 -> int16 -> float32
+    values = [0, 1, 2, -1, 300, 0.5] if kind == "degenerate" else [0.0, 1.5, -2.0]
+    for _ in range(40):
+        i, j = rng.integers(0, 6, size=2)
+        cell = (rng.choice(values), rng.choice(values))
+        graph.update_cell(i, j, cell)
+        reference[0][i, j], reference[1][i, j] = cell
+        for strict in (True, False):
+            assert sorted(graph.pairs(ROW, strict)) == sorted(naive.dominated_pairs(reference[0].tolist(), strict))
+            assert sorted(graph.pairs(COLUMN, strict)) == \
+                sorted(naive.dominated_pairs(reference[1].T.tolist(), strict))
+    assert np.array_equal(graph.matrices[0], reference[0])
+
+
+@pytest.mark.parametrize("strict", [True, False])
+def test_dominance_graph_remove_matches_game_engine(strict):
+    rng = np.random.default_rng(4)
+    for trial in range(20):
+        matrix1, matrix2 = naive.random_game(rng, 5, 5, "degenerate")
+        graph = DominanceGraph(matrix1, matrix2)
+        matrices = (matrix1, matrix2)
+        for player in (ROW, COLUMN, ROW, COLUMN):
+            if matrices[0].size == 1:
+                break                             # 1x1 — уже не игра
+            result = graph.remove_dominated(player, strict)
+            expected = game_engine.remove_dominated(matrices, player, strict)
+            assert result.removed == expected.removed
+            assert sorted(result.pairs) == sorted(expected.pairs)
+            for got, want in zip(result.matrices, expected.matrices):
+                assert np.array_equal(got, want)
+            matrices = expected.matrices
+        # После удалений граф продолжает отвечать на запросы по уменьшенной игре
+        for player, payoff in ((ROW, matrices[0]), (COLUMN, matrices[1].T)):
+            assert sorted(graph.pairs(player, strict)) == sorted(naive.dominated_pairs(payoff.tolist(), strict))
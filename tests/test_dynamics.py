@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+import dynamics
+import game_engine
+
+RPS = np.array([[0, -1, 2], [2, 0, -1], [-1, 2, 0]])     # несимметричная «камень-ножницы-бумага»
+
+
+def trajectory_end(method, **options):
+    x0 = np.array([[0.6, 0.3, 0.1], [0.2, 0.2, 0.6]])
+    y0 = np.array([[0.1, 0.5, 0.4], [0.3, 0.3, 0.4]])
+    res = dynamics.simulate(RPS, x0=x0, y0=y0, method=method, t_max=2.0, tol=0.0, **options)
+    assert np.allclose(res.times, 2.0)
+    return np.hstack([res.x, res.y])
+
+
+def test_rk4_is_fourth_order():
+    reference = trajectory_end("fixed", dt=0.001)
+    coarse = np.abs(trajectory_end("fixed", dt=0.1) - reference).max()
+    fine = np.abs(trajectory_end("fixed", dt=0.05) - reference).max()
+    # Ошибка РК4 уменьшается в ~16 раз при вдвое меньшем шаге
+    assert 10 < coarse / fine < 24
+
+
+def test_adaptive_matches_fixed_with_fewer_evaluations():
+    reference = trajectory_end("fixed", dt=0.001)
+    assert np.abs(trajectory_end("adaptive", atol=1e-9) - reference).max() < 1e-5
+    fixed = dynamics.simulate(RPS, count=50, method="fixed", dt=0.001, t_max=2.0, tol=0.0, rng=1)
+    adaptive = dynamics.simulate(RPS, count=50, method="adaptive", atol=1e-9, t_max=2.0, tol=0.0, rng=1)
+    assert adaptive.steps < fixed.steps / 3 and adaptive.evaluations < fixed.evaluations / 3
+
+
+@pytest.mark.parametrize("method", dynamics.METHODS)
+def test_coordination_converges_to_pure_equilibria(method):
+    a = np.array([[2, 0], [0, 1]])
+    res = dynamics.simulate(a, a, count=200, method=method, dt=0.1, t_max=500.0, rng=2)
+    assert res.converged.all() and res.count == 200
+    assert np.allclose(res.x.sum(axis=1), 1) and (res.x >= 0).all()
+    summary = dynamics.endpoint_summary(res)
+    assert sum(n for _, _, n in summary) == 200
+    equilibria = set(game_engine.pure_nash_equilibria(a, a).equilibria)
+    for x, y, _ in summary:
+        assert (int(np.argmax(x)), int(np.argmax(y))) in equilibria and x.max() == y.max() == 1
+
+
+def test_best_response_finds_dominant_profile():
+    # Дилемма заключённого: вторая стратегия строго доминирует у обоих
+    a = np.array([[3, 0], [5, 1]])
+    res = dynamics.simulate(a, a.T, count=20, dynamics="best_response", t_max=100.0, rng=3)
+    assert res.converged.all()
+    assert np.allclose(res.x, [0, 1], atol=1e-6) and np.allclose(res.y, [0, 1], atol=1e-6)
+
+
+def test_logit_reaches_quantal_response_fixed_point():
+    res = dynamics.simulate(RPS, count=5, dynamics="logit", temperature=2.0, t_max=200.0, rng=4)
+    assert res.converged.all()
+    fx, fy = res.y @ RPS.T, res.x @ -RPS
+    assert np.allclose(res.x, dynamics._softmax(fx, 2.0), atol=1e-6)
+    assert np.allclose(res.y, dynamics._softmax(fy, 2.0), atol=1e-6)
+
+
+def test_snapshots_stream_to_file(tmp_path):
+    path = str(tmp_path / "snapshots.npy")
+    res = dynamics.simulate(RPS, count=7, method="fixed", dt=0.1, t_max=2.05, tol=0.0, record_every=5,
+                            path=path, rng=5)
+    snapshots = list(dynamics.iter_snapshots(path))
+    # Начальное состояние, каждые 5 шагов и конечное
+    assert len(snapshots) == 1 + res.steps // 5 + (res.steps % 5 != 0)
+    times, x, y = snapshots[-1]
+    assert np.array_equal(times, res.times) and np.array_equal(x, res.x) and np.array_equal(y, res.y)
+    assert x.shape == (7, 3) and (snapshots[0][0] == 0).all()
+
+
+@pytest.mark.parametrize("options", [{"dynamics": "fictitious"}, {"method": "euler"}, {"dt": 0},
+                                     {"dynamics": "logit", "temperature": 0},
+                                     {"x0": [[0.5, 0.5]], "y0": [[0.2, 0.3, 0.5]]}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        dynamics.simulate(RPS, count=2, **options)
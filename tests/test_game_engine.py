@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+import game_engine
+import naive
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+def test_maximin_minimax_matches_naive(kind):
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        rows, cols = rng.integers(2, 6, size=2)
+        matrix, _ = naive.random_game(rng, rows, cols, kind)
+        res = game_engine.maximin_minimax(matrix)
+        assert (res.maximin, res.minimax) == naive.maximin_minimax(matrix)
+        assert res.row_minima[res.maximin_row] == res.maximin
+        assert res.col_maxima[res.minimax_col] == res.minimax
+        assert res.saddle == bool(naive.saddle_points(matrix))
+
+
+@pytest.mark.parametrize("strict", [True, False])
+def test_remove_dominated_matches_naive(strict):
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        a, b = naive.random_game(rng, 4, 5, "degenerate")
+        rows = game_engine.remove_dominated((a, b), game_engine.ROW, strict)
+        assert rows.pairs == naive.dominated_pairs(a.tolist(), strict)
+        assert rows.removed == sorted({i for i, _ in rows.pairs})
+        assert np.array_equal(rows.matrices[1], np.delete(b, rows.removed, axis=0))
+        # Столбцы проверяются по последней матрице (выигрыши второго игрока)
+        cols = game_engine.remove_dominated((a, b), game_engine.COLUMN, strict)
+        assert cols.pairs == naive.dominated_pairs(b.T.tolist(), strict)
+        assert cols.matrices[0].shape == (4, 5 - len(cols.removed))
+
+
+def test_pure_nash_small_games():
+    # Дилемма заключённого и игра без равновесий в чистых стратегиях
+    a = np.array([[3, 0], [5, 1]])
+    assert game_engine.pure_nash_equilibria(a, a.T).equilibria == [(1, 1)]
+    pennies = np.array([[1, -1], [-1, 1]])
+    assert not game_engine.pure_nash_equilibria(pennies, -pennies).found
+
+
+@pytest.mark.parametrize("data", [[[1]], [1, 2], [[]], np.zeros((2, 2, 2))])
+def test_invalid_matrices_are_rejected(data):
+    with pytest.raises(ValueError):
+        game_engine.maximin_minimax(data)
+
+
+def test_bimatrix_shapes_must_match():
+    with pytest.raises(ValueError, match="одинаковый размер"):
+        game_engine.pure_nash_equilibria(np.zeros((2, 2)), np.zeros((2, 3)))
+    with pytest.raises(ValueError, match="Неизвестный игрок"):
+        game_engine.remove_dominated((np.zeros((2, 2)),), "diagonal")
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+def test_chunked_pure_nash_matches_naive(kind):
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        rows, cols = rng.integers(2, 8, size=2)
+        a, b = naive.random_game(rng, rows, cols, kind)
+        expected = naive.pure_nash(a, b)
+        for chunk_rows in (None, 1, 3, rows):
+            assert game_engine.pure_nash_equilibria(a, b, chunk_rows).equilibria == expected
+
+
+def test_iter_pure_nash_is_lazy_and_reports_progress():
+    # Игра с равновесием в каждой ячейке: первое равновесие выдаётся после первого блока
+    matrix = np.zeros((100, 10), dtype=np.int8)
+    fractions = []
+    found = game_engine.iter_pure_nash(matrix, matrix, chunk_rows=10,
+                                       progress=lambda fraction, message: fractions.append(fraction))
+    assert next(found) == (0, 0) and fractions == []
+    assert len(list(found)) == 999
+    assert fractions == [k / 10 for k in range(1, 11)]
+
+
+@pytest.mark.parametrize("values, dtype", [
+    ([[1, -127], [0, 3]], np.int8),
+    ([[1.0, 200.0], [0.0, -3.0]], np.int16),
+    ([[70000, 0], [1, 2]], np.int32),
+    ([[2 ** 40, 0], [1, 2]], np.int64),
+    ([[0.5, 1.25], [0.0, 3.0]], np.float32),
+    ([[0.1, 1.0], [0.0, 3.0]], np.float64),
+    ([[np.inf, 1.0], [0.0, 3.0]], np.float32),
+])
+def test_compact_dtype_is_narrowest_exact(values, dtype):
+    assert game_engine.compact_dtype(values) == dtype
+    compacted = game_engine.compact(values)
+    assert compacted.dtype == dtype and np.array_equal(compacted, np.asarray(values))
+
+
+def test_widening_and_negation():
+    matrix = np.array([[1, 2], [3, 4]], dtype=np.int8)
+    assert game_engine.widened_dtype(matrix.dtype, 5) == np.int8
+    assert game_engine.widened_dtype(matrix.dtype, 300) == np.int16
+    assert game_engine.widened_dtype(matrix.dtype, 0.5) == np.float32
+    # -(-128) не помещается в int8, поэтому тип расширяется
+    edge = np.array([[-128, 1], [0, 127]], dtype=np.int8)
+    assert game_engine.negated(edge).dtype == np.int16 and game_engine.negated(edge).tolist() == [[128, -1], [0, -127]]
+    assert game_engine.negated(matrix).dtype == np.int8
+    assert game_engine.negated(np.array([[0, 255]], dtype=np.uint8)).tolist() == [[0, -255]]
+
+
+def test_comparisons_keep_input_dtype():
+    matrix = np.array([[1, 2], [3, 4]], dtype=np.int16)
+    assert game_engine.as_payoff_matrix(matrix, None).dtype == np.int16
+    assert game_engine.as_payoff_matrix(matrix).dtype == np.float64
+    # 2**53 и 2**53 + 1 совпадают во float64, но различаются в int64
+    big = 2 ** 53
+    a = np.array([[big + 1, big], [big, big + 1]], dtype=np.int64)
+    assert game_engine.pure_nash_equilibria(a, -a).equilibria == []
+    rows = np.array([[big + 1, big + 1], [big, big]], dtype=np.int64)
+    assert game_engine.remove_dominated((rows,), "row").removed == [1]
+    res = game_engine.maximin_minimax(rows)
+    assert res.maximin == res.minimax == big + 1 and res.saddle
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import game_io
+from game_io import GameFileError
+
+
+@pytest.mark.parametrize("text", [
+    "2 3\n1 2 3\n4 5 6\n",
+    "2,3\n1,2,3\n4,5,6\n",
+    "2;3\n1;2;3\n4;5;6\n",
+    "2\t3\n1, 2;3\n\n 4\t5 6 \n",
+])
+def test_delimiters(text):
+    (matrix,) = game_io.parse_text(text)
+    assert matrix.tolist() == [[1, 2, 3], [4, 5, 6]] and matrix.dtype == np.int8
+
+
+def test_bimatrix_and_players():
+    text = "2 2\n1 2\n3 4\n4 3\n2 1.5\n"
+    a, b = game_io.parse_text(text)
+    assert a.tolist() == [[1, 2], [3, 4]] and b.tolist() == [[4, 3], [2, 1.5]]
+    assert b.dtype == np.float32
+    # Из биматричного файла можно взять только матрицу A
+    assert len(game_io.parse_text(text, players=1)) == 1
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "пуст"),
+    ("2 x\n", "размеров"),
+    ("2 2 2\n", "ровно два"),
+    ("1 1\n5\n", "1x1"),
+    ("2 2\n1 2\n", "Недостаточно строк"),
+    ("2 2\n1 2\n3 x\n", "строке 3"),
+    ("2 2\n1 2\n3 4 5\n", "строке 3 должно быть 2"),
+])
+def test_text_errors_name_the_problem(text, message):
+    with pytest.raises(GameFileError, match=message):
+        game_io.parse_text(text)
+
+
+@pytest.mark.parametrize("ext", [".txt", ".csv", ".npy", ".npz"])
+@pytest.mark.parametrize("players", [1, 2])
+def test_round_trip(tmp_path, ext, players):
+    rng = np.random.default_rng(9)
+    # Больше старого предела 20x20; целые и дробные значения сохраняются точно
+    matrices = (rng.integers(-1000, 1000, size=(30, 25)), rng.normal(size=(30, 25)))[:players]
+    path = str(tmp_path / f"game{ext}")
+    game_io.save_game(path, *matrices)
+    loaded = game_io.load_game(path, players=players)
+    assert len(loaded) == players
+    for original, matrix in zip(matrices, loaded):
+        assert np.array_equal(original, matrix)
+
+
+def test_npy_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "game.npy")
+    game_io.save_game(path, np.arange(12, dtype=np.int32).reshape(3, 4))
+    (matrix,) = game_io.load_game(path)
+    assert isinstance(matrix, np.memmap) and matrix.dtype == np.int32
+    (copy,) = game_io.load_game(path, mmap=False)
+    assert not isinstance(copy, np.memmap)
+
+
+def test_binary_errors(tmp_path):
+    np.save(str(tmp_path / "cube.npy"), np.zeros((3, 2, 2)))
+    np.savez(str(tmp_path / "no_a.npz"), B=np.zeros((2, 2)))
+    np.savez(str(tmp_path / "shapes.npz"), A=np.zeros((2, 2)), B=np.zeros((2, 3)))
+    np.save(str(tmp_path / "objects.npy"), np.array([1, "a"], dtype=object), allow_pickle=True)
+    for name, message in (("cube.npy", "форма"), ("no_a.npz", "'A'"), ("shapes.npz", "одного размера")):
+        with pytest.raises(GameFileError, match=message):
+            game_io.load_game(str(tmp_path / name))
+    game_io.save_game(str(tmp_path / "one.npz"), np.zeros((2, 2)))
+    with pytest.raises(GameFileError, match="ожидалось 2"):
+        game_io.load_game(str(tmp_path / "one.npz"), players=2)
+    # Объектные массивы не распаковываются через pickle
+    with pytest.raises(ValueError):
+        game_io.load_game(str(tmp_path / "objects.npy"))
+
+
+@pytest.mark.parametrize("ext", [".npy", ".npz"])
+def test_nplayer_round_trip(tmp_path, ext):
+    payoffs = np.random.default_rng(10).integers(0, 5, size=(3, 2, 3, 4)).astype(np.int8)
+    path = str(tmp_path / f"game{ext}")
+    game_io.save_nplayer(path, payoffs)
+    assert np.array_equal(game_io.load_nplayer(path), payoffs)
+    with pytest.raises(GameFileError):
+        game_io.save_nplayer(str(tmp_path / "game.txt"), payoffs)
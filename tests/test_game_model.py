@@ -0,0 +1,45 @@
+import numpy as np
+
+from game_model import CELL, RESET, GameModel, cell_value
+
+
+def test_cell_value_keeps_integers_exact():
+    big = 2 ** 53 + 1
+    assert cell_value(str(big)) == big and type(cell_value(str(big))) is int
+    assert cell_value(np.int64(big)) == big
+    assert cell_value("2.5") == 2.5 and cell_value("1e3") == 1000.0
+    assert type(cell_value(np.float32(0.5))) is float
+
+
+def test_set_cell_keeps_int64_exact():
+    big = 2 ** 60
+    model = GameModel(np.array([[big, 1], [2, 3]], dtype=np.int64))
+    model.set_cell(0, 1, [str(big + 1)])
+    model.set_cell(1, 1, [2 ** 53 + 1])
+    assert model.payoffs[0].dtype == np.int64
+    assert model.get_cell(0, 1) == (big + 1,) and model.get_cell(1, 1) == (2 ** 53 + 1,)
+
+
+def test_set_cell_widens_only_when_needed():
+    model = GameModel(np.array([[1, 2], [3, 4]]), np.array([[4, 3], [2, 1]]))
+    assert model.payoffs[0].dtype == np.int8
+    model.set_cell(0, 0, [100, 2.0])
+    assert [p.dtype for p in model.payoffs] == [np.int8, np.int8]
+    model.set_cell(0, 0, [1000, 2 ** 62 + 1])
+    assert [p.dtype for p in model.payoffs] == [np.int16, np.int64]
+    assert model.get_cell(0, 0) == (1000, 2 ** 62 + 1)
+    model.set_cell(1, 1, [0.5, 0])
+    assert model.payoffs[0].dtype == np.float32 and model.get_cell(1, 1) == (0.5, 0)
+
+
+def test_set_cell_notifies_only_on_change():
+    events = []
+    model = GameModel(np.array([[1, 2], [3, 4]]))
+    model.subscribe(lambda kind, cell: events.append((kind, cell)))
+    version = model.version
+    model.set_cell(0, 1, ["2"])
+    assert model.version == version and not events
+    model.set_cell(0, 1, ["5"])
+    assert events == [(CELL, (0, 1))] and model.take_dirty() == {(0, 1)}
+    model.replace(np.zeros((3, 3)))
+    assert events[-1] == (RESET, None) and model.shape == (3, 3) and not model.dirty
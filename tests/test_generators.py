@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import game_engine
+import generators
+
+
+@pytest.mark.parametrize("family", generators.FAMILIES)
+def test_seeded_families_are_reproducible(family):
+    first = generators.generate(family, 4, 5, count=3, rng=7)
+    second = generators.generate(family, 4, 5, count=3, rng=7)
+    assert first.matrix1.shape == first.matrix2.shape == (3, 4, 5) and first.count == 3
+    assert np.array_equal(first.matrix1, second.matrix1) and np.array_equal(first.matrix2, second.matrix2)
+    single = generators.generate(family, 4, 5, rng=7)
+    assert single.matrix1.shape == (4, 5) and single.count is None
+
+
+@pytest.mark.parametrize("distribution", generators.DISTRIBUTIONS)
+def test_distributions(distribution):
+    values = generators.random_game(50, 50, rng=1, distribution=distribution, low=-3, high=3)
+    if distribution == "integers":
+        assert set(np.unique(values)) == set(range(-3, 4))
+    elif distribution == "uniform":
+        assert values.min() >= -3 and values.max() < 3
+    assert abs(values.mean()) < 0.5
+    with pytest.raises(ValueError, match="распределение"):
+        generators.random_game(2, 2, distribution="cauchy")
+
+
+def test_structured_families():
+    games = generators.zero_sum(3, 3, count=10, rng=2)
+    assert np.array_equal(games.matrix2, -games.matrix1)
+    games = generators.constant_sum(3, 3, count=10, rng=2, total=5)
+    assert (games.matrix1 + games.matrix2 == 5).all()
+    games = generators.coordination(3, 3, count=10, rng=2)
+    assert np.array_equal(games.matrix1, games.matrix2)
+    anti = generators.covariant(30, 30, rng=3, rho=-1.0)
+    assert np.corrcoef(anti.matrix1.ravel(), anti.matrix2.ravel())[0, 1] == pytest.approx(-1)
+    ints = generators.covariant(30, 30, rng=3, rho=0.5, low=0, high=9, dtype=np.int16)
+    assert ints.matrix1.dtype == np.int16 and ints.matrix1.min() >= 0 and ints.matrix1.max() <= 9
+
+
+def test_planted_saddle_is_a_saddle_point():
+    games = generators.planted_saddle(5, 6, count=50, rng=4)
+    for k in range(50):
+        i, j = games.planted[k, 0]
+        res = game_engine.maximin_minimax(games.matrix1[k])
+        assert res.saddle and res.maximin == games.matrix1[k, i, j]
+    fixed = generators.planted_saddle(4, 4, rng=4, cell=(2, 1))
+    assert fixed.planted.tolist() == [[2, 1]] and game_engine.maximin_minimax(fixed.matrix1).saddle
+
+
+def test_planted_equilibria_are_found():
+    games = generators.planted_equilibria(6, 5, k=3, count=50, rng=5)
+    assert games.planted.shape == (50, 3, 2)
+    for k in range(50):
+        found = set(game_engine.pure_nash_equilibria(*games.game(k)).equilibria)
+        assert {tuple(cell) for cell in games.planted[k].tolist()} <= found
+    with pytest.raises(ValueError, match="min"):
+        generators.planted_equilibria(2, 5, k=3)
+
+
+def test_streams_and_batches():
+    a, b = generators.spawn_rngs(11, 2)
+    assert not np.array_equal(generators.random_game(3, 3, rng=a), generators.random_game(3, 3, rng=b))
+    batches = list(generators.iter_batches("random", 2, 3, count=250, batch_size=100, seed=12))
+    assert [batch.count for batch in batches] == [100, 100, 50]
+    again = list(generators.iter_batches("random", 2, 3, count=250, batch_size=100, seed=12))
+    assert all(np.array_equal(x.matrix1, y.matrix1) for x, y in zip(batches, again))
+    payoffs = generators.random_nplayer((2, 3, 4), count=5, rng=13)
+    assert payoffs.shape == (5, 3, 2, 3, 4)
+    with pytest.raises(ValueError):
+        generators.generate("chicken", 2, 2)
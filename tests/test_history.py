@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from game_model import GameModel
+from history import ModelHistory
+
+
+def snapshot(model):
+    return [p.astype(object) for p in model.payoffs]
+
+
+def assert_state(model, state):
+    assert len(model.payoffs) == len(state)
+    for array, expected in zip(model.payoffs, state):
+        assert array.shape == expected.shape
+        assert (array.astype(object) == expected).all()
+
+
+def random_edits(model, history, rng, steps):
+    # Правки ячеек (с расширением типа), удаление стратегий и замены; состояние после каждой версии
+    states = [snapshot(model)]
+    values = [0, 1, -3, 127, 300, 70000, 2 ** 40, 0.5, 0.1]
+    for _ in range(steps):
+        rows, cols = model.shape
+        action = rng.choice(["cell", "cell", "cell", "restrict", "replace"])
+        if action == "cell":
+            model.set_cell(rng.integers(rows), rng.integers(cols),
+                           [rng.choice(values).item() for _ in range(model.layer_count)])
+        elif action == "restrict" and rows > 2 and cols > 2:
+            model.restrict(np.sort(rng.choice(rows, rows - 1, replace=False)),
+                           np.sort(rng.choice(cols, cols - 1, replace=False)), label="Удаление")
+        elif action == "replace":
+            size = rng.integers(2, 6)
+            model.replace(*[rng.integers(-5, 5, size=(size, size)) for _ in range(model.layer_count)], label="Замена")
+        if history.position == len(states):
+            states.append(snapshot(model))
+    return states
+
+
+@pytest.mark.parametrize("checkpoint_ratio", [0.5, 2.0, 100.0])
+def test_undo_redo_restore_every_version(checkpoint_ratio):
+    rng = np.random.default_rng(20)
+    model = GameModel(rng.integers(-3, 3, size=(5, 5)).astype(np.int8), rng.integers(-3, 3, size=(5, 5)))
+    history = ModelHistory(model, checkpoint_ratio=checkpoint_ratio)
+    states = random_edits(model, history, rng, 60)
+    assert history.position == len(states) - 1
+    for position in range(len(states) - 2, -1, -1):
+        assert history.undo()
+        assert_state(model, states[position])
+    assert not history.undo()
+    for position in range(1, len(states)):
+        assert history.redo()
+        assert_state(model, states[position])
+    assert not history.redo()
+    for position in rng.integers(0, len(states), size=30):
+        history.goto(int(position))
+        assert history.position == position
+        assert_state(model, states[position])
+
+
+def test_widened_cell_undo_restores_old_value():
+    model = GameModel(np.array([[1, 2], [3, 4]], dtype=np.int8))
+    history = ModelHistory(model)
+    model.set_cell(0, 1, [2 ** 40])
+    model.set_cell(1, 0, [0.25])
+    assert model.payoffs[0][0, 1] == 2 ** 40 and model.payoffs[0][1, 0] == 0.25
+    history.undo()
+    history.undo()
+    assert_state(model, [np.array([[1, 2], [3, 4]], dtype=object)])
+
+
+def test_edit_after_undo_drops_redo_branch():
+    rng = np.random.default_rng(21)
+    model = GameModel(rng.integers(-3, 3, size=(4, 4)))
+    history = ModelHistory(model, checkpoint_ratio=0.5)
+    states = random_edits(model, history, rng, 20)
+    history.goto(5)
+    model.set_cell(0, 0, [99])
+    assert not history.can_redo
+    assert len(history.entries()) == 7
+    history.undo()
+    assert_state(model, states[5])
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import naive
+from incremental import IncrementalAnalysis
+
+
+def check(analysis, matrix1, matrix2):
+    maximin, minimax = naive.maximin_minimax(matrix1)
+    result = analysis.maximin_result()
+    assert (result.maximin, result.minimax) == (maximin, minimax)
+    assert result.saddle == (maximin == minimax) == analysis.saddle
+    assert result.row_minima[result.maximin_row] == maximin
+    assert result.col_maxima[result.minimax_col] == minimax
+    assert analysis.nash_result().equilibria == naive.pure_nash(matrix1, matrix2)
+
+
+@pytest.mark.parametrize("bimatrix", [False, True])
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+def test_updates_match_recomputation(bimatrix, kind):
+    rng = np.random.default_rng(10)
+    matrix1, matrix2 = naive.random_game(rng, 6, 5 if bimatrix else 6, kind)
+    if kind == "degenerate":
+        matrix1, matrix2 = matrix1.astype(np.int8), matrix2.astype(np.int8)
+    analysis = IncrementalAnalysis(matrix1, matrix2 if bimatrix else None)
+    # Эталон в Python-числах: значения 300 и 0.5 расширяют int8 до int16 и float32
+    reference = [matrix1.astype(object), matrix2.astype(object)]
+    values = [0, 1, 2, -1, 300, 0.5] if kind == "degenerate" else [0.0, 1.5, -2.0]
+    for _ in range(60):
+        i, j = rng.integers(0, analysis.shape[0]), rng.integers(0, analysis.shape[1])
+        cell = (rng.choice(values).item(), rng.choice(values).item())
+        analysis.update_cell(i, j, cell if bimatrix else cell[:1])
+        reference[0][i, j], reference[1][i, j] = cell
+        check(analysis, reference[0], reference[1] if bimatrix else -reference[0])
+    assert analysis.edits == 60
+
+
+def test_keeps_integer_values_exact():
+    # Целые выше 2^53 не проходят через float
+    big = 2 ** 60
+    matrix = np.array([[big, big + 1], [big + 3, big + 2]], dtype=np.int64)
+    analysis = IncrementalAnalysis(matrix)
+    analysis.update_cell(0, 0, (big + 5,))
+    result = analysis.maximin_result()
+    assert (result.maximin, result.minimax) == (big + 2, big + 2)
+    assert result.saddle and isinstance(result.maximin, int)
@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+import pytest
+
+import batch
+import game_engine
+import game_io
+import instrumentation
+from instrumentation import Profiler
+
+
+@pytest.fixture
+def profiler():
+    # Общий профилировщик модуля: включается на время теста и очищается
+    instrumentation.PROFILER.reset()
+    yield instrumentation.PROFILER
+    instrumentation.disable()
+    instrumentation.PROFILER.reset()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    assert profiler.stage("compute.x") is profiler.stage("parse.y")
+    with profiler.stage("compute.x"):
+        pass
+    profiler.record("job.x", 1.0)
+    assert profiler.summary() == {} and len(profiler.events) == 0
+
+
+def test_stage_statistics():
+    profiler = Profiler(max_events=3)
+    profiler.enable()
+    for seconds in (0.5, 0.25, 1.0):
+        profiler.record("job.solve", seconds, source="gui")
+    with profiler.stage("parse.input", rows=2):
+        pass
+    stats = profiler.summary()
+    # Сводка упорядочена по суммарному времени
+    assert list(stats) == ["job.solve", "parse.input"]
+    assert stats["job.solve"] == {"count": 3, "total": 1.75, "min": 0.25, "max": 1.0, "peak_bytes": None,
+                                  "mean": 1.75 / 3}
+    assert len(profiler.events) == 3 and profiler.events[-1].info == {"rows": 2}
+    profiler.reset()
+    assert profiler.summary() == {}
+
+
+def test_capture_nests_and_isolates():
+    profiler = Profiler()
+    profiler.enable()
+    profiler.record("before", 0.1)
+    with profiler.capture() as outer:
+        profiler.record("outer", 0.1)
+        with profiler.capture() as inner:
+            profiler.record("inner", 0.1)
+    assert [e.name for e in inner] == ["inner"]
+    assert [e.name for e in outer] == ["outer", "inner"]
+    assert len(profiler.events) == 3
+
+
+def test_memory_peak_of_nested_stages():
+    profiler = Profiler()
+    profiler.enable(memory=True)
+    try:
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                block = np.ones(1_000_000)
+            del block
+    finally:
+        profiler.disable()
+    peaks = {e.name: e.peak_bytes for e in profiler.events}
+    # Пик внутреннего этапа учитывается и во внешнем
+    assert peaks["inner"] >= 8_000_000 and peaks["outer"] >= peaks["inner"]
+
+
+def test_timed_keeps_function_identity(profiler):
+    wrapped = game_engine.maximin_minimax
+    assert wrapped.__name__ == "maximin_minimax" and wrapped.__module__ == "game_engine"
+    wrapped([[1, 2], [3, 4]])
+    assert profiler.summary() == {}
+    instrumentation.enable()
+    wrapped([[1, 2], [3, 4]])
+    assert profiler.summary()["compute.game_engine.maximin_minimax"]["count"] == 1
+
+
+def test_batch_profile_report(profiler, tmp_path):
+    game_io.save_game(str(tmp_path / "game.csv"), np.array([[1, 2], [3, 4]]))
+    report = str(tmp_path / "profile.json")
+    args = [str(tmp_path / "game.csv"), "-o", str(tmp_path / "out.jsonl"), "-j", "1", "--profile", report]
+    assert batch.main(args) == 0
+    with open(report, encoding="utf-8") as file:
+        stages = json.load(file)["stages"]
+    assert "batch.total" in stages and "compute.game_engine.maximin_minimax" in stages
+    with open(str(tmp_path / "out.jsonl"), encoding="utf-8") as file:
+        record = json.loads(file.readline())
+    assert set(record["profile"]) <= set(stages)
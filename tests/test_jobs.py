@@ -0,0 +1,84 @@
+import multiprocessing
+import time
+
+import pytest
+
+from jobs import JobScheduler
+
+
+class FakeRoot:
+    # Вместо Tk: after() только запоминает вызов, тест опрашивает планировщик сам
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, callback):
+        self.calls.append(callback)
+
+
+def wait_done(scheduler, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while scheduler.jobs and time.monotonic() < deadline:
+        scheduler.poll()
+        time.sleep(0.01)
+    assert not scheduler.jobs
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(FakeRoot(), threads=2, processes=1, poll_ms=1)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def slow_sum(values, progress=None):
+    total = 0
+    for k, value in enumerate(values):
+        progress(k / len(values), "")
+        time.sleep(0.01)
+        total += value
+    return total
+
+
+def test_thread_job_reports_progress_and_result(scheduler):
+    results, updates = [], []
+    scheduler.submit("sum", slow_sum, [1, 2, 3], report_progress=True, on_done=results.append,
+                     on_progress=lambda fraction, message: updates.append(fraction))
+    wait_done(scheduler)
+    assert results == [6] and updates and all(0 <= u < 1 for u in updates)
+
+
+def test_same_key_replaces_job(scheduler):
+    results = []
+    scheduler.submit("sum", slow_sum, list(range(100)), report_progress=True, on_done=results.append)
+    scheduler.submit("sum", slow_sum, [5], report_progress=True, on_done=results.append)
+    wait_done(scheduler)
+    assert results == [5]
+
+
+def test_errors_go_to_on_error(scheduler):
+    errors = []
+    scheduler.submit("bad", int, "x", on_done=errors.append, on_error=errors.append)
+    wait_done(scheduler)
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_process_job_result_and_error(scheduler):
+    results, errors = [], []
+    scheduler.submit("pow", pow, 3, 4, in_process=True, on_done=results.append, on_error=errors.append)
+    wait_done(scheduler)
+    scheduler.submit("pow", pow, "3", 4, in_process=True, on_done=results.append, on_error=errors.append)
+    wait_done(scheduler)
+    assert results == [81] and len(errors) == 1 and isinstance(errors[0], TypeError)
+
+
+def test_shutdown_terminates_running_process_job():
+    scheduler = JobScheduler(FakeRoot(), processes=1)
+    results = []
+    scheduler.submit("sleep", time.sleep, 60, in_process=True, on_done=results.append)
+    time.sleep(0.2)
+    assert multiprocessing.active_children()
+    start = time.monotonic()
+    scheduler.shutdown()
+    assert time.monotonic() - start < 10
+    assert not multiprocessing.active_children()
+    assert not results and not scheduler.jobs
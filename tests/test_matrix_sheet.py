@@ -0,0 +1,48 @@
+import tkinter as tk
+
+import numpy as np
+import pytest
+
+from game_model import GameModel
+from matrix_sheet import MatrixSheet, format_value
+
+
+def test_format_value_keeps_integers_whole():
+    assert format_value(np.int64(2 ** 60)) == str(2 ** 60)
+    assert format_value(1234567) == "1234567"
+    assert format_value(np.float32(0.5)) == "0.5" and format_value(1e20) == "1e+20"
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("нет дисплея")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_only_visible_cells_are_drawn(root):
+    model = GameModel(np.arange(10000 * 100).reshape(10000, 100))
+    sheet = MatrixSheet(root, model, width=400, height=200)
+    first_row, last_row, first_col, last_col = sheet.visible_range()
+    assert (first_row, first_col) == (0, 0) and last_row < 20 and last_col < 10
+    assert len(sheet.cell_items) == (last_row - first_row) * (last_col - first_col)
+    sheet.yview("moveto", 0.5)
+    assert sheet.visible_range()[0] >= 4900
+
+
+def test_cell_edits_go_through_the_model(root):
+    model = GameModel(np.array([[1, 2], [3, 4]]), np.array([[4, 3], [2, 1]]))
+    sheet = MatrixSheet(root, model)
+    assert sheet.cell_text(0, 1) == "2;3"
+    sheet.start_edit(0, 1)
+    sheet.editor.delete(0, "end")
+    sheet.editor.insert(0, f"{2 ** 60};0.5")
+    assert sheet.commit_edit()
+    assert model.get_cell(0, 1) == (2 ** 60, 0.5)
+    assert sheet.canvas.itemcget(sheet.cell_items[(0, 1)], "text") == f"{2 ** 60};0.5"
+    with pytest.raises(ValueError):
+        sheet.parse_cell("1")
@@ -0,0 +1,85 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+import mixed_nash
+
+
+def naive_support_enumeration(matrix1, matrix2, max_support=None, balanced_only=False):
+    # Каждая пара носителей проверяется отдельно
+    rows, cols = matrix1.shape
+    found = []
+    for k1, k2 in mixed_nash.support_sizes(rows, cols, max_support, balanced_only):
+        for row_support in combinations(range(rows), k1):
+            for col_support in combinations(range(cols), k2):
+                found.extend(mixed_nash._check_support(matrix1, matrix2, row_support,
+                                                       np.array([col_support]), mixed_nash.TOLERANCE))
+    return found
+
+
+def key(x, y):
+    return tuple(np.round(x, 6)), tuple(np.round(y, 6))
+
+
+@pytest.mark.parametrize("balanced_only", [True, False])
+def test_blocked_enumeration_matches_pairwise(monkeypatch, balanced_only):
+    # Блоки по 2 носителя столбцов и без кэша блоков — ленивый путь
+    monkeypatch.setattr(mixed_nash, "COLUMN_BLOCK", 2)
+    monkeypatch.setattr(mixed_nash, "CACHED_COLUMN_SUPPORTS", 0)
+    rng = np.random.default_rng(60)
+    for _ in range(5):
+        matrix1, matrix2 = rng.normal(size=(4, 4)), rng.normal(size=(4, 4))
+        found = list(mixed_nash.iter_support_enumeration(matrix1, matrix2, balanced_only=balanced_only,
+                                                         workers=1, chunk=3))
+        expected = naive_support_enumeration(matrix1, matrix2, balanced_only=balanced_only)
+        # Внутри одного размера носителей порядок перебора не задан
+        assert sorted(key(eq.row_strategy, eq.col_strategy) for eq in found) == \
+            sorted(key(x, y) for x, y in expected)
+        for eq in found:
+            assert mixed_nash.is_equilibrium(matrix1, matrix2, eq.row_strategy, eq.col_strategy)
+
+
+def test_pair_count_matches_enumerated_pairs():
+    for rows, cols in ((3, 5), (6, 6)):
+        for max_support in (None, 1, 2):
+            for balanced_only in (True, False):
+                sizes = mixed_nash.support_sizes(rows, cols, max_support, balanced_only)
+                pairs = sum(len(list(combinations(range(rows), k1))) * len(list(combinations(range(cols), k2)))
+                            for k1, k2 in sizes)
+                assert mixed_nash.pair_count(rows, cols, max_support, balanced_only) == pairs
+
+
+def test_support_enumeration_contains_lemke_howson():
+    rng = np.random.default_rng(61)
+    matrix1, matrix2 = rng.normal(size=(5, 5)), rng.normal(size=(5, 5))
+    equilibria = mixed_nash.support_enumeration(matrix1, matrix2, workers=1)
+    eq = mixed_nash.lemke_howson(matrix1, matrix2)
+    assert any(np.allclose(eq.row_strategy, e.row_strategy, atol=1e-6)
+               and np.allclose(eq.col_strategy, e.col_strategy, atol=1e-6) for e in equilibria)
+
+
+def test_degenerate_game_includes_unbalanced_supports():
+    # Игрок 2 безразличен, поэтому у строки 0 есть равновесия с носителем столбцов размера 2
+    matrix1, matrix2 = [[1, 1], [0, 0]], [[1, 1], [1, 1]]
+    equilibria = mixed_nash.support_enumeration(matrix1, matrix2, workers=1)
+    strategies = sorted(key(eq.row_strategy, eq.col_strategy) for eq in equilibria)
+    assert strategies == [key([1, 0], [0, 1]), key([1, 0], [0.5, 0.5]), key([1, 0], [1, 0])]
+    assert len(mixed_nash.support_enumeration(matrix1, matrix2, balanced_only=True, workers=1)) == 2
+
+
+def test_balanced_sizes_come_first():
+    sizes = mixed_nash.support_sizes(3, 4)
+    assert sizes[:3] == [(1, 1), (2, 2), (3, 3)]
+    assert len(sizes) == 12 and all(abs(k1 - k2) >= 1 for k1, k2 in sizes[3:])
+    assert (3, 4) in sizes and (1, 4) in sizes
+    assert mixed_nash.support_sizes(3, 4, balanced_only=True) == sizes[:3]
+
+
+def test_integer_games_find_every_pairwise_equilibrium():
+    rng = np.random.default_rng(62)
+    for _ in range(10):
+        matrix1, matrix2 = rng.integers(0, 3, size=(3, 3)), rng.integers(0, 3, size=(3, 3))
+        found = mixed_nash.support_enumeration(matrix1, matrix2, workers=1)
+        for x, y in naive_support_enumeration(matrix1.astype(float), matrix2.astype(float)):
+            assert any(np.allclose(x, eq.row_strategy) and np.allclose(y, eq.col_strategy) for eq in found)
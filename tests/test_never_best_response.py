@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+import never_best_response as nbr
+
+pytest.importorskip("scipy")
+
+
+def reference_never(payoff):
+    # Стратегия i — НЛО, если нет y в симплексе с (P[k] - P[i]) y <= 0 для всех k (без отсевов)
+    from scipy.optimize import linprog
+    payoff = np.asarray(payoff, dtype=float)
+    rows, cols = payoff.shape
+    never = []
+    for i in range(rows):
+        res = linprog(np.zeros(cols), A_ub=payoff - payoff[i], b_ub=np.full(rows, 1e-9),
+                      A_eq=np.ones((1, cols)), b_eq=[1.0], method="highs")
+        if res.status == 2:
+            never.append(i)
+    return never
+
+
+def test_mixed_dominance_needs_lp():
+    # Третья строка не доминируется чистыми стратегиями, но хуже смеси первых двух
+    payoff = [[3, 0], [0, 3], [1, 1]]
+    never, by_dominance, lp_solved = nbr.find_never_best_responses(payoff)
+    assert never.tolist() == [2] and by_dominance == 0 and lp_solved == 1
+    # Стратегия, лучшая лишь при y = (1/2, 1/2), — не НЛО
+    never, _, _ = nbr.find_never_best_responses([[3, 0], [0, 3], [1.5, 1.5]])
+    assert never.size == 0
+
+
+def test_strict_dominance_skips_lp():
+    never, by_dominance, lp_solved = nbr.find_never_best_responses([[3, 2], [1, 1], [2, 3]])
+    assert never.tolist() == [1] and by_dominance == 1 and lp_solved == 0
+
+
+def test_matches_reference():
+    rng = np.random.default_rng(6)
+    for _ in range(30):
+        payoff = rng.integers(0, 6, size=tuple(rng.integers(2, 6, size=2)))
+        never, _, _ = nbr.find_never_best_responses(payoff)
+        assert never.tolist() == reference_never(payoff)
+
+
+def test_witnesses_are_reused():
+    rng = np.random.default_rng(7)
+    payoff = rng.normal(size=(8, 3))
+    witnesses = []
+    first = nbr.find_never_best_responses(payoff, witnesses)
+    again = nbr.find_never_best_responses(payoff, witnesses)
+    # Все стратегии, подтверждённые в первый раз, подтверждаются найденными y без ЛП
+    assert again[0].tolist() == first[0].tolist()
+    assert first[2] > again[2] == len(first[0]) - first[1]
+
+
+def test_iterated_removal_reaches_fixpoint():
+    rng = np.random.default_rng(8)
+    for _ in range(10):
+        a, b = rng.integers(0, 4, size=(2, 4, 4))
+        res = nbr.remove_never_best_responses(a, b)
+        rows, cols = res.row_index.tolist(), res.col_index.tolist()
+        # На оставшейся игре НЛО-стратегий больше нет
+        assert reference_never(a[np.ix_(rows, cols)]) == []
+        assert reference_never(b[np.ix_(rows, cols)].T) == []
+        # За раунд каждый игрок даёт не больше одного шага
+        assert (len(res.steps) + 1) // 2 <= res.rounds <= len(res.steps)
+        assert np.array_equal(res.matrices[0], a[np.ix_(rows, cols)])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import dominance
+import naive
+import nplayer
+
+
+def random_payoffs(rng, shape, kind):
+    shape = (len(shape),) + tuple(shape)
+    return rng.integers(0, 2, size=shape) if kind == "degenerate" else rng.normal(size=shape)
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+@pytest.mark.parametrize("shape", [(2, 3), (3, 2, 2), (2, 3, 2, 2)])
+def test_pure_nash_matches_brute_force(kind, shape):
+    rng = np.random.default_rng(50)
+    for _ in range(5):
+        payoffs = random_payoffs(rng, shape, kind)
+        expected = naive.nplayer_pure_nash(payoffs)
+        # Маленькие блоки: по одной паре стратегий игроков 1 и 2, части оси игрока 2,
+        # несколько стратегий игрока 1 в блоке
+        per_pair = payoffs.size // (shape[0] * shape[1])
+        for block_elements in (per_pair, 2 * per_pair + 1, per_pair * shape[1] * 2, nplayer.NASH_BLOCK_ELEMENTS):
+            assert nplayer.pure_nash_equilibria(payoffs, block_elements).equilibria == expected
+
+
+def test_block_smaller_than_strategy_pair_is_an_error():
+    payoffs = np.zeros((3, 2, 2, 5))
+    with pytest.raises(ValueError, match="block_elements"):
+        nplayer.pure_nash_equilibria(payoffs, block_elements=14)
+    assert len(nplayer.pure_nash_equilibria(payoffs, block_elements=15).equilibria) == 20
+
+
+@pytest.mark.parametrize("kind", ["normal", "degenerate"])
+@pytest.mark.parametrize("strict", [True, False])
+def test_iterated_elimination_matches_naive(kind, strict):
+    rng = np.random.default_rng(51)
+    for _ in range(10):
+        shape = tuple(rng.integers(2, 4, size=3))
+        payoffs = random_payoffs(rng, shape, kind)
+        result = nplayer.iterated_elimination(payoffs, strict)
+        expected = naive.nplayer_iterated_elimination(payoffs, strict)
+        assert [index.tolist() for index in result.indices] == expected
+        assert np.array_equal(result.payoffs, payoffs[np.ix_(range(3), *expected)])
+
+
+@pytest.mark.parametrize("strict", [True, False])
+def test_two_players_match_bimatrix_elimination(strict):
+    rng = np.random.default_rng(52)
+    for _ in range(10):
+        payoffs = random_payoffs(rng, (4, 4), "degenerate")
+        result = nplayer.iterated_elimination(payoffs, strict)
+        bimatrix = dominance.iterated_elimination(payoffs[0], payoffs[1], strict)
+        assert result.indices[0].tolist() == bimatrix.row_index.tolist()
+        assert result.indices[1].tolist() == bimatrix.col_index.tolist()
+        assert result.rounds == bimatrix.rounds
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import batch
+import game_engine
+import naive
+import out_of_core
+
+
+def games(dtype, rng):
+    if dtype == np.int8:
+        yield rng.integers(-128, 128, size=(37, 11)).astype(np.int8), rng.integers(0, 2, size=(37, 11)).astype(np.int8)
+        # Много равных значений: седловые точки и равновесия в нескольких блоках
+        yield rng.integers(0, 2, size=(20, 20)).astype(np.int8), rng.integers(0, 2, size=(20, 20)).astype(np.int8)
+    elif dtype == np.int64:
+        # Соседние целые выше 2^53 неразличимы во float64
+        base = 2 ** 60
+        yield base + rng.integers(0, 4, size=(25, 9)), base + rng.integers(0, 4, size=(25, 9))
+    else:
+        yield rng.normal(size=(31, 13)), rng.normal(size=(31, 13))
+
+
+def on_disk(tmp_path, name, array):
+    path = tmp_path / f"{name}.npy"
+    np.save(path, array)
+    return np.load(path, mmap_mode="r")
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int64, np.float64])
+@pytest.mark.parametrize("rows_per_block", [1, 3, 1000])
+def test_matches_in_memory(tmp_path, dtype, rows_per_block):
+    rng = np.random.default_rng(30)
+    for k, (matrix1, matrix2) in enumerate(games(dtype, rng)):
+        a = on_disk(tmp_path, f"a{k}", matrix1)
+        b = on_disk(tmp_path, f"b{k}", matrix2)
+        block_bytes = rows_per_block * matrix1.shape[1] * matrix1.dtype.itemsize * 2
+
+        result = out_of_core.maximin_minimax(a, block_bytes)
+        assert (result.maximin, result.minimax) == naive.maximin_minimax(matrix1)
+        assert type(result.maximin) is type(matrix1[0, 0].item())
+        assert result.row_minima.dtype == matrix1.dtype
+        expected = game_engine.maximin_minimax(matrix1)
+        assert np.array_equal(result.row_minima, expected.row_minima)
+        assert np.array_equal(result.col_maxima, expected.col_maxima)
+
+        transposed = out_of_core.maximin_minimax(a, block_bytes, transpose=True)
+        assert (transposed.maximin, transposed.minimax) == naive.maximin_minimax(matrix1.T)
+
+        assert list(out_of_core.iter_saddle_points(a, block_bytes=block_bytes)) == naive.saddle_points(matrix1)
+        assert out_of_core.pure_nash_equilibria(a, b, block_bytes).equilibria == naive.pure_nash(matrix1, matrix2)
+        zero_sum = -matrix1.astype(object)
+        assert out_of_core.pure_nash_equilibria(a, None, block_bytes).equilibria == naive.pure_nash(matrix1, zero_sum)
+
+
+def test_progress_reaches_end(tmp_path):
+    matrix = on_disk(tmp_path, "a", np.arange(40, dtype=np.int16).reshape(8, 5))
+    reported = []
+    out_of_core.pure_nash_equilibria(matrix, None, block_bytes=20, progress=lambda done, message: reported.append(done))
+    assert reported == sorted(reported) and reported[-1] == pytest.approx(1.0)
+
+
+def test_batch_streams_large_npy(tmp_path, monkeypatch):
+    rng = np.random.default_rng(31)
+    matrix1, matrix2 = rng.integers(0, 3, size=(2, 12, 7)).astype(np.int8)
+    a, b = on_disk(tmp_path, "a", matrix1), on_disk(tmp_path, "b", matrix2)
+    expected = batch.analyze_game((matrix1, matrix2), max_equilibria=3)
+    monkeypatch.setattr(batch, "OUT_OF_CORE_BYTES", 0)
+    record = batch.analyze_game((a, b), max_equilibria=3)
+    assert record["out_of_core"] and "skipped" in record["dominance"]
+    assert record["maximin"] == expected["maximin"] and record["nash"] == expected["nash"]
@@ -0,0 +1,139 @@
+import json
+import os
+import pickle
+
+import numpy as np
+
+import dominance
+import game_engine
+import mixed_nash
+import result_cache
+import zerosum
+from result_cache import MISSING, ResultCache, analysis_name, make_key
+
+
+def test_key_depends_on_content_not_origin():
+    matrix = np.arange(6, dtype=np.int16).reshape(2, 3)
+    loaded = np.frombuffer(matrix.tobytes(), dtype=np.int16).reshape(2, 3)
+    assert make_key("a", matrix, strict=True) == make_key("a", loaded, strict=True)
+    # Срез без копии даёт тот же ключ, что и непрерывный массив
+    assert make_key("a", np.arange(12).reshape(2, 6)[:, ::2]) == make_key("a", np.arange(12).reshape(2, 6)[:, ::2].copy())
+    different = [make_key("b", matrix, strict=True), make_key("a", matrix, strict=False),
+                 make_key("a", matrix.astype(np.int32), strict=True), make_key("a", matrix.reshape(3, 2), strict=True),
+                 make_key("a", (matrix,), strict=True), make_key("a", matrix, matrix, strict=True)]
+    assert len(set(different + [make_key("a", matrix, strict=True)])) == len(different) + 1
+
+
+def test_memory_lru_by_bytes():
+    cache = ResultCache(max_bytes=3000)
+    for k in range(10):
+        cache.put(f"k{k}", np.zeros(100) + k)     # ~1 КиБ каждый
+    assert cache.size <= 3000
+    assert cache.get("k0") is MISSING
+    value = cache.get("k9")
+    assert np.array_equal(value, np.zeros(100) + 9)
+    value[:] = -1                                 # get возвращает копию
+    assert cache.get("k9")[0] == 9
+    cache.put("huge", np.zeros(10000))            # больше всего кэша — не запоминается
+    assert cache.get("huge") is MISSING and cache.get("k9") is not MISSING
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    first = ResultCache(max_bytes=1 << 20, directory=str(tmp_path))
+    first.put("abcdef", {"value": 42})
+    second = ResultCache(max_bytes=1 << 20, directory=str(tmp_path))
+    assert second.get("abcdef") == {"value": 42}
+    assert second.stats["disk_hits"] == 1
+    assert second.get("abcdef") == {"value": 42}
+    assert second.stats["hits"] == 1
+    # Повреждённый файл — промах, а не ошибка
+    with open(os.path.join(str(tmp_path), "ab", "abcdef.npz"), "wb") as file:
+        file.write(b"not an archive")
+    assert ResultCache(directory=str(tmp_path)).get("abcdef") is MISSING
+
+
+def test_prune_disk_keeps_budget(tmp_path):
+    cache = ResultCache(directory=str(tmp_path), disk_max_bytes=5000)
+    for k in range(20):
+        cache.put(f"{k:04x}", np.zeros(100))
+    cache.prune_disk()
+    sizes = [os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(str(tmp_path)) for name in names]
+    assert sum(sizes) <= 5000
+
+
+def test_call_ignores_progress():
+    calls = []
+
+    def analysis(matrix, strict=True, progress=None):
+        calls.append(strict)
+        return matrix.sum()
+
+    cache = ResultCache()
+    matrix = np.ones((3, 3))
+    assert cache.call(analysis, matrix, strict=True, progress=print) == 9
+    assert cache.call(analysis, matrix.copy(), strict=True) == 9
+    assert cache.call(analysis, matrix, strict=False) == 9
+    assert calls == [True, False]
+    assert analysis_name(analysis).endswith("analysis")
+
+
+def test_key_depends_on_cache_version(monkeypatch):
+    matrix = np.eye(2)
+    key = make_key("a", matrix)
+    monkeypatch.setattr(result_cache, "CACHE_VERSION", result_cache.CACHE_VERSION + 1)
+    assert make_key("a", matrix) != key
+
+
+def test_analysis_results_round_trip(tmp_path):
+    rng = np.random.default_rng(16)
+    a = rng.integers(-5, 6, size=(5, 4)).astype(np.int8)
+    b = rng.normal(size=(5, 4))
+    results = [game_engine.maximin_minimax(a), game_engine.pure_nash_equilibria(a, b),
+               dominance.iterated_elimination(a, b, strict=False),
+               zerosum.solve_zero_sum(np.array([[3, 1], [2, 4]])),
+               mixed_nash.support_enumeration(a, b, max_support=2),
+               {"labels": ["A1", 2, None], (1, 2): np.float32(0.5), "nan": float("nan")}]
+    cache = ResultCache(directory=str(tmp_path))
+    for k, value in enumerate(results):
+        cache.put(f"{k:04x}", value)
+    fresh = ResultCache(directory=str(tmp_path))
+    for k, value in enumerate(results):
+        for copy in (cache.get(f"{k:04x}"), fresh.get(f"{k:04x}")):
+            assert type(copy) is type(value)
+            assert repr(copy) == repr(value)
+    assert fresh.stats["disk_hits"] == len(results)
+
+
+def test_pickle_files_are_not_loaded(tmp_path):
+    class Payload:
+        def __reduce__(self):
+            return (os.mkdir, (str(tmp_path / "executed"),))
+
+    cache = ResultCache(directory=str(tmp_path))
+    cache.put("abcdef", 1)
+    for name in ("abcdef.npz", "abcdef.pkl"):
+        with open(os.path.join(str(tmp_path), "ab", name), "wb") as file:
+            file.write(pickle.dumps(Payload()))
+    assert ResultCache(directory=str(tmp_path)).get("abcdef") is MISSING
+    assert not (tmp_path / "executed").exists()
+
+
+def test_unsupported_values_are_not_cached(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    cache.put("object", np.array([1, "a"], dtype=object))
+    cache.put("set", {1, 2})
+    cache.put("function", print)
+    assert all(cache.get(key) is MISSING for key in ("object", "set", "function"))
+    assert not any(names for _, _, names in os.walk(str(tmp_path)))
+
+
+def test_records_restore_only_allowed_dataclasses(tmp_path):
+    # Подложенные записи с чужими модулями или не-dataclass именами — промах
+    cache = ResultCache(directory=str(tmp_path))
+    forged = [("os", "system"), ("game_engine", "compact"), ("game_engine", "np")]
+    for k, (module, name) in enumerate(forged):
+        record = json.dumps({"dataclass": [module, name], "fields": {}}).encode()
+        path = cache._path(f"{k:04x}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path, record=np.frombuffer(record, dtype=np.uint8))
+        assert ResultCache(directory=str(tmp_path)).get(f"{k:04x}") is MISSING
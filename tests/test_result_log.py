@@ -0,0 +1,86 @@
+import json
+import os
+
+from result_log import HistoryFile, ResultLog
+
+
+class FakeRoot:
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, callback):
+        self.calls.append(callback)
+
+
+class FakeText:
+    # Минимум tk.Text для журнала: вставка в конец и удаление первых строк
+    def __init__(self):
+        self.content = ""
+        self.inserts = 0
+
+    def insert(self, index, text):
+        self.inserts += 1
+        self.content += text
+
+    def delete(self, first, last):
+        if last == "end":
+            self.content = ""
+        else:
+            lines = int(last.split(".")[0]) - 1
+            self.content = "".join(self.content.splitlines(keepends=True)[lines:])
+
+    def see(self, index):
+        pass
+
+
+def test_messages_are_batched_into_one_insert():
+    root, text = FakeRoot(), FakeText()
+    log = ResultLog(root, text)
+    for k in range(10):
+        log.append(f"сообщение {k}")
+    assert len(root.calls) == 1 and text.inserts == 0
+    root.calls.pop()()
+    assert text.inserts == 1 and text.content.count("\n") == 10
+    assert text.content.splitlines()[-1].endswith("сообщение 9")
+
+
+def test_window_keeps_last_entries():
+    root, text = FakeRoot(), FakeText()
+    log = ResultLog(root, text, max_entries=5)
+    for k in range(12):
+        log.append(f"строка {k}\nвторая строка {k}\n")
+        if k % 4 == 3:
+            log.flush()
+    lines = text.content.splitlines()
+    assert len(lines) == 10 and lines[0].endswith("строка 7") and lines[-1] == "вторая строка 11"
+
+
+def test_history_file_rotates_and_writes_jsonl(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    sink = HistoryFile(path, max_bytes=400, backups=2, flush_interval=3600)
+    for k in range(20):
+        sink.write({"time": "t", "source": "bimatrix", "message": f"запись {k}"})
+        if k % 5 == 4:
+            sink.flush()
+    sink.close()
+    assert sink.error is None
+    assert sorted(os.listdir(str(tmp_path))) == ["history.jsonl", "history.jsonl.1", "history.jsonl.2"]
+    assert all(os.path.getsize(os.path.join(str(tmp_path), name)) <= 400 for name in os.listdir(str(tmp_path)))
+    with open(path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert records[-1] == {"time": "t", "source": "bimatrix", "message": "запись 19"}
+
+
+def test_log_writes_to_file_and_text(tmp_path):
+    root, text = FakeRoot(), FakeText()
+    log = ResultLog(root, text, source="matrix")
+    path = str(tmp_path / "history.txt")
+    log.open_file(path, flush_interval=3600)
+    log.append("в оба места")
+    log.append("только в файл", to_text=False)
+    log.append("только в окно", to_file=False)
+    log.close_file()
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 2 and lines[0].endswith("] matrix в оба места") and lines[1].endswith("только в файл")
+    assert "только в файл" not in text.content and text.content.count("\n") == 2
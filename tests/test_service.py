@@ -0,0 +1,94 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import service
+
+
+@pytest.fixture
+def serve():
+    # Запускает сервис с заданными параметрами на свободном порту; post(body) -> (код, ответ)
+    started = []
+
+    def start(**options):
+        svc = service.GameService(workers=1, **options)
+        server = service.make_server(svc, port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append((server, svc))
+        url = f"http://127.0.0.1:{server.server_address[1]}/analyze"
+
+        def post(body):
+            data = body if isinstance(body, bytes) else json.dumps(body).encode()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+                    return response.status, json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                return e.code, json.loads(e.read())
+        return post, svc
+
+    yield start
+    for server, svc in started:
+        server.shutdown()
+        server.server_close()
+        svc.close()
+
+
+def test_single_game(serve):
+    post, _ = serve()
+    code, record = post({"A": [[3, 1], [2, 4]], "analyses": "maximin, nash"})
+    assert code == 200
+    assert record["maximin"]["maximin"] == 2 and record["maximin"]["minimax"] == 3
+    assert "dominance" not in record and record["nash"]["count"] == 0
+
+
+def test_games_report_errors_per_game(serve):
+    post, _ = serve()
+    code, payload = post({"games": [{"A": [[1, 2], [3, 4]], "B": [[4, 3], [2, 1]]}, {"B": [[1]]}],
+                          "analyses": ["nash"]})
+    assert code == 200
+    first, second = payload["results"]
+    assert first["nash"]["equilibria"] == [[1, 0]] and "error" in second
+
+
+@pytest.mark.parametrize("body", [
+    {"A": [[1, 2], [3, 4]], "analyses": 5},
+    {"A": [[1, 2], [3, 4]], "analyses": [["nash"]]},
+    {"A": [[1, 2], [3, 4]], "analyses": ["pareto"]},
+    {"A": [[1, 2], [3, 4]], "strict": "false"},
+    {"A": [[1, 2], [3, 4]], "strict": 0},
+    {"A": [[1, 2], [3, 4]], "max_equilibria": -1},
+    {"A": [[1, 2], [3, 4]], "timeout": 0},
+    {"A": [[1, 2], [3, 4]], "B": [[1, 2, 3], [4, 5, 6]]},
+    {"A": [[1, 2], [3, 1e400]]},
+])
+def test_invalid_requests_get_400(serve, body):
+    post, svc = serve()
+    code, payload = post(body)
+    assert code == 400 and "error" in payload
+    assert svc.stats["games"] == 0
+
+
+def test_nan_payoffs_get_400(serve):
+    # Стандартный json в Python принимает токен NaN — матрица с ним отклоняется
+    post, _ = serve()
+    code, payload = post(b'{"A": [[NaN, 1], [2, 3]]}')
+    assert code == 400 and "error" in payload
+
+
+def test_full_queue_gets_503(serve):
+    # Пакетировщик ждёт окно в 1 с, а очередь вмещает одну игру
+    post, svc = serve(batch_window=1.0, max_pending=1)
+    game = {"A": [[1, 2], [3, 4]]}
+    code, payload = post({"games": [game, game, game]})
+    assert code == 503 and "error" in payload
+    assert svc.stats["rejected"] == 1
+
+
+def test_slow_batch_gets_504(serve):
+    post, svc = serve(batch_window=1.0)
+    code, payload = post({"A": [[1, 2], [3, 4]], "timeout": 0.05})
+    assert code == 504 and "error" in payload
+    assert svc.stats["timeouts"] == 1
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import zerosum
+
+pytest.importorskip("scipy")
+
+
+def test_saddle_point_skips_lp(monkeypatch):
+    def no_lp():
+        raise AssertionError("ЛП не должна решаться при седловой точке")
+
+    monkeypatch.setattr(zerosum, "require_linprog", no_lp)
+    solution = zerosum.solve_zero_sum([[1, 2], [3, 4]])
+    assert solution.saddle and solution.saddle_point == (1, 0) and solution.value == 3
+    assert solution.row_strategy.tolist() == [0, 1] and solution.col_strategy.tolist() == [1, 0]
+
+
+def test_matching_pennies():
+    solution = zerosum.solve_zero_sum([[1, -1], [-1, 1]])
+    assert not solution.saddle and solution.saddle_point is None
+    assert solution.value == pytest.approx(0, abs=1e-9)
+    assert np.allclose(solution.row_strategy, 0.5) and np.allclose(solution.col_strategy, 0.5)
+
+
+@pytest.mark.parametrize("method", [None, "highs-ds", "highs-ipm"])
+def test_strategies_guarantee_value(method):
+    rng = np.random.default_rng(4)
+    for _ in range(10):
+        matrix = rng.normal(size=tuple(rng.integers(2, 7, size=2)))
+        solution = zerosum.solve_zero_sum(matrix, method)
+        x, y = solution.row_strategy, solution.col_strategy
+        assert x.sum() == pytest.approx(1) and y.sum() == pytest.approx(1)
+        assert (x >= 0).all() and (y >= 0).all()
+        # Ни одна стратегия соперника не улучшает его результат
+        assert (x @ matrix).min() == pytest.approx(solution.value, abs=1e-6)
+        assert (matrix @ y).max() == pytest.approx(solution.value, abs=1e-6)
+
+
+def test_batch_matches_single_games():
+    rng = np.random.default_rng(5)
+    games = rng.integers(-3, 4, size=(12, 3, 3))
+    for single, batched in zip([zerosum.solve_zero_sum(g) for g in games], zerosum.solve_zero_sum_batch(games)):
+        assert batched.saddle == single.saddle and batched.saddle_point == single.saddle_point
+        assert batched.value == pytest.approx(single.value, abs=1e-9)
@@ -0,0 +1,105 @@
+import numpy as np
+from dataclasses import dataclass
+
+from game_engine import as_payoff_matrix, maximin_minimax
+from instrumentation import timed
+
+
+# ---------------------------
+# Антагонистические игры в смешанных стратегиях
+# ---------------------------
+# Цена игры и оптимальные смешанные стратегии находятся одной задачей ЛП:
+#   max v  при  A^T x >= v,  sum(x) = 1,  x >= 0.
+# Оптимальная стратегия игрока по столбцам — двойственные переменные
+# ограничений A^T x >= v, поэтому вторая задача ЛП не нужна.
+# Если седловая точка есть, ЛП не решается вовсе.
+
+# Начиная с этого числа элементов матрицы внутренняя точка (highs-ipm)
+# заметно быстрее двойственного симплекса на плотных матрицах
+IPM_MIN_ELEMENTS = 200 * 200
+
+
+@dataclass
+class ZeroSumSolution:
+    value: float
+    row_strategy: np.ndarray
+    col_strategy: np.ndarray
+    saddle: bool
+    saddle_point: tuple = None                    # (строка, столбец), если есть седловая точка
+
+
+def require_linprog():
+    try:
+        from scipy.optimize import linprog
+    except ImportError as e:
+        raise ImportError("Для решения в смешанных стратегиях требуется пакет scipy") from e
+    return linprog
+
+
+def _pure_solution(matrix, row, col):
+    row_strategy = np.zeros(matrix.shape[0])
+    col_strategy = np.zeros(matrix.shape[1])
+    row_strategy[row] = 1.0
+    col_strategy[col] = 1.0
+    return ZeroSumSolution(value=matrix[row, col].item(), row_strategy=row_strategy,
+                           col_strategy=col_strategy, saddle=True, saddle_point=(row, col))
+
+
+def _normalize(strategy):
+    strategy = np.clip(strategy, 0.0, None)
+    total = strategy.sum()
+    return strategy / total if total > 0 else np.full(strategy.shape, 1.0 / strategy.size)
+
+
+def solve_lp(matrix, method=None):
+    matrix = as_payoff_matrix(matrix)
+    rows, cols = matrix.shape
+    linprog = require_linprog()
+    # Переменные: x_1..x_rows, v; минимизируем -v
+    c = np.zeros(rows + 1)
+    c[-1] = -1.0
+    a_ub = np.hstack([-matrix.T, np.ones((cols, 1))])
+    b_ub = np.zeros(cols)
+    a_eq = np.ones((1, rows + 1))
+    a_eq[0, -1] = 0.0
+    bounds = [(0, None)] * rows + [(None, None)]
+    if method is None:
+        method = "highs-ipm" if matrix.size >= IPM_MIN_ELEMENTS else "highs-ds"
+    res = linprog(c, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=[1.0], bounds=bounds, method=method)
+    if res.status != 0:
+        raise RuntimeError(f"Не удалось решить задачу ЛП: {res.message}")
+    row_strategy = _normalize(res.x[:rows])
+    col_strategy = _normalize(-res.ineqlin.marginals)
+    return ZeroSumSolution(value=float(res.x[-1]), row_strategy=row_strategy,
+                           col_strategy=col_strategy, saddle=False)
+
+
+@timed()
+def solve_zero_sum(matrix, method=None):
+    matrix = as_payoff_matrix(matrix)
+    res = maximin_minimax(matrix)
+    if res.saddle:
+        return _pure_solution(matrix, res.maximin_row, res.minimax_col)
+    return solve_lp(matrix, method)
+
+
+@timed()
+def solve_zero_sum_batch(games, method=None):
+    # games — массив (k, rows, cols). Седловые точки ищутся сразу для всей пачки,
+    # ЛП решается только для игр без седловой точки.
+    games = np.asarray(games, dtype=float)
+    if games.ndim != 3:
+        raise ValueError("Ожидался массив игр размерности (k, rows, cols)")
+    row_minima = games.min(axis=2)
+    col_maxima = games.max(axis=1)
+    maximin_rows = row_minima.argmax(axis=1)
+    minimax_cols = col_maxima.argmin(axis=1)
+    index = np.arange(games.shape[0])
+    saddle = row_minima[index, maximin_rows] == col_maxima[index, minimax_cols]
+    solutions = []
+    for k in range(games.shape[0]):
+        if saddle[k]:
+            solutions.append(_pure_solution(games[k], int(maximin_rows[k]), int(minimax_cols[k])))
+        else:
+            solutions.append(solve_lp(games[k], method))
+    return solutions